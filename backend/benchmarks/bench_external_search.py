@@ -0,0 +1,90 @@
+"""
+Бенчмарк маршрута POST /films/search/external целиком (FastAPI -> FilmService -> KpExternalAPIClient)
+против фейкового KP, без базы и без доступа к API.
+
+    YAML_CONFIG_PATH=example_config.yaml python -m benchmarks.bench_external_search --latency 0.05
+
+Пользователь и FilmService подменяются через dependency_overrides: поиск идет без пользователя,
+поэтому локальные репозитории (Postgres) не нужны.
+"""
+import argparse
+import asyncio
+import os
+from typing import List
+
+import httpx
+
+os.environ.setdefault('YAML_CONFIG_PATH', os.path.join(os.path.dirname(__file__), '..', 'example_config.yaml'))
+
+from benchmarks.bench_kp_client import CACHE_TTLS  # noqa: E402
+from benchmarks.common import BenchResult, print_table, run_async  # noqa: E402
+from benchmarks.fake_kp import FAKE_KP_URL, FakeKpServer, FakeKpSettings  # noqa: E402
+from src.dependencies import get_current_user, get_film_service_dep  # noqa: E402
+from src.domain.policies.impl.kp_series_to_film import DefaultSeriesToFilmPolicy  # noqa: E402
+from src.infrastructure.repositories.impl.postgres.film_repository.external_search_film_repository import \
+    KpApiSearchFilmRepository  # noqa: E402
+from src.main import app  # noqa: E402
+from src.services.film.service import FilmService  # noqa: E402
+from src.shared.tools.api_clients.impl.kp_api_external_client import KpExternalAPIClient  # noqa: E402
+from src.shared.tools.caches.impl.lru_response_cache import LRUResponseCache  # noqa: E402
+
+REQUESTS = [
+    {'name': 'побег', 'limit': 20},
+    {'name': 'престол', 'limit': 20},
+    {'genres': ['драма'], 'year': {'lower': 1990, 'upper': 2020}, 'limit': 20},
+    {'is_series': True, 'kp_rating': {'lower': 8}, 'limit': 20},
+]
+
+
+async def bench_route(name: str, server: FakeKpServer, cached: bool, args) -> BenchResult:
+    kp_client = KpExternalAPIClient(
+        FAKE_KP_URL,
+        'bench-token',
+        response_cache=LRUResponseCache() if cached else None,
+        cache_ttls=CACHE_TTLS,
+        transport=httpx.ASGITransport(app=server)
+    )
+    film_service = FilmService(
+        local_search_repository=None,
+        external_search_repository=KpApiSearchFilmRepository(kp_client),
+        operations_repository=None,
+        series_to_film_policy=DefaultSeriesToFilmPolicy()
+    )
+    app.dependency_overrides[get_current_user] = lambda: None
+    app.dependency_overrides[get_film_service_dep] = lambda: film_service
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://cinerate') as http:
+        async def call(i: int):
+            response = await http.post('/films/search/external', json=REQUESTS[i % len(REQUESTS)])
+            response.raise_for_status()
+            return response.json()
+
+        result = await run_async(name, call, args.iterations, args.concurrency)
+
+    app.dependency_overrides.clear()
+    await kp_client.aclose()
+    return result
+
+
+async def run(args) -> List[BenchResult]:
+    results = []
+    for name, cached in (('route_no_cache', False), ('route_cached', True)):
+        server = FakeKpServer(FakeKpSettings(latency=args.latency, jitter=args.jitter, seed=42))
+        result = await bench_route(name, server, cached, args)
+        result.extra['upstream'] = sum(server.requests.values())
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк /films/search/external на фейковом KP')
+    parser.add_argument('--latency', type=float, default=0.02, help='задержка фейкового KP, сек')
+    parser.add_argument('--jitter', type=float, default=0.01)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=20)
+    args = parser.parse_args()
+    print_table(asyncio.run(run(args)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Микробенчмарк подготовки JSONB-значений для Film.persons, Film.episodes и UserFilm.user_rating:
+прежний рекурсивный serialize_for_json (isinstance-цепочки и .dict()) против текущего на pydantic-core.
+
+    python -m benchmarks.bench_json_serializer --episodes 500 --iterations 200
+"""
+import argparse
+import warnings
+from datetime import datetime
+from typing import List
+
+from pydantic import HttpUrl, PydanticDeprecatedSince20
+
+from benchmarks.common import BenchResult, print_table, run_sync
+from benchmarks.fake_kp import FakeKpServer
+from src.domain.entities.film import Episode
+from src.infrastructure.repositories.impl.postgres.film_repository.tools.postgres_json_serializer import \
+    serialize_for_json
+from src.shared.mappers.api_responses_to_models import parse_film_extended, parse_episodes
+from src.web.models.film_rating import BaseFilmComplexRating, BaseRatingScale
+
+
+def legacy_serialize_for_json(obj):
+    """Прежняя реализация - для сравнения."""
+    if isinstance(obj, HttpUrl):
+        return str(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    elif isinstance(obj, list):
+        return [legacy_serialize_for_json(i) for i in obj]
+    elif isinstance(obj, dict):
+        return {k: legacy_serialize_for_json(v) for k, v in obj.items()}
+    elif hasattr(obj, 'dict'):
+        return legacy_serialize_for_json(obj.dict())
+    return obj
+
+
+def make_episodes(count: int) -> List[Episode]:
+    server = FakeKpServer()
+    source = [episode for seasons in server.seasons.values() for season in seasons for episode in season['episodes']]
+    return parse_episodes([{**source[i % len(source)], 'number': i + 1} for i in range(count)])
+
+
+def run(args) -> List[BenchResult]:
+    # прежняя реализация вызывает устаревший .dict()
+    warnings.filterwarnings('ignore', category=PydanticDeprecatedSince20)
+    film = parse_film_extended(FakeKpServer().catalog[0])
+    persons = list(film.persons)
+    episodes = make_episodes(args.episodes)
+    rating = BaseFilmComplexRating[BaseRatingScale](storyline=BaseRatingScale.GOOD, music=BaseRatingScale.NORMAL)
+
+    cases = [
+        (f'persons({len(persons)})', persons),
+        (f'episodes({len(episodes)})', episodes),
+        ('user_rating', rating),
+    ]
+    results = []
+    for name, value in cases:
+        for label, serializer in (('legacy', legacy_serialize_for_json), ('pydantic-core', serialize_for_json)):
+            serializer(value)
+            results.append(run_sync(f'{name}: {label}', lambda i: serializer(value), args.iterations))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Микробенчмарк serialize_for_json')
+    parser.add_argument('--episodes', type=int, default=500)
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+    print_table(run(args))
+
+
+if __name__ == '__main__':
+    main()
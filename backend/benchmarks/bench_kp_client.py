@@ -0,0 +1,187 @@
+"""
+Бенчмарк KpExternalAPIClient против фейкового KP (benchmarks/fake_kp.py), без доступа к API.
+
+    python -m benchmarks.bench_kp_client --latency 0.05 --iterations 200 --concurrency 20
+
+Для каждого сценария печатаются перцентили задержки, rps и кол-во запросов, дошедших до "KP".
+"""
+import argparse
+import asyncio
+from typing import Callable, Dict, List
+
+import httpx
+
+from benchmarks.common import BenchResult, print_table, run_async
+from benchmarks.fake_kp import FAKE_KP_URL, FakeKpServer, FakeKpSettings
+from src.shared.tools.api_clients.impl.kp_api_external_client import KpExternalAPIClient
+from src.shared.tools.caches.impl.lru_response_cache import LRUResponseCache
+from src.shared.tools.rate_limiting.api_key_pool import ApiKey, ApiKeyPool
+from src.web.models.search_filters import BaseApiSearchingFilters, BaseBounds
+
+CACHE_TTLS = {'movie': 3600, 'search': 300, 'filters': 600, 'season': 3600}
+FILM_ID = '326'
+SERIES_ID = '464963'
+
+
+def make_client(server: FakeKpServer, cached: bool = False, **kwargs) -> KpExternalAPIClient:
+    return KpExternalAPIClient(
+        FAKE_KP_URL,
+        kwargs.pop('api_key', 'bench-token'),
+        response_cache=LRUResponseCache() if cached else None,
+        cache_ttls=CACHE_TTLS,
+        transport=httpx.ASGITransport(app=server),
+        **kwargs
+    )
+
+
+def film_filters(i: int) -> BaseApiSearchingFilters:
+    return BaseApiSearchingFilters(filmid=str(1000 + i))
+
+
+SCENARIOS: Dict[str, Callable] = {}
+
+
+def scenario(name: str):
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+
+    return register
+
+
+@scenario('get_cold')
+async def bench_get_cold(server, args) -> BenchResult:
+    client = make_client(server)
+    result = await run_async('get_cold', lambda i: client.get(film_filters(i)), args.iterations, args.concurrency)
+    await client.aclose()
+    return result
+
+
+@scenario('get_cached')
+async def bench_get_cached(server, args) -> BenchResult:
+    client = make_client(server, cached=True)
+    await client.get(BaseApiSearchingFilters(filmid=FILM_ID))
+    result = await run_async(
+        'get_cached', lambda i: client.get(BaseApiSearchingFilters(filmid=FILM_ID)), args.iterations, args.concurrency
+    )
+    await client.aclose()
+    return result
+
+
+@scenario('get_coalesced')
+async def bench_get_coalesced(server, args) -> BenchResult:
+    # одинаковые одновременные запросы без кэша - проверка single-flight
+    client = make_client(server)
+    result = await run_async(
+        'get_coalesced', lambda i: client.get(BaseApiSearchingFilters(filmid=FILM_ID)), args.iterations,
+        args.concurrency
+    )
+    await client.aclose()
+    return result
+
+
+@scenario('get_many')
+async def bench_get_many(server, args) -> BenchResult:
+    client = make_client(server)
+    filmids = [str(1000 + i) for i in range(100)]
+    result = await run_async('get_many(100)', lambda i: client.get_many(filmids), max(args.iterations // 20, 1), 1)
+    await client.aclose()
+    return result
+
+
+@scenario('get_many_stream')
+async def bench_get_many_stream(server, args) -> BenchResult:
+    client = make_client(server, stream_docs=True)
+    filmids = [str(1000 + i) for i in range(100)]
+    result = await run_async('get_many(100, stream)', lambda i: client.get_many(filmids),
+                             max(args.iterations // 20, 1), 1)
+    await client.aclose()
+    return result
+
+
+@scenario('search_by_name')
+async def bench_search_by_name(server, args) -> BenchResult:
+    client = make_client(server)
+    names = ['побег', 'миля', 'гамп', 'престол', 'друзья']
+    result = await run_async(
+        'search_by_name',
+        lambda i: client.search_by_name(BaseApiSearchingFilters(name=names[i % len(names)], limit=20)),
+        args.iterations, args.concurrency
+    )
+    await client.aclose()
+    return result
+
+
+@scenario('search_by_filters')
+async def bench_search_by_filters(server, args) -> BenchResult:
+    client = make_client(server)
+    result = await run_async(
+        'search_by_filters',
+        lambda i: client.search_by_filters(BaseApiSearchingFilters(
+            genres=['драма'], year=BaseBounds(lower=1990, upper=2020), page=i % 5 + 1, limit=20
+        )),
+        args.iterations, args.concurrency
+    )
+    await client.aclose()
+    return result
+
+
+@scenario('get_all_seasons')
+async def bench_get_all_seasons(server, args) -> BenchResult:
+    client = make_client(server, season_page_size=3)
+    result = await run_async(
+        'get_all_seasons',
+        lambda i: client.get_all_seasons(BaseApiSearchingFilters(filmid=SERIES_ID)),
+        max(args.iterations // 5, 1), 1
+    )
+    await client.aclose()
+    return result
+
+
+@scenario('flaky_upstream')
+async def bench_flaky_upstream(server, args) -> BenchResult:
+    server.settings.error_rate = 0.2
+    client = make_client(server, max_retries=2, backoff_base=0.01, backoff_max=0.05)
+    result = await run_async('flaky(20% 5xx)', lambda i: client.get(film_filters(i)), args.iterations,
+                             args.concurrency)
+    await client.aclose()
+    return result
+
+
+@scenario('rate_limited')
+async def bench_rate_limited(server, args) -> BenchResult:
+    server.settings.rate_limit_rate = 0.2
+    key_pool = ApiKeyPool([ApiKey('bench-key-1'), ApiKey('bench-key-2'), ApiKey('bench-key-3')], cooldown=0.05)
+    client = make_client(server, api_key=key_pool, max_retries=2, backoff_base=0.01, backoff_max=0.05)
+    result = await run_async('rate_limited(20% 429)', lambda i: client.get(film_filters(i)), args.iterations,
+                             args.concurrency)
+    await client.aclose()
+    return result
+
+
+async def run(args) -> List[BenchResult]:
+    results = []
+    for name in args.scenarios or SCENARIOS:
+        server = FakeKpServer(FakeKpSettings(latency=args.latency, jitter=args.jitter, seed=42))
+        result = await SCENARIOS[name](server, args)
+        result.extra['upstream'] = sum(server.requests.values())
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк клиента KP на фейковом сервере')
+    parser.add_argument('--latency', type=float, default=0.02, help='задержка фейкового KP, сек')
+    parser.add_argument('--jitter', type=float, default=0.01)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('scenarios', nargs='*', help=f"по умолчанию все: {', '.join(SCENARIOS)}")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"неизвестные сценарии: {', '.join(sorted(unknown))}")
+    print_table(asyncio.run(run(args)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Бенчмарк списочного ответа GET /films/list: строки БД -> FilmPreview -> повторная валидация по response_model ->
+stdlib json (как было) против строк БД -> dict -> FastJSONResponse. Без базы: репозиторий отдает заранее
+собранные ORM-объекты, так что меряется только маппинг и сериализация ответа.
+
+    YAML_CONFIG_PATH=example_config.yaml python -m benchmarks.bench_list_responses --size 1000 --iterations 100
+"""
+import argparse
+import asyncio
+import os
+import uuid
+from datetime import datetime
+from typing import List
+
+import httpx
+from fastapi import APIRouter, Depends
+
+os.environ.setdefault('YAML_CONFIG_PATH', os.path.join(os.path.dirname(__file__), '..', 'example_config.yaml'))
+
+from benchmarks.common import BenchResult, print_table, run_async  # noqa: E402
+from benchmarks.fake_kp import FakeKpServer, FakeKpSettings  # noqa: E402
+from src.dependencies import get_current_user, get_film_service_dep  # noqa: E402
+from src.domain.entities.film import FilmPreview, FilmTypes  # noqa: E402
+from src.domain.entities.user import User  # noqa: E402
+from src.domain.policies.impl.kp_series_to_film import DefaultSeriesToFilmPolicy  # noqa: E402
+from src.infrastructure.repositories.impl.postgres.film_repository.orm import UserFilm  # noqa: E402
+from src.infrastructure.repositories.impl.postgres.film_repository.tools.postgres_json_serializer import \
+    serialize_for_json  # noqa: E402
+from src.main import app  # noqa: E402
+from src.services.film.service import FilmService  # noqa: E402
+from src.shared.mappers.api_responses_to_models import parse_films_extended  # noqa: E402
+from src.shared.mappers.model_to_orm import film_extended_to_film_orm  # noqa: E402
+from src.shared.mappers.orm_to_model import orm_join_to_film_preview  # noqa: E402
+from src.shared.mappers.orm_to_response import orm_join_to_film_preview_dict  # noqa: E402
+
+USER_RATING = {'storyline': 3, 'music': 2, 'montage': None, 'acting_game': 4, 'atmosphere': None, 'originality': 3}
+
+
+class InMemoryOperationsRepository:
+    """Отдает заранее собранные строки user_films вместо запроса в Postgres."""
+
+    def __init__(self, userfilms: List[UserFilm]):
+        self.userfilms = userfilms
+
+    def get_list(self, user, is_watched: bool = True, out_model: FilmTypes = FilmTypes.FILM_PREVIEW):
+        mapper = orm_join_to_film_preview_dict if out_model == FilmTypes.FILM_PREVIEW_DICT else orm_join_to_film_preview
+        return [mapper(userfilm, userfilm.film) for userfilm in self.userfilms]
+
+
+def make_userfilms(size: int) -> List[UserFilm]:
+    docs = FakeKpServer(FakeKpSettings(catalog_size=size)).catalog[:size]
+    userid = uuid.uuid4()
+    userfilms = []
+    for i, film in enumerate(parse_films_extended(docs)):
+        film = film.model_copy(update={'filmid': f'{film.filmid}-{i}'})
+        film_orm = film_extended_to_film_orm(film, serialize_for_json)
+        userfilm = UserFilm(filmid=film_orm.filmid, userid=userid, is_watched=False, added_at=datetime(2025, 1, 1),
+                            user_rating=USER_RATING if i % 2 else None)
+        userfilm.film = film_orm
+        userfilms.append(userfilm)
+    return userfilms
+
+
+# прежняя версия маршрута: FastAPI валидирует FilmPreview по response_model и кодирует stdlib json
+legacy_router = APIRouter(prefix='/legacy')
+
+
+@legacy_router.get('/films/list', response_model=List[FilmPreview])
+def legacy_get_list(watched: bool, user=Depends(get_current_user), film_service=Depends(get_film_service_dep)):
+    return film_service.get_list(user, is_watched=watched)
+
+
+async def bench(name: str, http: httpx.AsyncClient, path: str, size: int, iterations: int) -> BenchResult:
+    async def call(i: int):
+        response = await http.get(path, params={'watched': False})
+        response.raise_for_status()
+        return len(response.json()) == size
+
+    result = await run_async(name, call, iterations)
+    result.extra['items'] = size
+    return result
+
+
+async def run(args) -> List[BenchResult]:
+    app.include_router(legacy_router)
+    film_service = FilmService(
+        local_search_repository=None,
+        external_search_repository=None,
+        operations_repository=InMemoryOperationsRepository(make_userfilms(args.size)),
+        series_to_film_policy=DefaultSeriesToFilmPolicy()
+    )
+    app.dependency_overrides[get_current_user] = lambda: User(userid=str(uuid.uuid4()), username='bench')
+    app.dependency_overrides[get_film_service_dep] = lambda: film_service
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://cinerate') as http:
+        legacy, fast = await http.get('/legacy/films/list?watched=false'), await http.get('/films/list?watched=false')
+        assert legacy.json() == fast.json(), 'ответы быстрого и прежнего пути расходятся'
+
+        return [
+            await bench('pydantic + response_model', http, '/legacy/films/list', args.size, args.iterations),
+            await bench('orm -> dict -> to_json', http, '/films/list', args.size, args.iterations),
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк списочных ответов /films/list')
+    parser.add_argument('--size', type=int, default=1000)
+    parser.add_argument('--iterations', type=int, default=100)
+    args = parser.parse_args()
+    print_table(asyncio.run(run(args)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,293 @@
+"""
+Микробенчмарки src/shared/mappers: парсеры ответов KP, orm_to_model, model_to_orm, orm_to_response и merge_dicts
+на синтетических фильмах (обычный фильм и сериал с 200 сериями и 50 персонами), пользователях и плейлистах.
+Для каждого маппера - ops/s, латентность одного вызова и память (пик и число блоков по tracemalloc).
+
+    python -m benchmarks.bench_mappers                       # таблица
+    python -m benchmarks.bench_mappers --save                # записать baseline
+    python -m benchmarks.bench_mappers --baseline            # сравнить с записанным baseline
+    python -m benchmarks.bench_mappers orm_to_film_extended  # только подходящие сценарии
+
+Baseline хранится в benchmarks/baselines/mappers.json. Абсолютные цифры зависят от машины, поэтому сравнивать
+имеет смысл с baseline, записанным на той же машине до изменения.
+"""
+import argparse
+import json
+import os
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.common import BenchResult
+from benchmarks.fake_kp import FakeKpServer
+from src.domain.entities.user import User
+from src.infrastructure.repositories.impl.postgres.film_repository.orm import Film, UserFilm
+from src.infrastructure.repositories.impl.postgres.film_repository.tools.postgres_json_serializer import \
+    serialize_for_json
+from src.infrastructure.repositories.impl.postgres.playlist_repository.orm import PlaylistItemORM, PlaylistORM
+from src.infrastructure.repositories.impl.postgres.social_repository.orm import UserItemORM, UserORM
+from src.shared.mappers.api_responses_to_models import parse_episodes, parse_film_extended, parse_film_preview, \
+    parse_film_previews, parse_films_extended
+from src.shared.mappers.model_to_orm import film_base_to_userfilm_orm, film_extended_to_film_orm, \
+    film_orm_to_film_persons_orm, playlist_to_orm, user_and_create_model_to_playlist_orm
+from src.shared.mappers.orm_to_model import orm_join_to_film_extended, orm_join_to_film_preview, \
+    orm_join_to_user_public, orm_join_to_user_preview, orm_to_film_extended, orm_to_film_preview, orm_to_playlist, \
+    orm_to_playlist_item_preview, user_orm_to_user_in_db
+from src.shared.mappers.orm_to_response import orm_join_to_film_preview_dict, orm_to_playlist_item_preview_dict
+from src.shared.mappers.orms_to_dict import merge_dicts
+from src.web.models.film_rating import BaseFilmComplexRating, BaseRatingScale
+from src.web.models.playlists import CreatePlaylistModel
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines', 'mappers.json')
+USER_RATING = {'storyline': 3, 'music': 2, 'montage': None, 'acting_game': 4, 'atmosphere': None, 'originality': 3}
+
+
+# --- синтетические данные ---
+
+def make_kp_doc(episodes: int = 0, persons: int = 0) -> dict:
+    doc = dict(FakeKpServer().catalog[0])
+    if persons:
+        professions = [
+            ('director', 'режиссеры'), ('actor', 'актеры'), ('producer', 'продюсеры'), ('writer', 'сценаристы')
+        ]
+        doc['persons'] = [
+            {
+                'id': 100000 + i,
+                'photo': f'https://image.openmoviedb.com/kinopoisk-st-images/actor_iphone/iphone360_{100000 + i}.jpg',
+                'name': f'Персона {i}',
+                'enName': f'Person {i}',
+                'description': None,
+                'profession': professions[i % len(professions)][1],
+                'enProfession': professions[i % len(professions)][0],
+            }
+            for i in range(persons)
+        ]
+    if episodes:
+        doc['isSeries'] = True
+        doc['episodes'] = [
+            {
+                'number': i + 1,
+                'name': f'Серия {i + 1}',
+                'enName': f'Episode {i + 1}',
+                'description': f'Описание {i + 1}-й серии. ' * 4,
+                'still': {'url': f'https://avatars.mds.yandex.net/get-ott/{i}/orig', 'previewUrl': None},
+                'airDate': f'2011-{i % 12 + 1:02d}-{i % 28 + 1:02d}T00:00:00.000Z',
+            }
+            for i in range(episodes)
+        ]
+    return doc
+
+
+def make_film_orm(doc: dict, suffix: str = '') -> Film:
+    film = parse_film_extended(doc)
+    return film_extended_to_film_orm(film.model_copy(update={'filmid': film.filmid + suffix}), serialize_for_json)
+
+
+def make_userfilm(film: Film, userid: uuid.UUID) -> UserFilm:
+    userfilm = UserFilm(filmid=film.filmid, userid=userid, is_watched=True, added_at=datetime(2025, 1, 1),
+                        user_rating=USER_RATING)
+    userfilm.film = film
+    return userfilm
+
+
+def make_user_orm(i: int = 0) -> UserORM:
+    user_item = UserItemORM(item_id=uuid.uuid4(), username=f'user{i}', bio='Смотрю кино', location='Omsk, Russia',
+                            birth_date=datetime(1990, 1, 1).date(), email=f'user{i}@example.com', role='USER',
+                            status='PUBLIC', subscribers_count=10, playlists_count=3)
+    user = UserORM(id=uuid.uuid4(), full_name=f'User {i}', login=f'user{i}', hashed_password='x' * 60,
+                   item_id=user_item.item_id)
+    user.user_item = user_item
+    return user
+
+
+def make_playlist_orm(films: List[Film], userid: uuid.UUID) -> PlaylistORM:
+    playlist = PlaylistORM(playlistid=uuid.uuid4(), userid=userid, name='Любимое', description='Лучшие фильмы',
+                           is_public=True, additions_count=5, collaborators=[])
+    items = []
+    for film in films:
+        item = PlaylistItemORM(playlistid=playlist.playlistid, filmid=film.filmid, creatorid=str(userid))
+        item.film = film
+        items.append(item)
+    playlist.items = items
+    return playlist
+
+
+# --- сценарии ---
+
+def build_cases() -> List[Tuple[str, Callable[[], object]]]:
+    userid = uuid.uuid4()
+    user = User(userid=str(userid))
+
+    small_doc = make_kp_doc()
+    large_doc = make_kp_doc(episodes=200, persons=50)
+    page = FakeKpServer().catalog[:50]
+    kp_episodes = large_doc['episodes']
+
+    small_film = parse_film_extended(small_doc)
+    large_film = parse_film_extended(large_doc)
+    small_orm = make_film_orm(small_doc)
+    large_orm = make_film_orm(large_doc)
+    small_userfilm = make_userfilm(small_orm, userid)
+    large_userfilm = make_userfilm(large_orm, userid)
+    rated_film = small_film.model_copy(update={
+        'user_rating': BaseFilmComplexRating[BaseRatingScale](**USER_RATING), 'is_watched': True
+    })
+
+    user_orm = make_user_orm()
+    playlist_orm = make_playlist_orm([make_film_orm(doc, f'-{i}') for i, doc in enumerate(page[:20])], userid)
+    playlist_item = playlist_orm.items[0]
+    playlist = orm_to_playlist(playlist_orm)
+    create_playlist = CreatePlaylistModel(name='Любимое', description='Лучшие фильмы', is_public=True)
+
+    def extended_materialized(orm: Film):
+        film = orm_to_film_extended(orm)
+        return film.model_dump_json()
+
+    return [
+        # парсеры ответов KP
+        ('parse_film_preview', lambda: parse_film_preview(small_doc)),
+        ('parse_film_previews[50]', lambda: parse_film_previews(page)),
+        ('parse_film_extended', lambda: parse_film_extended(small_doc)),
+        ('parse_film_extended(200ep,50p)', lambda: parse_film_extended(large_doc)),
+        ('parse_films_extended[50]', lambda: parse_films_extended(page)),
+        ('parse_episodes[200]', lambda: parse_episodes(kp_episodes)),
+        # orm_to_model
+        ('orm_to_film_preview', lambda: orm_to_film_preview(small_orm)),
+        ('orm_join_to_film_preview', lambda: orm_join_to_film_preview(small_userfilm, small_orm)),
+        ('orm_to_film_extended', lambda: orm_to_film_extended(small_orm)),
+        ('orm_to_film_extended(200ep,50p)', lambda: orm_to_film_extended(large_orm)),
+        ('orm_to_film_extended(200ep,50p)+dump', lambda: extended_materialized(large_orm)),
+        ('orm_join_to_film_extended(200ep,50p)', lambda: orm_join_to_film_extended(large_userfilm, large_orm)),
+        ('orm_to_playlist', lambda: orm_to_playlist(playlist_orm)),
+        ('orm_to_playlist_item_preview', lambda: orm_to_playlist_item_preview(playlist_item)),
+        ('user_orm_to_user_in_db', lambda: user_orm_to_user_in_db(user_orm)),
+        # orm_to_response
+        ('orm_join_to_film_preview_dict', lambda: orm_join_to_film_preview_dict(small_userfilm, small_orm)),
+        ('orm_to_playlist_item_preview_dict', lambda: orm_to_playlist_item_preview_dict(playlist_item)),
+        # model_to_orm
+        ('film_extended_to_film_orm', lambda: film_extended_to_film_orm(small_film, serialize_for_json)),
+        ('film_extended_to_film_orm(200ep,50p)', lambda: film_extended_to_film_orm(large_film, serialize_for_json)),
+        ('film_orm_to_film_persons_orm(50p)', lambda: film_orm_to_film_persons_orm(large_orm)),
+        ('film_base_to_userfilm_orm', lambda: film_base_to_userfilm_orm(rated_film, user, serialize_for_json)),
+        ('user_and_create_model_to_playlist_orm', lambda: user_and_create_model_to_playlist_orm(user, create_playlist)),
+        ('playlist_to_orm', lambda: playlist_to_orm(playlist)),
+        # orms_to_dict
+        ('merge_dicts(user, user_item)', lambda: merge_dicts(user_orm, user_orm.user_item)),
+        ('merge_dicts+orm_join_to_user_public',
+         lambda: orm_join_to_user_public(merge_dicts(user_orm, user_orm.user_item))),
+        ('merge_dicts+orm_join_to_user_preview',
+         lambda: orm_join_to_user_preview(merge_dicts(user_orm, user_orm.user_item))),
+    ]
+
+
+# --- измерения ---
+
+def measure_time(name: str, func: Callable[[], object], duration: float) -> BenchResult:
+    """Гоняет func пачками, пока не наберется duration секунд; латентность - среднее по пачке."""
+    func()  # прогрев: TypeAdapter, lru_cache дат
+    batch = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(batch):
+            func()
+        if time.perf_counter() - started >= 0.01:
+            break
+        batch *= 2
+
+    latencies = []
+    started = time.perf_counter()
+    while time.perf_counter() - started < duration:
+        batch_started = time.perf_counter()
+        for _ in range(batch):
+            func()
+        latencies.append((time.perf_counter() - batch_started) / batch)
+    return BenchResult(name, latencies, time.perf_counter() - started)
+
+
+def measure_allocations(func: Callable[[], object]) -> Tuple[float, int]:
+    """Пик памяти за один вызов (КБ) и число выделенных им блоков, живых после вызова (вместе с результатом)."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        del result
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0)
+    return (peak - baseline) / 1024, blocks
+
+
+def run(args) -> List[BenchResult]:
+    results = []
+    for name, func in build_cases():
+        if args.cases and not any(pattern in name for pattern in args.cases):
+            continue
+        result = measure_time(name, func, args.duration)
+        alloc_kb, blocks = measure_allocations(func)
+        median = result.percentile(0.5)
+        result.extra.update(ops_per_s=1 / median if median else 0.0, alloc_kb=alloc_kb, blocks=blocks)
+        results.append(result)
+    return results
+
+
+def to_baseline(results: List[BenchResult]) -> Dict[str, dict]:
+    return {
+        result.name: {key: result.extra[key] for key in ('ops_per_s', 'alloc_kb', 'blocks')}
+        for result in results
+    }
+
+
+def compare(results: List[BenchResult], baseline: Dict[str, dict]) -> None:
+    for result in results:
+        previous = baseline.get(result.name)
+        if not previous or not previous.get('ops_per_s'):
+            continue
+        result.extra['ops_vs_base'] = f"{(result.extra['ops_per_s'] / previous['ops_per_s'] - 1) * 100:+.1f}%"
+        result.extra['alloc_vs_base'] = f"{result.extra['alloc_kb'] - previous['alloc_kb']:+.1f}KB"
+
+
+def print_results(results: List[BenchResult]) -> None:
+    rows = [dict(name=result.name, p50_us=result.percentile(0.5) * 1e6, **result.extra) for result in results]
+    columns = list(dict.fromkeys(column for row in rows for column in row))
+    formatted = [[f"{row[c]:.1f}" if isinstance(row.get(c), float) else str(row.get(c, '')) for c in columns]
+                 for row in rows]
+    widths = [max(len(column), *(len(row[i]) for row in formatted)) for i, column in enumerate(columns)]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in formatted:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Микробенчмарки src/shared/mappers')
+    parser.add_argument('cases', nargs='*', help='подстроки имен сценариев (по умолчанию все)')
+    parser.add_argument('--duration', type=float, default=0.5, help='секунд на сценарий')
+    parser.add_argument('--save', action='store_true', help=f'записать результаты в {BASELINE_PATH}')
+    parser.add_argument('--baseline', action='store_true', help='сравнить с записанным baseline')
+    parser.add_argument('--baseline-path', default=BASELINE_PATH)
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.baseline:
+        with open(args.baseline_path, encoding='utf-8') as f:
+            compare(results, json.load(f))
+    print_results(results)
+
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.baseline_path):
+            with open(args.baseline_path, encoding='utf-8') as f:
+                baseline = json.load(f)
+        baseline.update(to_baseline(results))
+        os.makedirs(os.path.dirname(args.baseline_path), exist_ok=True)
+        with open(args.baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=1, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Микробенчмарк разбора ответов KP: поштучные парсеры против пакетных (TypeAdapter на весь список).
+Для сравнения - model_construct без валидации и без сборки вложенных моделей: нижняя граница того,
+что дал бы "доверенный" путь без pydantic-core.
+
+Сезоны сериала разбираются на месте (серии валидирует LazyModelList при чтении). Случай "pickle" - то, что
+event loop заплатил бы за передачу той же работы в пул процессов: pickle аргументов и unpickle результата.
+Он дороже самого разбора, поэтому пула процессов для сезонов нет.
+
+    python -m benchmarks.bench_parsers --page-size 150 --iterations 50
+"""
+import argparse
+import pickle
+from typing import List
+
+from benchmarks.common import BenchResult, print_table, run_sync
+from benchmarks.fake_kp import FakeKpServer, FakeKpSettings
+from src.domain.entities.film import Episode, FilmExtended, FilmPreview
+from src.shared.mappers.api_responses_to_models import episode_fields, film_extended_fields, film_preview_fields, \
+    parse_episode, parse_episodes, parse_film_extended, parse_film_preview, parse_film_previews, parse_films_extended, \
+    parse_seasons
+
+
+def construct_previews(docs: List[dict]) -> List[FilmPreview]:
+    return [FilmPreview.model_construct(**film_preview_fields(doc)) for doc in docs]
+
+
+def construct_extended(docs: List[dict]) -> List[FilmExtended]:
+    return [FilmExtended.model_construct(**film_extended_fields(doc)) for doc in docs]
+
+
+def construct_episodes(episodes: List[dict]) -> List[Episode]:
+    return [Episode.model_construct(**episode_fields(episode)) for episode in episodes]
+
+
+def pool_transfer(season_docs: List[dict], parsed: bytes) -> list:
+    pickle.dumps(season_docs)
+    return pickle.loads(parsed)
+
+
+def run(args) -> List[BenchResult]:
+    server = FakeKpServer(FakeKpSettings(catalog_size=args.page_size))
+    docs = server.catalog[:args.page_size]
+    season_docs = [season for seasons in server.seasons.values() for season in seasons]
+    episodes = [episode for season in season_docs for episode in season['episodes']]
+    parsed_seasons = pickle.dumps([season.model_dump() for season in parse_seasons(season_docs)])
+
+    cases = [
+        ('preview: per item', lambda: [parse_film_preview(doc) for doc in docs]),
+        ('preview: bulk', lambda: parse_film_previews(docs)),
+        ('preview: model_construct', lambda: construct_previews(docs)),
+        ('extended: per item', lambda: [parse_film_extended(doc) for doc in docs]),
+        ('extended: bulk', lambda: parse_films_extended(docs)),
+        ('extended: model_construct', lambda: construct_extended(docs)),
+        (f'episodes({len(episodes)}): per item', lambda: [parse_episode(episode) for episode in episodes]),
+        (f'episodes({len(episodes)}): bulk', lambda: parse_episodes(episodes)),
+        (f'episodes({len(episodes)}): model_construct', lambda: construct_episodes(episodes)),
+        (f'seasons, episodes({len(episodes)}): inline', lambda: parse_seasons(season_docs)),
+        (f'seasons, episodes({len(episodes)}): pickle', lambda: pool_transfer(season_docs, parsed_seasons)),
+    ]
+
+    results = []
+    for name, func in cases:
+        func()  # прогрев: TypeAdapter, lru_cache дат
+        result = run_sync(name, lambda i: func(), args.iterations)
+        result.extra['per_doc_us'] = result.percentile(0.5) / (len(episodes) if 'episodes' in name else len(docs)) * 1e6
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Микробенчмарк парсеров ответов KP')
+    parser.add_argument('--page-size', type=int, default=150)
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args()
+    print_table(run(args))
+
+
+if __name__ == '__main__':
+    main()
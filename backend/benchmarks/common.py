@@ -0,0 +1,96 @@
+import asyncio
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List
+
+
+@dataclass
+class BenchResult:
+    name: str
+    latencies: List[float]
+    elapsed: float
+    errors: int = 0
+    # вызовы, вернувшие пустой результат (None, []) - клиент KP так сообщает о неудаче
+    empty: int = 0
+    extra: dict = field(default_factory=dict)
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def row(self) -> dict:
+        return dict(
+            name=self.name,
+            n=len(self.latencies),
+            p50_ms=self.percentile(0.5) * 1000,
+            p95_ms=self.percentile(0.95) * 1000,
+            p99_ms=self.percentile(0.99) * 1000,
+            mean_ms=statistics.fmean(self.latencies) * 1000 if self.latencies else 0.0,
+            rps=len(self.latencies) / self.elapsed if self.elapsed else 0.0,
+            errors=self.errors,
+            empty=self.empty,
+            **self.extra
+        )
+
+
+async def run_async(
+        name: str,
+        func: Callable[[int], Awaitable],
+        iterations: int,
+        concurrency: int = 1
+) -> BenchResult:
+    """Вызывает func(i) iterations раз, не больше concurrency вызовов одновременно."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+    empty = 0
+
+    async def one(i: int):
+        nonlocal errors, empty
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                if not await func(i):
+                    empty += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(iterations)])
+    return BenchResult(name, latencies, time.perf_counter() - started, errors, empty)
+
+
+def run_sync(name: str, func: Callable[[int], object], iterations: int) -> BenchResult:
+    latencies = []
+    errors = 0
+    empty = 0
+    started = time.perf_counter()
+    for i in range(iterations):
+        call_started = time.perf_counter()
+        try:
+            if not func(i):
+                empty += 1
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - call_started)
+    return BenchResult(name, latencies, time.perf_counter() - started, errors, empty)
+
+
+def print_table(results: List[BenchResult]) -> None:
+    rows = [result.row() for result in results]
+    if not rows:
+        return
+    columns = list(dict.fromkeys(column for row in rows for column in row))
+    formatted = [
+        [f"{row.get(column):.2f}" if isinstance(row.get(column), float) else str(row.get(column, '')) for column in
+         columns]
+        for row in rows
+    ]
+    widths = [max(len(column), *(len(row[i]) for row in formatted)) for i, column in enumerate(columns)]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in formatted:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)))
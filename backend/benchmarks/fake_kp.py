@@ -0,0 +1,234 @@
+"""
+Фейковый Кинопоиск (api.kinopoisk.dev/v1.4) для бенчмарков и прогонов без доступа к API.
+
+Отдает записанные ответы из fixtures/kp (movies.json, seasons.json) по тем же путям, что и KP:
+/movie/{id}, /movie?..., /movie/search?query=..., /season?movieId=...
+Задержка, доля ошибок 5xx и ответов 429 настраиваются через FakeKpSettings.
+
+Как ASGI-приложение подключается к клиенту напрямую:
+    KpExternalAPIClient(FAKE_KP_URL, "token", transport=httpx.ASGITransport(app=FakeKpServer()))
+
+Или поднимается отдельным сервером, чтобы направить на него само приложение (API_BASE_URL):
+    python -m benchmarks.fake_kp --port 8001 --latency 0.05 --error-rate 0.01
+"""
+import argparse
+import asyncio
+import copy
+import json
+import math
+import os
+import random
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'kp')
+FAKE_KP_URL = 'http://fake-kp/v1.4'
+
+
+@dataclass
+class FakeKpSettings:
+    # задержка ответа в секундах и ее случайный разброс
+    latency: float = 0.0
+    jitter: float = 0.0
+    # доля ответов 500 и 429
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    # размер каталога для /movie?...: записанные фильмы размножаются с новыми id
+    catalog_size: int = 200
+    # /movie/{id} с незнакомым id отдает копию записанного фильма, иначе 404
+    clone_unknown_ids: bool = True
+    seed: Optional[int] = None
+
+
+def load_fixture(name: str, fixtures_dir: str = FIXTURES_DIR):
+    with open(os.path.join(fixtures_dir, name), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def parse_range(value: str) -> tuple:
+    lower, _, upper = value.partition('-')
+    return float(lower), float(upper or lower)
+
+
+def get_path(doc: dict, dotted: str):
+    for part in dotted.split('.'):
+        doc = doc.get(part) if isinstance(doc, dict) else None
+    return doc
+
+
+class FakeKpServer:
+    def __init__(self, settings: Optional[FakeKpSettings] = None, fixtures_dir: str = FIXTURES_DIR):
+        self.settings = settings or FakeKpSettings()
+        self.movies: List[dict] = load_fixture('movies.json', fixtures_dir)
+        self.seasons: Dict[str, List[dict]] = load_fixture('seasons.json', fixtures_dir)
+        self.catalog = self._build_catalog(self.settings.catalog_size)
+        self.by_id = {str(movie['id']): movie for movie in self.catalog}
+        self._random = random.Random(self.settings.seed)
+        self.requests = Counter()
+        self.statuses = Counter()
+        self.app = Starlette(routes=[
+            Route('/v1.4/movie', self.movie_filters),
+            Route('/v1.4/movie/search', self.movie_search),
+            Route('/v1.4/movie/{filmid:int}', self.movie),
+            Route('/v1.4/season', self.season),
+        ])
+
+    async def __call__(self, scope, receive, send):
+        await self.app(scope, receive, send)
+
+    def _build_catalog(self, size: int) -> List[dict]:
+        catalog = list(self.movies)
+        copy_number = 1
+        while len(catalog) < size:
+            for movie in self.movies:
+                if len(catalog) >= size:
+                    break
+                catalog.append(self._clone(movie, movie['id'] * 1000 + copy_number))
+            copy_number += 1
+        return catalog
+
+    @staticmethod
+    def _clone(movie: dict, filmid: int) -> dict:
+        clone = copy.deepcopy(movie)
+        clone['id'] = filmid
+        return clone
+
+    def lookup(self, filmid: str) -> Optional[dict]:
+        movie = self.by_id.get(filmid)
+        if movie is None and filmid.isdigit() and self.settings.clone_unknown_ids:
+            movie = self._clone(self.movies[int(filmid) % len(self.movies)], int(filmid))
+        return movie
+
+    def reset_stats(self) -> None:
+        self.requests.clear()
+        self.statuses.clear()
+
+    def stats(self) -> dict:
+        return dict(requests=dict(self.requests), statuses=dict(self.statuses))
+
+    async def _simulate(self, request: Request, endpoint: str) -> Optional[Response]:
+        self.requests[endpoint] += 1
+        settings = self.settings
+        delay = settings.latency + self._random.uniform(0, settings.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if not request.headers.get('X-API-KEY'):
+            return self._respond(JSONResponse({'message': 'API key is missing'}, status_code=401))
+        roll = self._random.random()
+        if roll < settings.rate_limit_rate:
+            return self._respond(JSONResponse({'message': 'Too Many Requests'}, status_code=429))
+        if roll < settings.rate_limit_rate + settings.error_rate:
+            return self._respond(JSONResponse({'message': 'Internal Server Error'}, status_code=500))
+        return None
+
+    def _respond(self, response: Response) -> Response:
+        self.statuses[response.status_code] += 1
+        return response
+
+    @staticmethod
+    def _page(request: Request, docs: List[dict]) -> dict:
+        page = max(int(request.query_params.get('page', 1)), 1)
+        limit = max(int(request.query_params.get('limit', 10)), 1)
+        return dict(
+            docs=docs[(page - 1) * limit:page * limit],
+            total=len(docs),
+            limit=limit,
+            page=page,
+            pages=math.ceil(len(docs) / limit)
+        )
+
+    async def movie(self, request: Request) -> Response:
+        error = await self._simulate(request, 'movie')
+        if error:
+            return error
+
+        movie = self.lookup(str(request.path_params['filmid']))
+        if movie is None:
+            return self._respond(JSONResponse({'message': 'Not Found'}, status_code=404))
+        return self._respond(JSONResponse(movie))
+
+    async def movie_search(self, request: Request) -> Response:
+        error = await self._simulate(request, 'search')
+        if error:
+            return error
+
+        query = request.query_params.get('query', '').lower()
+        docs = [
+            movie for movie in self.catalog
+            if query in (movie.get('name') or '').lower() or query in (movie.get('alternativeName') or '').lower()
+        ]
+        return self._respond(JSONResponse(self._page(request, docs)))
+
+    async def movie_filters(self, request: Request) -> Response:
+        error = await self._simulate(request, 'filters')
+        if error:
+            return error
+
+        params = request.query_params
+        docs = self.catalog
+        ids = params.getlist('id')
+        if ids:
+            docs = [movie for movie in map(self.lookup, ids) if movie is not None]
+        if 'isSeries' in params:
+            is_series = params['isSeries'] == 'true'
+            docs = [movie for movie in docs if movie.get('isSeries') == is_series]
+        for param in ('year', 'rating.kp', 'movieLength'):
+            if param in params:
+                lower, upper = parse_range(params[param])
+                docs = [movie for movie in docs if (get_path(movie, param) or 0) and
+                        lower <= get_path(movie, param) <= upper]
+        for param, field in (('genres.name', 'genres'), ('countries.name', 'countries')):
+            wanted = set(params.getlist(param))
+            if wanted:
+                docs = [movie for movie in docs if wanted & {item['name'] for item in movie.get(field) or []}]
+        return self._respond(JSONResponse(self._page(request, docs)))
+
+    async def season(self, request: Request) -> Response:
+        error = await self._simulate(request, 'season')
+        if error:
+            return error
+
+        filmid = request.query_params.get('movieId', '')
+        docs = self.seasons.get(filmid)
+        if docs is None and filmid.isdigit() and self.settings.clone_unknown_ids:
+            template = list(self.seasons.values())[int(filmid) % len(self.seasons)]
+            docs = [dict(doc, movieId=int(filmid)) for doc in template]
+        docs = docs or []
+        if 'number' in request.query_params:
+            lower, upper = parse_range(request.query_params['number'])
+            docs = [doc for doc in docs if lower <= doc['number'] <= upper]
+        return self._respond(JSONResponse(self._page(request, docs)))
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description='Фейковый Кинопоиск для локальных прогонов')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--catalog-size', type=int, default=200)
+    args = parser.parse_args()
+
+    server = FakeKpServer(FakeKpSettings(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        catalog_size=args.catalog_size
+    ))
+    uvicorn.run(server, host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
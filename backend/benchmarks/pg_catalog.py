@@ -0,0 +1,156 @@
+"""
+Синтетический каталог фильмов и пользователей в Postgres для бенчмарков локального поиска. Каталог создается
+в отдельной схеме (bench_catalog_<rows>) той же базы, что указана в конфигурации, и не трогает рабочие таблицы.
+Таблицы и индексы берутся из ORM-моделей, поэтому бенчмарк всегда меряет текущую схему.
+
+Нужен доступный Postgres: POSTGRES_SETTINGS из YAML_CONFIG_PATH или --dsn.
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
+
+from src.infrastructure.repositories.impl.postgres.film_repository.orm import Film, FilmPerson
+from src.infrastructure.repositories.impl.postgres.film_repository.tools.postgres_search_schema import \
+    FILM_PERSONS_BACKFILL_SQL
+from src.infrastructure.repositories.impl.postgres.social_repository.orm import UserItemORM, UserORM
+
+RU_WORDS = [
+    'побег', 'зеленая', 'миля', 'любовь', 'война', 'мир', 'ночь', 'город', 'тайна', 'последний', 'герой', 'дорога',
+    'время', 'жизнь', 'остров', 'море', 'звезда', 'тень', 'сердце', 'огонь', 'зима', 'лето', 'дом', 'брат', 'сестра',
+    'король', 'охота', 'игра', 'путь', 'легенда', 'история', 'память', 'мечта', 'судьба', 'небо', 'земля', 'ветер',
+    'луна', 'солнце', 'камень', 'река', 'лес', 'поле', 'полет', 'выбор', 'правда', 'ложь', 'страх', 'надежда', 'сон',
+]
+EN_WORDS = [
+    'escape', 'green', 'mile', 'love', 'war', 'peace', 'night', 'city', 'secret', 'last', 'hero', 'road', 'time',
+    'life', 'island', 'sea', 'star', 'shadow', 'heart', 'fire', 'winter', 'summer', 'home', 'brother', 'sister',
+    'king', 'hunt', 'game', 'way', 'legend', 'story', 'memory', 'dream', 'fate', 'sky', 'earth', 'wind', 'moon',
+    'sun', 'stone', 'river', 'forest', 'field', 'flight', 'choice', 'truth', 'lie', 'fear', 'hope', 'sleep',
+]
+GENRES = ['драма', 'комедия', 'триллер', 'боевик', 'фантастика', 'мелодрама', 'ужасы', 'детектив', 'мультфильм']
+COUNTRIES = ['США', 'Россия', 'Франция', 'Великобритания', 'Германия', 'Япония', 'Корея Южная', 'Италия']
+
+# Название - два слова из словаря и уникальный "хвост" из md5, чтобы в каталоге были и частые, и редкие слова.
+# Персоны - небольшой JSONB-массив в формате Film.persons.
+POPULATE_SQL = """
+INSERT INTO films (filmid, name, alternative_name, release_year, is_series, season, description, genres, countries,
+                   ratings, persons, age_rating, time_minutes, last_updated)
+SELECT
+    i::text,
+    initcap((:ru)[1 + (hashtext('a' || i) & 2147483647) % cardinality(:ru)]) || ' ' ||
+        (:ru)[1 + (hashtext('b' || i) & 2147483647) % cardinality(:ru)] || ' ' || substr(md5(i::text), 1, 6),
+    initcap((:en)[1 + (hashtext('a' || i) & 2147483647) % cardinality(:en)]) || ' ' ||
+        (:en)[1 + (hashtext('b' || i) & 2147483647) % cardinality(:en)],
+    1950 + i % 75,
+    i % 7 = 0,
+    CASE WHEN i % 7 = 0 THEN 1 + i % 5 END,
+    'Описание фильма ' || i,
+    jsonb_build_array((:genres)[1 + i % cardinality(:genres)], (:genres)[1 + (i / 3) % cardinality(:genres)]),
+    jsonb_build_array((:countries)[1 + i % cardinality(:countries)]),
+    jsonb_build_object('kp', round((3 + ((hashtext('r' || i) & 2147483647) % 700) / 100.0)::numeric, 1),
+                       'imdb', round((3 + ((hashtext('i' || i) & 2147483647) % 700) / 100.0)::numeric, 1)),
+    jsonb_build_array(
+        jsonb_build_object('id', i % 50000, 'name', 'Персона ' || (i % 50000), 'en_profession', 'director'),
+        jsonb_build_object('id', 50000 + i % 70000, 'name', 'Актер ' || (i % 70000), 'en_profession', 'actor'),
+        jsonb_build_object('id', 120000 + i % 90000, 'name', 'Актриса ' || (i % 90000), 'en_profession', 'actor')
+    ),
+    (ARRAY[0, 6, 12, 16, 18])[1 + i % 5],
+    80 + i % 100,
+    now() - (i % 1000) * interval '1 hour'
+FROM generate_series(:start, :stop) AS i
+"""
+
+# Пользователей в десять раз меньше, чем фильмов: имена вида green_star_123
+POPULATE_USERS_SQL = """
+INSERT INTO user_item (item_id, username, role, status, subscribers_count, reviews_count, playlists_count,
+                       subscribes_count)
+SELECT md5('u' || i)::uuid,
+       (:en)[1 + (hashtext('c' || i) & 2147483647) % cardinality(:en)] || '_' ||
+           (:en)[1 + (hashtext('d' || i) & 2147483647) % cardinality(:en)] || '_' || i,
+       'USER',
+       CASE WHEN i % 5 = 0 THEN 'PRIVATE' ELSE 'PUBLIC' END,
+       0, 0, 0, 0
+FROM generate_series(:start, :stop) AS i;
+
+INSERT INTO "user" (id, login, hashed_password, item_id)
+SELECT md5('l' || i)::uuid, 'login_' || i, '-', md5('u' || i)::uuid
+FROM generate_series(:start, :stop) AS i;
+"""
+
+
+def postgres_settings():
+    from src.config.settings import AppSettings
+
+    os.environ.setdefault('YAML_CONFIG_PATH', os.path.join(os.path.dirname(__file__), '..', 'example_config.yaml'))
+    return AppSettings().from_yaml().POSTGRES_SETTINGS
+
+
+def make_engine(dsn: Optional[str] = None) -> Engine:
+    """Движок с теми же параметрами соединения (пороги pg_trgm), что и у приложения."""
+    from src.config.settings import PostgresSettings
+
+    settings = postgres_settings() if dsn is None else PostgresSettings.model_construct()
+    return create_engine(dsn or settings.make_url(), connect_args={'options': settings.connect_options()})
+
+
+def schema_name(rows: int) -> str:
+    return f'bench_catalog_{rows}'
+
+
+@contextmanager
+def catalog(engine: Engine, rows: int, rebuild: bool = False, batch: int = 100_000) -> Iterator[Connection]:
+    """
+    Соединение с search_path на схему каталога из rows фильмов и rows // 10 пользователей. Каталог строится
+    один раз и переиспользуется между запусками (rebuild=True - пересоздать, например после изменения индексов
+    в ORM).
+    """
+    schema = schema_name(rows)
+    with engine.connect() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM information_schema.tables WHERE table_schema = :schema AND table_name = 'user'"),
+            {'schema': schema}
+        ).first()
+
+        if rebuild or not exists:
+            # расширение - в public, чтобы не удалять его вместе со схемой каталога
+            conn.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm SCHEMA public'))
+            conn.execute(text(f'DROP SCHEMA IF EXISTS {schema} CASCADE'))
+            conn.execute(text(f'CREATE SCHEMA {schema}'))
+            conn.execute(text(f'SET search_path TO {schema}, public'))
+            for table in (Film.__table__, FilmPerson.__table__, UserItemORM.__table__, UserORM.__table__):
+                table.create(conn)
+
+            started = time.perf_counter()
+            for start in range(1, rows + 1, batch):
+                conn.execute(text(POPULATE_SQL), {
+                    'ru': RU_WORDS, 'en': EN_WORDS, 'genres': GENRES, 'countries': COUNTRIES,
+                    'start': start, 'stop': min(start + batch - 1, rows)
+                })
+            conn.execute(text(FILM_PERSONS_BACKFILL_SQL))
+            users = max(rows // 10, 1)
+            for start in range(1, users + 1, batch):
+                conn.execute(text(POPULATE_USERS_SQL), {'en': EN_WORDS, 'start': start,
+                                                        'stop': min(start + batch - 1, users)})
+            conn.execute(text('ANALYZE films, film_persons, user_item, "user"'))
+            conn.commit()
+            print(f'{schema}: {rows} фильмов за {time.perf_counter() - started:.1f} с')
+
+        # search_path фиксируется коммитом, чтобы пережить rollback в бенчмарках (сброс SET LOCAL)
+        conn.execute(text(f'SET search_path TO {schema}, public'))
+        conn.commit()
+        try:
+            yield conn
+        finally:
+            conn.rollback()
+            conn.execute(text('RESET search_path'))
+            conn.commit()
+
+
+def explain(conn: Connection, statement) -> str:
+    """EXPLAIN (ANALYZE, BUFFERS) для SQLAlchemy-запроса."""
+    compiled = statement.compile(dialect=conn.dialect)
+    rows = conn.exec_driver_sql(f'EXPLAIN (ANALYZE, BUFFERS) {compiled.string}', compiled.params).all()
+    return '\n'.join(row[0] for row in rows)
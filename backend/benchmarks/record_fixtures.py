@@ -0,0 +1,58 @@
+"""
+Перезаписывает фикстуры фейкового KP (fixtures/kp) ответами настоящего API.
+
+    KP_TOKEN=... python -m benchmarks.record_fixtures --films 326 435 448 41520 --series 464963 77044
+
+Тратит по запросу на фильм и по запросу на каждую страницу сезонов сериала.
+"""
+import argparse
+import json
+import os
+
+import httpx
+
+from benchmarks.fake_kp import FIXTURES_DIR
+
+KP_URL = 'https://api.kinopoisk.dev/v1.4'
+
+
+def record(token: str, films: list, series: list, fixtures_dir: str = FIXTURES_DIR) -> None:
+    movies = []
+    seasons = {}
+    with httpx.Client(base_url=KP_URL, headers={'X-API-KEY': token, 'accept': 'application/json'},
+                      timeout=30) as client:
+        for filmid in [*films, *series]:
+            response = client.get(f'/movie/{filmid}')
+            response.raise_for_status()
+            movies.append(response.json())
+
+        for filmid in series:
+            docs, page, pages = [], 1, 1
+            while page <= pages:
+                response = client.get('/season', params={'movieId': filmid, 'page': page, 'limit': 50})
+                response.raise_for_status()
+                data = response.json()
+                docs.extend(data.get('docs', []))
+                pages = data.get('pages') or 1
+                page += 1
+            seasons[str(filmid)] = docs
+
+    os.makedirs(fixtures_dir, exist_ok=True)
+    for name, data in (('movies.json', movies), ('seasons.json', seasons)):
+        with open(os.path.join(fixtures_dir, name), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Запись фикстур фейкового KP из настоящего API')
+    parser.add_argument('--films', nargs='+', default=['326', '435', '448', '41520'])
+    parser.add_argument('--series', nargs='*', default=['464963', '77044'])
+    parser.add_argument('--token', default=os.environ.get('KP_TOKEN'))
+    args = parser.parse_args()
+    if not args.token:
+        parser.error('нужен токен KP: --token или переменная KP_TOKEN')
+    record(args.token, args.films, args.series)
+
+
+if __name__ == '__main__':
+    main()
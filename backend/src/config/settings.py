@@ -1,7 +1,7 @@
 import yaml
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import Dict, List, Optional
 from enum import Enum
 
 from src.domain.entities.user import UserRegisterForm
@@ -27,9 +27,77 @@ class RatingScale(BaseModel):
     VALUES: List[str]
 
 
+class ResponseCacheBackend(str, Enum):
+    MEMORY = "memory"
+    SQLITE = "sqlite"
+
+
+class ResponseCacheSettings(BaseModel):
+    ENABLED: bool = True
+    # memory - LRU в памяти процесса, sqlite - файл на диске, общий для воркеров и переживающий рестарт
+    BACKEND: ResponseCacheBackend = ResponseCacheBackend.MEMORY
+    PATH: str = "cache/kp_responses.sqlite3"
+    MAX_SIZE: int = 2048
+    STALE_TTL: float = 600
+    # TTL для промахов: 404 по id и поиски с пустым docs
+    NEGATIVE_TTL: float = 60
+    # TTL в секундах для каждого эндпоинта: movie - /movie/{id}, search - /movie/search,
+    # filters - /movie?..., season - /season?...
+    TTL: Dict[str, float] = {'movie': 3600, 'search': 300, 'filters': 600, 'season': 3600}
+
+
+class QuotaSettings(BaseModel):
+    RATE_PER_SECOND: float = 5
+    BURST: Optional[int] = None
+    DAILY_LIMIT: Optional[int] = None
+    # сколько запросов из дневного бюджета оставить только для интерактивных запросов
+    BACKGROUND_RESERVE: int = 0
+
+
+class ResilienceSettings(BaseModel):
+    MAX_RETRIES: int = 2
+    BACKOFF_BASE: float = 0.2
+    BACKOFF_MAX: float = 2
+    # таймауты в секундах по эндпоинтам (movie, search, filters, season), иначе используется TIMEOUT
+    TIMEOUTS: Dict[str, float] = {'movie': 5, 'search': 5, 'filters': 8, 'season': 10}
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_TIMEOUT: float = 30
+
+
 class ExternalApiSettings(BaseSettings):
     API_BASE_URL: str
-    API_ACCESS_TOKEN: str
+    API_ACCESS_TOKEN: Optional[str] = None
+    API_ACCESS_TOKENS: Optional[List[str]] = None
+    KEY_COOLDOWN: Optional[float] = 60
+    INVALID_KEY_COOLDOWN: Optional[float] = 3600
+    TIMEOUT: Optional[float] = 10
+    MAX_CONNECTIONS: Optional[int] = 20
+    MAX_KEEPALIVE_CONNECTIONS: Optional[int] = 10
+    RESPONSE_CACHE: Optional[ResponseCacheSettings] = ResponseCacheSettings()
+    SEASON_PAGE_SIZE: Optional[int] = 10
+    BATCH_SIZE: Optional[int] = 50
+    BATCH_CONCURRENCY: Optional[int] = 5
+    # сколько страниц можно загрузить при поиске по названию, чтобы после локальной фильтрации набрать limit фильмов;
+    # если под остальные фильтры в /movie попадает не больше SEARCH_MAX_PAGES * 250 фильмов, ищем через /movie
+    SEARCH_MAX_PAGES: Optional[int] = 3
+    # сколько секунд помнить, сколько фильмов /movie находит по набору фильтров (пробный запрос планировщика)
+    SEARCH_TOTALS_TTL: Optional[float] = 3600
+    # разбирать docs больших ответов (пакеты /movie?id=..) потоково, не загружая весь JSON в память
+    STREAM_DOCS: Optional[bool] = False
+    QUOTA: Optional[QuotaSettings] = None
+    RESILIENCE: Optional[ResilienceSettings] = ResilienceSettings()
+
+    @model_validator(mode='after')
+    def check_tokens(self):
+        if not self.get_tokens():
+            raise ValueError("API_ACCESS_TOKEN or API_ACCESS_TOKENS must be set")
+        return self
+
+    def get_tokens(self) -> List[str]:
+        tokens = list(self.API_ACCESS_TOKENS or [])
+        if self.API_ACCESS_TOKEN and self.API_ACCESS_TOKEN not in tokens:
+            tokens.insert(0, self.API_ACCESS_TOKEN)
+        return tokens
 
 
 class PostgresSettings(BaseSettings):
@@ -39,12 +107,20 @@ class PostgresSettings(BaseSettings):
     SCHEMA: str
     HOST: str
     PORT: Optional[int] = None
+    # пороги pg_trgm для нечеткого поиска (операторы % и <%): выше - строже, меньше опечаток прощается
+    TRGM_SIMILARITY_THRESHOLD: float = 0.3
+    TRGM_WORD_SIMILARITY_THRESHOLD: float = 0.5
 
     def make_url(self):
         if not self.PORT:
             return f"postgresql://{self.USERNAME}:{self.PASSWORD}@{self.HOST}/{self.DB_NAME}"
         return f"postgresql://{self.USERNAME}:{self.PASSWORD}@{self.HOST}:{self.PORT}/{self.DB_NAME}"
 
+    def connect_options(self) -> str:
+        # задаются на соединение, а не в запросе: только так операторы pg_trgm используют GIN-индексы
+        return (f"-c pg_trgm.similarity_threshold={self.TRGM_SIMILARITY_THRESHOLD} "
+                f"-c pg_trgm.word_similarity_threshold={self.TRGM_WORD_SIMILARITY_THRESHOLD}")
+
 
 class SecuritySettings(BaseSettings):
     SECRET_KEY: str
@@ -1,4 +1,6 @@
 import jwt
+from functools import lru_cache
+from typing import Generator
 from sqlmodel import Session
 from fastapi import Depends, HTTPException, Cookie, status
 from passlib.context import CryptContext
@@ -11,7 +13,10 @@ from src.services.film.service import FilmService
 from src.services.playlist.service import PlaylistService
 from src.services.social.service import SocialService
 from src.infrastructure.factories.api import API
+from src.shared.tools.api_clients.core.base_external_api_client import BaseExternalAPIClient
 from src.infrastructure.repositories.impl.postgres.film_repository.external_search_film_repository import KpApiSearchFilmRepository
+from src.infrastructure.repositories.impl.postgres.film_repository.tools.search_planner import ExternalSearchPlanner
+from src.infrastructure.repositories.impl.postgres.film_repository.tools.postgres_search_schema import create_search_schema
 from src.infrastructure.repositories.impl.postgres.film_repository.local_search_film_repository import PostgresSearchFilmRepository
 from src.infrastructure.repositories.impl.postgres.film_repository.operations_film_repository import PostgresFilmOperationsRepository
 from src.infrastructure.repositories.impl.postgres.playlist_repository.playlist_repository import PostgresPlaylistRepository
@@ -23,21 +28,54 @@ from src.web.models.users import AccessModel as UserAccessModel
 from src.infrastructure.factories.database import Database
 from src.config.settings import AppSettings
 
-app_settings = AppSettings().from_yaml()
-pg_client = Database(app_settings, False)
-api_client = API(app_settings)
+# Настройки, БД и клиенты создаются при первом обращении, а не при импорте: роутеры импортируют этот модуль ради
+# ключей зависимостей, и без config.yaml его импорт (например, в тестах с dependency_overrides) не должен падать
+
+
+@lru_cache
+def get_app_settings() -> AppSettings:
+    return AppSettings().from_yaml()
+
+
+@lru_cache
+def get_pg_client() -> Database:
+    return Database(get_app_settings(), False)
+
+
+@lru_cache
+def get_api_client() -> API:
+    return API(get_app_settings())
+
+
+@lru_cache
+def get_search_planner() -> ExternalSearchPlanner:
+    # общий на процесс: в нем кэш total пробных запросов
+    app_settings = get_app_settings()
+    return ExternalSearchPlanner(
+        get_api_client().get_client(),
+        max_pages=app_settings.EXTERNAL_API_SETTINGS.SEARCH_MAX_PAGES,
+        totals_ttl=app_settings.EXTERNAL_API_SETTINGS.SEARCH_TOTALS_TTL
+    )
+
+
+def get_session() -> Generator[Session, None, None]:
+    yield from get_pg_client().get_session()
+
 
 crypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-session_dep: Session = Depends(pg_client.get_session)
+session_dep: Session = Depends(get_session)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    app_settings = get_app_settings()
+    pg_client = get_pg_client()
     print('Инициализация схемы БД...')
     pg_client.init_db()
     print('Схема БД инициализирована.')
 
     local_session = next(pg_client.get_session())
+    create_search_schema(local_session)
     repo = PostgresSocialRepository(session=local_session)
     auth_service = AuthService(
         app_settings.SECURITY_SETTINGS,
@@ -53,12 +91,13 @@ async def lifespan(app: FastAPI):
         pass
     local_session.close()
     yield
+    await get_api_client().close()
     print("💥 Shutdown")
 
 
 def get_auth_service_dep(session: Session = session_dep) -> AuthService:
     return AuthService(
-        security_config=app_settings.SECURITY_SETTINGS,
+        security_config=get_app_settings().SECURITY_SETTINGS,
         social_repository=PostgresSocialRepository(session),
         pwd_context=crypt_context
     )
@@ -72,10 +111,15 @@ def get_social_service_dep(session: Session = session_dep) -> SocialService:
     )
 
 
+def get_external_api_client_dep() -> BaseExternalAPIClient:
+    return get_api_client().get_client()
+
+
 def get_film_service_dep(session: Session = session_dep) -> FilmService:
     return FilmService(
         local_search_repository=PostgresSearchFilmRepository(session, SQLModelExceptionHandler()),
-        external_search_repository=KpApiSearchFilmRepository(api_client.get_client()),
+        external_search_repository=KpApiSearchFilmRepository(get_api_client().get_client(),
+                                                             get_search_planner()),
         operations_repository=PostgresFilmOperationsRepository(session,
                                                                SQLModelExceptionHandler()),
         series_to_film_policy=DefaultSeriesToFilmPolicy()
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, HttpUrl, Field, validator
 from typing import Optional, List
 from datetime import datetime
+from src.domain.entities.lazy_list import LazyModelList
 from src.web.models.film_rating import BaseFilmComplexRating, BaseRatingScale
 from enum import Enum
 
@@ -40,6 +41,7 @@ class FilmPersonal(FilmBase):
     last_updated: Optional[datetime] = Field(None, description="Дата последнего обновления информации")
     added_at: Optional[datetime] = Field(None, description="Дата добавления фильма пользователем")
     playlists: Optional[List[str]] = Field(None, description="Названия плейлистов, в которые входит.")
+    degraded: Optional[bool] = Field(None, description="Получен из локального каталога, так как внешний API недоступен")
 
 
 class FilmPreview(FilmPersonal):
@@ -65,22 +67,25 @@ class FilmExtended(FilmPersonal):
     director: Optional[str] = Field(None, description="Режиссер")
     description: Optional[str] = Field(None, description="Описание фильма")
     age_rating: Optional[int] = Field(None, description="Возрастной рейтинг")
-    persons: Optional[List[Person]] = Field(None, description="Каст фильма + режиссеры")
+    # каст и серии валидируются лениво: при обращении или при сериализации ответа
+    persons: Optional[LazyModelList[Person]] = Field(None, description="Каст фильма + режиссеры")
     time_minutes: Optional[int] = Field(None, description="Длительность в минутах")
     ratings: Optional[dict[str, Optional[float]]] = Field(None, description="Оценки по разным рейтингам")
     trailers: Optional[List[str]] = Field(None, description="Ссылки на трейлеры")
     end_year: Optional[int] = Field(None, description="Год окончания съемок")
     status: Optional[str] = Field(None, description="Этап производства")
     tops: Optional[List[str]] = Field(None, description="Позиции в топах")
-    episodes: Optional[List[Episode]] = Field(None, description="Описание серий")
+    episodes: Optional[LazyModelList[Episode]] = Field(None, description="Описание серий")
 
     @validator('episodes')
     def sort_episodes(cls, v):
         if v:
-            return sorted(v, key=lambda ep: ep.number)
+            return v.sorted(key=lambda ep: ep.number)
         return v
 
 
 class FilmTypes(Enum):
     FILM_PREVIEW = 'FilmPreview'
     FILM_EXTENDED = 'FilmExtended'
+    # dict с полями FilmPreview без сборки моделей - для прямой сериализации больших списков в ответ
+    FILM_PREVIEW_DICT = 'FilmPreviewDict'
@@ -0,0 +1,94 @@
+from functools import partial
+from typing import Any, Callable, Generic, Iterator, List, Optional, TypeVar, get_args
+
+from pydantic import GetCoreSchemaHandler, TypeAdapter
+from pydantic_core import core_schema
+
+T = TypeVar('T')
+
+
+class LazyModelList(Generic[T]):
+    """
+    Список моделей, который хранит исходные данные (dict из ответа API или JSONB из БД) и валидирует их
+    только при первом обращении к элементам или при сериализации ответа. Пока список никто не читал,
+    он сохраняется в БД как есть, без сборки и повторного дампа моделей.
+    """
+
+    __slots__ = ('_adapter', '_raw', '_items', '_key')
+
+    def __init__(self, adapter: TypeAdapter, raw: list, key: Optional[Callable[[T], Any]] = None):
+        self._adapter = adapter
+        self._raw = raw
+        self._items: Optional[List[T]] = None
+        self._key = key
+
+    @property
+    def is_materialized(self) -> bool:
+        return self._items is not None
+
+    @property
+    def raw(self) -> list:
+        # после материализации отдаем модели: их могли изменить
+        return self._items if self._items is not None else self._raw
+
+    @property
+    def items(self) -> List[T]:
+        if self._items is None:
+            items = self._adapter.validate_python(self._raw)
+            self._items = sorted(items, key=self._key) if self._key else items
+        return self._items
+
+    def sorted(self, key: Callable[[T], Any]) -> 'LazyModelList[T]':
+        """Сортировка откладывается до материализации."""
+        if self._items is not None:
+            return LazyModelList(self._adapter, sorted(self._items, key=key))
+        return LazyModelList(self._adapter, self._raw, key)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __bool__(self) -> bool:
+        return bool(self.raw)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyModelList):
+            return self.items == other.items
+        if isinstance(other, list):
+            return self.items == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        if self._items is None:
+            return f'LazyModelList(<{len(self._raw)} not validated>)'
+        return f'LazyModelList({self._items!r})'
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        (item_type,) = get_args(source) or (Any,)
+        adapter = TypeAdapter(List[item_type])
+        list_schema = handler.generate_schema(List[item_type])
+        return core_schema.no_info_plain_validator_function(
+            partial(cls._validate, adapter),
+            json_schema_input_schema=list_schema,
+            # сериализатор только материализует список, сами модели дампит схема списка
+            serialization=core_schema.plain_serializer_function_ser_schema(cls._serialize, return_schema=list_schema)
+        )
+
+    @classmethod
+    def _validate(cls, adapter: TypeAdapter, value: Any) -> 'LazyModelList':
+        if isinstance(value, LazyModelList):
+            return value
+        if isinstance(value, (list, tuple)):
+            return cls(adapter, list(value))
+        raise ValueError('Input should be a valid list')
+
+    @staticmethod
+    def _serialize(value: Any) -> list:
+        # model_copy(update=...) не валидирует, поэтому здесь может оказаться обычный список моделей
+        return value.items if isinstance(value, LazyModelList) else value
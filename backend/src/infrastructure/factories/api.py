@@ -1,13 +1,79 @@
-from src.config.settings import AppSettings
+from typing import Optional
+
+from src.config.settings import AppSettings, ResponseCacheBackend
 from src.shared.tools.api_clients.impl.kp_api_external_client import KpExternalAPIClient
+from src.shared.tools.caches.impl.lru_response_cache import LRUResponseCache
+from src.shared.tools.caches.impl.sqlite_response_cache import SQLiteResponseCache
+from src.shared.tools.rate_limiting.quota_manager import QuotaManager
+from src.shared.tools.rate_limiting.api_key_pool import ApiKey, ApiKeyPool
+from src.shared.tools.resilience.circuit_breaker import CircuitBreaker
 
 
 class API:
     def __init__(self, settings: AppSettings):
         api_settings = settings.EXTERNAL_API_SETTINGS
         base_url = api_settings.API_BASE_URL
-        token = api_settings.API_ACCESS_TOKEN
-        self._client = KpExternalAPIClient(base_url, token)
+        cache_settings = api_settings.RESPONSE_CACHE
+
+        response_cache = None
+        if cache_settings and cache_settings.ENABLED:
+            if cache_settings.BACKEND == ResponseCacheBackend.SQLITE:
+                response_cache = SQLiteResponseCache(cache_settings.PATH, max_size=cache_settings.MAX_SIZE)
+            else:
+                response_cache = LRUResponseCache(max_size=cache_settings.MAX_SIZE)
+
+        # у каждого ключа свои лимиты, поэтому и QuotaManager у каждого свой
+        key_pool = ApiKeyPool(
+            [ApiKey(token, self._make_quota_manager(settings)) for token in api_settings.get_tokens()],
+            cooldown=api_settings.KEY_COOLDOWN,
+            invalid_key_cooldown=api_settings.INVALID_KEY_COOLDOWN
+        )
+
+        resilience = api_settings.RESILIENCE
+        circuit_breaker = None
+        if resilience:
+            circuit_breaker = CircuitBreaker(
+                name='kinopoisk',
+                failure_threshold=resilience.CIRCUIT_FAILURE_THRESHOLD,
+                reset_timeout=resilience.CIRCUIT_RESET_TIMEOUT
+            )
+
+        self._client = KpExternalAPIClient(
+            base_url,
+            key_pool,
+            timeout=api_settings.TIMEOUT,
+            max_connections=api_settings.MAX_CONNECTIONS,
+            max_keepalive_connections=api_settings.MAX_KEEPALIVE_CONNECTIONS,
+            response_cache=response_cache,
+            cache_ttls=cache_settings.TTL if cache_settings else None,
+            cache_stale_ttl=cache_settings.STALE_TTL if cache_settings else 0,
+            cache_negative_ttl=cache_settings.NEGATIVE_TTL if cache_settings else 0,
+            season_page_size=api_settings.SEASON_PAGE_SIZE,
+            batch_size=api_settings.BATCH_SIZE,
+            batch_concurrency=api_settings.BATCH_CONCURRENCY,
+            search_max_pages=api_settings.SEARCH_MAX_PAGES,
+            stream_docs=api_settings.STREAM_DOCS,
+            endpoint_timeouts=resilience.TIMEOUTS if resilience else None,
+            max_retries=resilience.MAX_RETRIES if resilience else 0,
+            backoff_base=resilience.BACKOFF_BASE if resilience else 0.2,
+            backoff_max=resilience.BACKOFF_MAX if resilience else 2,
+            circuit_breaker=circuit_breaker
+        )
+
+    @staticmethod
+    def _make_quota_manager(settings: AppSettings) -> Optional[QuotaManager]:
+        quota = settings.EXTERNAL_API_SETTINGS.QUOTA
+        if not quota:
+            return None
+        return QuotaManager(
+            rate_per_second=quota.RATE_PER_SECOND,
+            burst=quota.BURST,
+            daily_limit=quota.DAILY_LIMIT,
+            background_reserve=quota.BACKGROUND_RESERVE
+        )
 
     def get_client(self):
         return self._client
+
+    async def close(self):
+        await self._client.aclose()
@@ -10,7 +10,9 @@ class Database:
         self.settings = settings
 
         db_url = settings.POSTGRES_SETTINGS.make_url()
-        self.engine = create_engine(db_url, echo=echo)
+        self.engine = create_engine(db_url, echo=echo, connect_args={
+            "options": settings.POSTGRES_SETTINGS.connect_options()
+        })
 
     def init_db(self):
         SQLModel.metadata.create_all(self.engine)
@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from dataclasses import dataclass
 from typing import List, Optional, Union
 from src.domain.entities.film import FilmPreview, FilmBase, FilmExtended, FilmTypes
 from src.web.models.film_rating import BaseFilmComplexRating
@@ -6,12 +7,24 @@ from src.web.models.search_filters import BaseSearchingFilters, BaseApiSearching
 from src.domain.entities.user import User
 
 
+@dataclass
+class FilmSearchPage:
+    items: Union[List[FilmPreview], List[FilmExtended], List[dict]]
+    # курсор следующей страницы; None - страница последняя или поиск без limit
+    next_cursor: Optional[str] = None
+
+
 class BaseLocalSearchFilmRepository:
     @abstractmethod
     def search_by_filters(self, user: Optional[User], filters: BaseSearchingFilters,
                           out_model: FilmTypes = FilmTypes.FILM_PREVIEW) -> \
             Optional[
-                Union[List[FilmPreview], List[FilmExtended]]]:
+                Union[List[FilmPreview], List[FilmExtended], List[dict]]]:
+        pass
+
+    @abstractmethod
+    def search_page(self, user: Optional[User], filters: BaseSearchingFilters,
+                    out_model: FilmTypes = FilmTypes.FILM_PREVIEW) -> FilmSearchPage:
         pass
 
     @abstractmethod
@@ -21,19 +34,23 @@ class BaseLocalSearchFilmRepository:
 
 class BaseExternalSearchFilmRepository:
     @abstractmethod
-    def search_by_filters(self, filters: BaseApiSearchingFilters) -> List[FilmPreview]:
+    async def search_by_filters(self, filters: BaseApiSearchingFilters) -> List[FilmPreview]:
+        pass
+
+    @abstractmethod
+    async def get(self, film_to_get: FilmBase) -> Optional[FilmExtended]:
         pass
 
     @abstractmethod
-    def get(self, film_to_get: FilmBase) -> Optional[FilmExtended]:
+    async def get_many(self, filters: BaseApiSearchingFilters) -> List[FilmExtended]:
         pass
 
     @abstractmethod
-    def search_by_name(self, filters: BaseApiSearchingFilters) -> Optional[List[FilmPreview]]:
+    async def search_by_name(self, filters: BaseApiSearchingFilters) -> Optional[List[FilmPreview]]:
         pass
 
     @abstractmethod
-    def get_seasons(self, filters: BaseApiSearchingFilters) -> List[FilmExtended]:
+    async def get_seasons(self, filters: BaseApiSearchingFilters) -> List[FilmExtended]:
         pass
 
 
@@ -63,7 +80,8 @@ class BaseFilmOperationsRepository:
         pass
 
     @abstractmethod
-    def get_list(self, user: User, is_watched: bool = True) -> List[FilmPreview]:
+    def get_list(self, user: User, is_watched: bool = True,
+                 out_model: FilmTypes = FilmTypes.FILM_PREVIEW) -> Union[List[FilmPreview], List[dict]]:
         pass
 
     @abstractmethod
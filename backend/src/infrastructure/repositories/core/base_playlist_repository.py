@@ -1,7 +1,7 @@
 from abc import abstractmethod
 from typing import List, Optional, Union
 
-from src.domain.entities.film import FilmBase
+from src.domain.entities.film import FilmBase, FilmTypes
 from src.domain.entities.playlist import Playlist, PlaylistItem, PlaylistItemPreview
 from src.domain.entities.user import User
 from src.web.models.playlists import CreatePlaylistModel, PlaylistSearchFilters
@@ -41,7 +41,8 @@ class BasePlaylistRepository:
         pass
 
     @abstractmethod
-    def get_playlist_content(self, filters: PlaylistSearchFilters) -> Optional[List[PlaylistItemPreview]]:
+    def get_playlist_content(self, filters: PlaylistSearchFilters, out_model: FilmTypes = FilmTypes.FILM_PREVIEW) -> \
+            Optional[Union[List[PlaylistItemPreview], List[dict]]]:
         pass
 
     @abstractmethod
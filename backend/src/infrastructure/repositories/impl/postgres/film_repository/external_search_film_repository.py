@@ -1,45 +1,101 @@
+from functools import wraps
+
 from src.domain.entities.film import FilmPreview, FilmExtended
 from src.shared.tools.api_clients.core.base_external_api_client import BaseExternalAPIClient
+from src.shared.tools.resilience.circuit_breaker import CircuitOpenException
+from src.shared.tools.rate_limiting.quota_manager import QuotaExceededException
+from src.shared.tools.rate_limiting.api_key_pool import NoAvailableApiKeyException
+from src.shared.tools.pagination import take_matches
 from src.infrastructure.repositories.core.base_film_repositories import BaseExternalSearchFilmRepository
 from typing import List, Optional
 
 from src.infrastructure.repositories.impl.postgres.film_repository.tools.query_builders import LocalFilmListFilter
+from src.infrastructure.repositories.impl.postgres.film_repository.tools.search_planner import ExternalSearchPlanner, \
+    ExternalSearchPlan, SearchEndpoint
 from src.services.film.exceptions import MissingSearchFilterException, MissingGetFilterException, \
-    MissingSeasonsFilterException, NotFoundExternalException
+    MissingSeasonsFilterException, NotFoundExternalException, ExternalApiUnavailableException
 from src.web.models.search_filters import BaseApiSearchingFilters
 
 
+def wrap_request(func):
+    @wraps(func)
+    async def wrapper(self, filters: BaseApiSearchingFilters, *args, **kwargs):
+        try:
+            return await func(self, filters, *args, **kwargs)
+        except (CircuitOpenException, QuotaExceededException, NoAvailableApiKeyException):
+            # цепь разомкнута или кончились ключи/квота - запрос до API не дойдет, это та же недоступность
+            raise ExternalApiUnavailableException(filters)
+
+    return wrapper
+
+
 class KpApiSearchFilmRepository(BaseExternalSearchFilmRepository):
-    def __init__(self, api_client: BaseExternalAPIClient):
+    def __init__(self, api_client: BaseExternalAPIClient, planner: Optional[ExternalSearchPlanner] = None):
         self._api_client = api_client
+        self._planner = planner or ExternalSearchPlanner(api_client)
 
-    def search_by_name(self, filters: BaseApiSearchingFilters) -> Optional[List[FilmPreview]]:
+    @wrap_request
+    async def search_by_name(self, filters: BaseApiSearchingFilters) -> Optional[List[FilmPreview]]:
         if filters.name:
-            api_result = self._api_client.search_by_name(filters)
+            plan = await self._planner.plan(filters)
+            if plan.total == 0:
+                return []
 
-            co_filter = LocalFilmListFilter(api_result)
-            final_result = co_filter.apply_all(filters)
+            skip = 0
+            if plan.endpoint == SearchEndpoint.FILTERS:
+                # /movie отдает все подходящие под ограничения фильмы с первой страницы KP, поэтому запрошенная
+                # страница - это (page - 1) * limit пропущенных совпадений
+                pages = self._api_client.iter_search_by_filters(plan.query, max_pages=plan.max_pages)
+                skip = ((filters.page or 1) - 1) * filters.limit
+            else:
+                pages = self._api_client.iter_search_by_name(plan.query, max_pages=self._name_search_pages(filters, plan))
 
-            return final_result
+            # страницы фильтруются по мере загрузки; набрали limit фильмов - дальше не идем
+            return await take_matches(
+                pages,
+                lambda page: LocalFilmListFilter(page).apply_all(filters),
+                filters.limit,
+                skip
+            )
 
         raise MissingSearchFilterException(filters)
 
-    def search_by_filters(self, filters: BaseApiSearchingFilters) -> List[FilmPreview]:
-        api_result = self._api_client.search_by_filters(filters)
+    @staticmethod
+    def _name_search_pages(filters: BaseApiSearchingFilters, plan: ExternalSearchPlan) -> int:
+        # по одному названию KP уже отфильтровал выдачу, локальная проверка подстрок отсеивает немногое - добирать
+        # страницами нечего. С другими фильтрами добираем, только если клиент сам задал limit: иначе целью был бы
+        # limit по умолчанию, который почти никогда не набирается, и каждый поиск стоил бы max_pages запросов
+        post_filters = filters.get_non_null_fileds_exclude_extension()
+        if set(post_filters) <= {'name'} or 'limit' not in filters.model_fields_set:
+            return 1
+        return plan.max_pages
+
+    @wrap_request
+    async def search_by_filters(self, filters: BaseApiSearchingFilters) -> List[FilmPreview]:
+        api_result = await self._api_client.search_by_filters(filters)
 
         if api_result is None:
             raise NotFoundExternalException(filters)
 
         return api_result
 
-    def get(self, filters: BaseApiSearchingFilters) -> Optional[FilmExtended]:
+    @wrap_request
+    async def get(self, filters: BaseApiSearchingFilters) -> Optional[FilmExtended]:
         if filters.filmid:
-            return self._api_client.get(filters)
+            return await self._api_client.get(filters)
+
+        raise MissingGetFilterException(filters)
+
+    @wrap_request
+    async def get_many(self, filters: BaseApiSearchingFilters) -> List[FilmExtended]:
+        if filters.filmids:
+            return await self._api_client.get_many(filters.filmids)
 
         raise MissingGetFilterException(filters)
 
-    def get_seasons(self, filters: BaseApiSearchingFilters) -> List[FilmExtended]:
+    @wrap_request
+    async def get_seasons(self, filters: BaseApiSearchingFilters) -> List[FilmExtended]:
         if filters.filmid and filters.is_series is True:
-            return self._api_client.get_all_seasons(filters)
+            return await self._api_client.get_all_seasons(filters)
 
         raise MissingSeasonsFilterException(filters)
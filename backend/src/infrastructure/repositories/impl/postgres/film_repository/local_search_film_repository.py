@@ -5,12 +5,13 @@ from typing import List, Optional, Union
 from src.domain.entities.film import FilmPreview, FilmBase, FilmExtended, FilmTypes
 from src.domain.entities.user import User
 from src.infrastructure.repositories.impl.postgres.film_repository.tools.query_builders import LocalFilmSearchQueryBuilder
-from src.infrastructure.repositories.core.base_film_repositories import BaseLocalSearchFilmRepository
+from src.infrastructure.repositories.core.base_film_repositories import BaseLocalSearchFilmRepository, FilmSearchPage
 from src.infrastructure.repositories.impl.postgres.film_repository.orm import Film, UserFilm
 from src.shared.exceptions.base_exception_handler import BaseExceptionHandler
 from src.web.models.search_filters import BaseSearchingFilters
 from src.shared.mappers.orm_to_model import orm_join_to_film_extended, orm_join_to_film_preview, orm_to_film_preview, \
     orm_to_film_extended
+from src.shared.mappers.orm_to_response import orm_join_to_film_preview_dict, orm_to_film_preview_dict
 
 
 def wrap_query(func):
@@ -40,13 +41,29 @@ class PostgresSearchFilmRepository(BaseLocalSearchFilmRepository):
     @wrap_query
     def search_by_filters(self, user: Optional[User], filters: BaseSearchingFilters,
                           out_model: FilmTypes = FilmTypes.FILM_PREVIEW) -> Optional[
-        Union[List[FilmPreview], List[FilmExtended]]]:
+        Union[List[FilmPreview], List[FilmExtended], List[dict]]]:
+        found_films = self._search(user, filters, out_model).items
+
+        if len(found_films) > 0:
+            return found_films
+
+        return None
+
+    @wrap_query
+    def search_page(self, user: Optional[User], filters: BaseSearchingFilters,
+                    out_model: FilmTypes = FilmTypes.FILM_PREVIEW) -> FilmSearchPage:
+        return self._search(user, filters, out_model)
+
+    def _search(self, user: Optional[User], filters: BaseSearchingFilters, out_model: FilmTypes) -> FilmSearchPage:
+        next_cursor = None
 
         if user is None:
             query = select(Film)
             builder = LocalFilmSearchQueryBuilder(query)
             query = builder.apply_all(filters).build()
             found_films_orm = self._session.exec(query).all()
+            if filters.limit is not None and len(found_films_orm) == filters.limit:
+                next_cursor = builder.next_cursor(found_films_orm[-1])
 
             if out_model == FilmTypes.FILM_PREVIEW:
                 found_films = [
@@ -60,6 +77,12 @@ class PostgresSearchFilmRepository(BaseLocalSearchFilmRepository):
                     for film in found_films_orm
                 ]
 
+            elif out_model == FilmTypes.FILM_PREVIEW_DICT:
+                found_films = [
+                    orm_to_film_preview_dict(film)
+                    for film in found_films_orm
+                ]
+
             else:
                 found_films = []
 
@@ -71,9 +94,16 @@ class PostgresSearchFilmRepository(BaseLocalSearchFilmRepository):
                 .select_from(Film)
                 .outerjoin(UserFilm, (Film.filmid == UserFilm.filmid) & (UserFilm.userid == userid))
             )
-            builder = LocalFilmSearchQueryBuilder(query)
+            # превью строятся только по фильмам пользователя - отбрасываем остальные в SQL, иначе limit
+            # считал бы и их
+            if out_model != FilmTypes.FILM_EXTENDED:
+                query = query.where(UserFilm.filmid.is_not(None))
+            builder = LocalFilmSearchQueryBuilder(query, with_user_films=True)
             query = builder.apply_all(filters).build()
             found_films_orm = self._session.exec(query).all()
+            if filters.limit is not None and len(found_films_orm) == filters.limit:
+                userfilm, film = found_films_orm[-1]
+                next_cursor = builder.next_cursor(film, userfilm)
 
             if out_model == FilmTypes.FILM_PREVIEW:
                 found_films = []
@@ -90,13 +120,17 @@ class PostgresSearchFilmRepository(BaseLocalSearchFilmRepository):
                     else:
                         found_films.append(orm_to_film_extended(film))
 
+            elif out_model == FilmTypes.FILM_PREVIEW_DICT:
+                found_films = [
+                    orm_join_to_film_preview_dict(userfilm, film)
+                    for userfilm, film in found_films_orm
+                    if userfilm is not None
+                ]
+
             else:
                 found_films = []
 
-        if len(found_films) > 0:
-            return found_films
-
-        return None
+        return FilmSearchPage(items=found_films, next_cursor=next_cursor)
 
     @wrap_query
     def get(self, user: User, film_to_get: FilmBase) -> Optional[FilmExtended]:
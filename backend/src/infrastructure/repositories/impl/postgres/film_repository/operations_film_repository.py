@@ -3,9 +3,11 @@ from functools import wraps
 from sqlmodel import Session, select
 from typing import List, Union
 
-from src.shared.mappers.model_to_orm import film_extended_to_film_orm, film_base_to_userfilm_orm
+from src.shared.mappers.model_to_orm import film_extended_to_film_orm, film_base_to_userfilm_orm, \
+    film_orm_to_film_persons_orm
 from src.shared.mappers.orm_to_model import orm_join_to_film_preview
-from src.domain.entities.film import FilmPreview, FilmBase, FilmExtended
+from src.shared.mappers.orm_to_response import orm_join_to_film_preview_dict
+from src.domain.entities.film import FilmPreview, FilmBase, FilmExtended, FilmTypes
 from src.domain.entities.user import User
 from src.infrastructure.repositories.impl.postgres.film_repository.tools.postgres_json_serializer import serialize_for_json
 from src.web.models.film_rating import BaseFilmComplexRating
@@ -55,6 +57,8 @@ class PostgresFilmOperationsRepository(BaseFilmOperationsRepository):
         if not self._is_film_in_db(film_to_cache):
             orm_to_add = film_extended_to_film_orm(film_to_cache, serialize_for_json=serialize_for_json)
             self._session.add(orm_to_add)
+            # индекс персоналий для filter_by_person пишется в той же транзакции, что и фильм
+            self._session.add_all(film_orm_to_film_persons_orm(orm_to_add))
 
     async def cache(self, film_to_cache: Union[FilmExtended, List[FilmExtended]]) -> None:
         if isinstance(film_to_cache, FilmExtended):
@@ -119,7 +123,8 @@ class PostgresFilmOperationsRepository(BaseFilmOperationsRepository):
         self._session.delete(orm_to_remove)
 
     @wrap_query
-    def get_list(self, user: User, is_watched: bool = True) -> List[FilmPreview]:
+    def get_list(self, user: User, is_watched: bool = True,
+                 out_model: FilmTypes = FilmTypes.FILM_PREVIEW) -> Union[List[FilmPreview], List[dict]]:
         userid = user.userid
 
         found_films = self._session.exec(
@@ -127,7 +132,8 @@ class PostgresFilmOperationsRepository(BaseFilmOperationsRepository):
                 UserFilm.is_watched == is_watched)
         ).all()
 
-        target_list = [orm_join_to_film_preview(userfilm, userfilm.film) for userfilm in found_films]
+        mapper = orm_join_to_film_preview_dict if out_model == FilmTypes.FILM_PREVIEW_DICT else orm_join_to_film_preview
+        target_list = [mapper(userfilm, userfilm.film) for userfilm in found_films]
         return target_list
 
     @wrap_query
@@ -1,13 +1,30 @@
 import uuid
 from typing import Optional, List, Dict
 from sqlmodel import SQLModel, Field, Column, Relationship
-from sqlalchemy import PrimaryKeyConstraint, ForeignKeyConstraint
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import PrimaryKeyConstraint, ForeignKeyConstraint, ForeignKey, Computed, Index, DDL, Float, String, \
+    event
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from datetime import datetime
 
 from src.web.models.film_rating import BaseFilmComplexRating, BaseRatingScale
 
 
+# Полнотекстовый индекс по названиям: русская морфология для name, английская для alternative_name и simple для
+# обоих (имена собственные, транслит, смешанные названия). Колонка генерируемая - Postgres сам пересчитывает ее
+# при вставке и обновлении. ё приводится к е: словарь russian их не отождествляет.
+FILM_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('russian', translate(coalesce(name, ''), 'ёЁ', 'еЕ')), 'A') || "
+    "setweight(to_tsvector('simple', translate(coalesce(name, ''), 'ёЁ', 'еЕ')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(alternative_name, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(alternative_name, '')), 'B')"
+)
+
+# Рейтинг КП отдельной колонкой для btree-индекса: фильтр по CAST(ratings -> 'kp') индекс не использует
+FILM_KP_RATING_SQL = (
+    "CASE WHEN jsonb_typeof(ratings -> 'kp') = 'number' THEN (ratings ->> 'kp')::double precision END"
+)
+
+
 class Film(SQLModel, table=True):
     __tablename__ = "films"
 
@@ -23,7 +40,7 @@ class Film(SQLModel, table=True):
     countries: List[str] = Field(default_factory=list, sa_column=Column(JSONB))
     director: Optional[str] = None
     description: str
-    time_minutes: Optional[int] = None
+    time_minutes: Optional[int] = Field(default=None, index=True)
     ratings: Optional[Dict[str, Optional[float]]] = Field(default=None, sa_column=Column(JSONB))
     trailers: Optional[List[str]] = Field(default=None, sa_column=Column(JSONB))
     end_year: Optional[int] = None
@@ -32,7 +49,65 @@ class Film(SQLModel, table=True):
     last_updated: Optional[datetime] = None
     persons: Optional[List[Dict]] = Field(default=None, sa_column=Column(JSONB))
     episodes: Optional[List[Dict]] = Field(default=None, sa_column=Column(JSONB))
-    age_rating: Optional[int] = None
+    age_rating: Optional[int] = Field(default=None, index=True)
+    kp_rating: Optional[float] = Field(
+        default=None,
+        sa_column=Column(Float, Computed(FILM_KP_RATING_SQL, persisted=True))
+    )
+    search_vector: Optional[str] = Field(
+        default=None,
+        sa_column=Column(TSVECTOR, Computed(FILM_SEARCH_VECTOR_SQL, persisted=True))
+    )
+
+    __table_args__ = (
+        Index("ix_films_search_vector", "search_vector", postgresql_using="gin"),
+        # ?& / ?| / ? по жанрам и странам (jsonb_ops: jsonb_path_ops эти операторы не поддерживает)
+        Index("ix_films_genres", "genres", postgresql_using="gin"),
+        Index("ix_films_countries", "countries", postgresql_using="gin"),
+        # триграммы для поиска с опечатками (оператор <%) и ILIKE по подстроке
+        Index("ix_films_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_films_alternative_name_trgm", "alternative_name", postgresql_using="gin",
+              postgresql_ops={"alternative_name": "gin_trgm_ops"}),
+    )
+
+
+class FilmPerson(SQLModel, table=True):
+    """
+    Нормализованная копия Film.persons для поиска по персоналиям: строка на пару фильм - персона/профессия.
+    Заполняется вместе с фильмом в PostgresFilmOperationsRepository.cache.
+    """
+    __tablename__ = "film_persons"
+
+    film_person_id: Optional[int] = Field(default=None, primary_key=True)
+    filmid: str = Field(sa_column=Column(String, ForeignKey("films.filmid", ondelete="CASCADE"), nullable=False,
+                                         index=True))
+    person_id: Optional[int] = Field(default=None, index=True)
+    name: Optional[str] = None
+    # lower, ё -> е, одиночные пробелы (см. normalize_person_name)
+    normalized_name: str
+    profession: Optional[str] = None
+
+    __table_args__ = (
+        # подстрока имени (LIKE '%слово%') ищется по триграммам
+        Index("ix_film_persons_normalized_name_trgm", "normalized_name", postgresql_using="gin",
+              postgresql_ops={"normalized_name": "gin_trgm_ops"}),
+    )
+
+
+# gin_trgm_ops нужно расширение pg_trgm до создания индексов
+for table in (Film.__table__, FilmPerson.__table__):
+    event.listen(table, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+
+# Keyset-пагинация локального поиска (см. LocalFilmSearchQueryBuilder.paginate): порядок (секция, ключ, filmid)
+# читается из индекса без сортировки. Фильтры по диапазону года и рейтинга (key IS NOT NULL AND key > ...)
+# Postgres сопоставляет с первыми двумя колонками
+Index("ix_films_kp_rating_nulls_last_keyset", Film.__table__.c.kp_rating.is_not(None).self_group().desc(),
+      Film.__table__.c.kp_rating.desc(), Film.__table__.c.filmid.desc())
+Index("ix_films_release_year_nulls_last_keyset", Film.__table__.c.release_year.is_not(None).self_group().desc(),
+      Film.__table__.c.release_year.desc(), Film.__table__.c.filmid.desc())
+Index("ix_films_name_nulls_last_keyset", Film.__table__.c.name.is_(None), Film.__table__.c.name,
+      Film.__table__.c.filmid)
 
 
 class UserFilm(SQLModel, table=True):
@@ -67,3 +142,8 @@ class UserFilm(SQLModel, table=True):
             ["films.filmid"],
         )
     )
+
+
+Index("ix_user_films_added_at_nulls_last_keyset", UserFilm.__table__.c.userid,
+      UserFilm.__table__.c.added_at.is_not(None).self_group().desc(), UserFilm.__table__.c.added_at.desc(),
+      UserFilm.__table__.c.filmid.desc())
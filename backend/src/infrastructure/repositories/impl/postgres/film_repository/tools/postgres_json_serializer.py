@@ -1,17 +1,18 @@
-from datetime import datetime
-from pydantic import HttpUrl
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+from src.domain.entities.lazy_list import LazyModelList
 
 
 def serialize_for_json(obj):
-    """Рекурсивная сериализация вложенных объектов."""
-    if isinstance(obj, HttpUrl):
-        return str(obj)
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    elif isinstance(obj, list):
-        return [serialize_for_json(i) for i in obj]
-    elif isinstance(obj, dict):
-        return {k: serialize_for_json(v) for k, v in obj.items()}
-    elif hasattr(obj, 'dict'):
-        return serialize_for_json(obj.dict())
-    return obj
+    """
+    JSON-совместимое значение для JSONB-колонок (persons, episodes, user_rating) за один проход.
+    Модели сериализуются собственным скомпилированным сериализатором pydantic в режиме JSON,
+    списки и dict с вложенными моделями, datetime и HttpUrl - через pydantic-core.
+    """
+    if isinstance(obj, LazyModelList):
+        # непрочитанный список уходит в JSONB в исходном виде, без валидации
+        obj = obj.raw
+    if isinstance(obj, BaseModel):
+        return obj.__pydantic_serializer__.to_python(obj, mode='json')
+    return to_jsonable_python(obj)
@@ -0,0 +1,69 @@
+from sqlalchemy import text
+from sqlalchemy.schema import CreateIndex
+from sqlmodel import Session
+
+from src.infrastructure.repositories.impl.postgres.film_repository.orm import FILM_KP_RATING_SQL, \
+    FILM_SEARCH_VECTOR_SQL, Film, FilmPerson, UserFilm
+from src.infrastructure.repositories.impl.postgres.social_repository.orm import UserItemORM
+
+# генерируемые колонки films, появившиеся после первой версии схемы
+GENERATED_COLUMNS = (
+    ("search_vector", "tsvector", FILM_SEARCH_VECTOR_SQL),
+    ("kp_rating", "double precision", FILM_KP_RATING_SQL),
+)
+INDEXED_TABLES = (Film.__table__, FilmPerson.__table__, UserFilm.__table__, UserItemORM.__table__)
+# keyset-индексы без признака секции NULL: заменены на *_nulls_last_keyset, по ним запросы больше не сортируются
+SUPERSEDED_INDEXES = (
+    "ix_films_kp_rating_keyset", "ix_films_release_year_keyset", "ix_films_name_keyset", "ix_user_films_added_at_keyset"
+)
+
+# film_persons для фильмов, закэшированных до появления таблицы (нормализация - как в normalize_person_name)
+FILM_PERSONS_BACKFILL_SQL = r"""
+INSERT INTO film_persons (filmid, person_id, name, normalized_name, profession)
+SELECT DISTINCT f.filmid, (p ->> 'id')::int, p ->> 'name',
+       btrim(regexp_replace(lower(translate(p ->> 'name', 'ёЁ', 'ее')), '\s+', ' ', 'g')), p ->> 'en_profession'
+FROM films f
+CROSS JOIN LATERAL jsonb_array_elements(
+    CASE WHEN jsonb_typeof(f.persons) = 'array' THEN f.persons ELSE '[]'::jsonb END
+) AS p
+WHERE coalesce(p ->> 'name', '') <> ''
+  AND NOT EXISTS (SELECT 1 FROM film_persons fp WHERE fp.filmid = f.filmid)
+"""
+
+
+def create_search_schema(session: Session) -> None:
+    """
+    Догоняет схему поиска в уже существующей БД: create_all создает колонки и индексы только вместе с новой
+    таблицей. Индексы берутся из ORM-моделей. Все операции идемпотентны.
+
+    Ошибки не глотаются: Film отображает search_vector и kp_rating, и без них любой запрос к фильмам упадет,
+    поэтому приложение не должно стартовать с недостроенной схемой. film_persons заполняется отдельной
+    транзакцией - ее сбой не откатывает уже созданные колонки и индексы.
+    """
+    try:
+        session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for column, column_type, expression in GENERATED_COLUMNS:
+            session.execute(text(
+                f"ALTER TABLE films ADD COLUMN IF NOT EXISTS {column} {column_type} "
+                f"GENERATED ALWAYS AS ({expression}) STORED"
+            ))
+        for table in INDEXED_TABLES:
+            for index in table.indexes:
+                session.execute(CreateIndex(index, if_not_exists=True))
+        for index_name in SUPERSEDED_INDEXES:
+            session.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    backfill_film_persons(session)
+
+
+def backfill_film_persons(session: Session) -> None:
+    try:
+        session.execute(text(FILM_PERSONS_BACKFILL_SQL))
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
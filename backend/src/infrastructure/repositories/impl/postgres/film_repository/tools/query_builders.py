@@ -1,24 +1,114 @@
+import re
 from datetime import datetime
 from typing import List, Optional
 
 from src.domain.entities.film import FilmPreview
-from src.infrastructure.repositories.impl.postgres.film_repository.orm import Film, UserFilm
+from src.infrastructure.repositories.impl.postgres.film_repository.orm import Film, FilmPerson, UserFilm
+from src.shared.mappers.model_to_orm import normalize_person_name
 from src.web.models.film_rating import BaseFilmComplexRating, BaseRatingScale
-from src.web.models.search_filters import BaseBounds, BaseSearchingFilters
-from sqlalchemy import and_, func, cast, Float, or_, Integer
+from src.web.models.search_filters import BaseBounds, BaseSearchingFilters, DEFAULT_SORT_KEY, FilmSortKey, \
+    decode_search_cursor, encode_search_cursor
+from sqlalchemy import and_, func, or_, Integer, literal, select, tuple_
 from sqlalchemy.dialects.postgresql import array
 from urllib.parse import quote
 
 
+# конфигурации, которыми построен Film.search_vector (см. FILM_SEARCH_VECTOR_SQL)
+SEARCH_CONFIGS = ('russian', 'english', 'simple')
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def name_search_query(value: str):
+    """
+    tsquery для поиска по названию: каждое слово - префикс (побег:*) хотя бы в одной из конфигураций,
+    все слова обязательны. Возвращает None, если в строке нет ни одного слова.
+    """
+    words = _NON_WORD.sub(' ', value.lower().replace('ё', 'е')).split()
+    if not words:
+        return None
+
+    query = None
+    for word in words:
+        word_query = None
+        for config in SEARCH_CONFIGS:
+            config_query = func.to_tsquery(config, f'{word}:*')
+            word_query = config_query if word_query is None else word_query.op('||')(config_query)
+        query = word_query if query is None else query.op('&&')(word_query)
+    return query
+
+
+# колонка ключа сортировки и направление (True - по убыванию). Вторым ключом всегда идет filmid того же направления,
+# поэтому порядок однозначен, а условие "после курсора" - одно сравнение кортежей по составному индексу.
+# Фильмы без значения ключа идут в конце (NULLS LAST): перед ключом в порядке и в индексе стоит признак секции -
+# key IS NOT NULL по убыванию или key IS NULL по возрастанию, так что направление у всех трех колонок общее
+SORT_COLUMNS = {
+    FilmSortKey.KP_RATING.value: (Film.kp_rating, True),
+    FilmSortKey.YEAR.value: (Film.release_year, True),
+    FilmSortKey.NAME.value: (Film.name, False),
+    FilmSortKey.ADDED_AT.value: (UserFilm.added_at, True),
+    DEFAULT_SORT_KEY: (Film.filmid, False),
+}
+
+
 class LocalFilmSearchQueryBuilder:
-    def __init__(self, base_query):
+    def __init__(self, base_query, with_user_films: bool = False):
         self.query = base_query
+        # в запросе есть UserFilm (поиск по фильмам пользователя) - можно сортировать по added_at
+        self.with_user_films = with_user_films
+        self.sort_key: Optional[str] = None
 
     def apply_all(self, filters: BaseSearchingFilters):
         for field, value in filters.get_non_null_fields().items():
             self.apply_filter(field, value)
+        if filters.is_paginated:
+            self.query = self.paginate(filters)
         return self
 
+    def paginate(self, filters: BaseSearchingFilters):
+        # keyset-пагинация: страница начинается строго после курсора, поэтому время ответа не растет с номером
+        # страницы (в отличие от OFFSET). Заменяет порядок по релевантности из filter_by_name
+        self.sort_key = filters.sort_by.value if filters.sort_by else DEFAULT_SORT_KEY
+        if self.sort_key == FilmSortKey.ADDED_AT and not self.with_user_films:
+            raise ValueError("Сортировка по дате добавления доступна только для фильмов пользователя")
+
+        column, descending = SORT_COLUMNS[self.sort_key]
+        tiebreak = UserFilm.filmid if self.sort_key == FilmSortKey.ADDED_AT else Film.filmid
+        query = self.query.order_by(None)
+        if self.sort_key == DEFAULT_SORT_KEY:
+            keys = [column]
+        else:
+            section = column.is_not(None) if descending else column.is_(None)
+            keys = [section, column, tiebreak]
+
+        if filters.cursor is not None:
+            _, value, filmid = decode_search_cursor(filters.cursor)
+            if self.sort_key == DEFAULT_SORT_KEY:
+                query = query.where(column < value if descending else column > value)
+            elif value is None:
+                # курсор в секции без значения ключа: дальше порядок только по filmid. IS true/false оставляет
+                # индексу условие на признак секции (= false Postgres сворачивает в key IS NULL)
+                query = query.where(section.is_(not descending), column.is_(None),
+                                    tiebreak < filmid if descending else tiebreak > filmid)
+            else:
+                position, after = tuple_(*keys), tuple_(descending, value, filmid)
+                query = query.where(position < after if descending else position > after)
+
+        query = query.order_by(*[key.desc() if descending else key.asc() for key in keys])
+        if filters.limit is not None:
+            query = query.limit(filters.limit)
+        return query
+
+    def next_cursor(self, film: Film, userfilm: Optional[UserFilm] = None) -> str:
+        """Курсор страницы, следующей за строкой film (последней в текущей)."""
+        values = {
+            FilmSortKey.KP_RATING.value: film.kp_rating,
+            FilmSortKey.YEAR.value: film.release_year,
+            FilmSortKey.NAME.value: film.name,
+            FilmSortKey.ADDED_AT.value: userfilm.added_at if userfilm is not None else None,
+            DEFAULT_SORT_KEY: film.filmid,
+        }
+        return encode_search_cursor(self.sort_key, values[self.sort_key], film.filmid)
+
     def apply_filter(self, field: str, value: any):
         method_name = f"filter_by_{field}"
         method = getattr(self, method_name, None)
@@ -36,31 +126,34 @@ class LocalFilmSearchQueryBuilder:
         return self.query.where(or_(*conditions))
 
     def filter_by_name(self, value: str):
-        words = value.strip().lower().split()
-        conditions = [
+        # полнотекстовый поиск по Film.search_vector плюс триграммы (<%, порог pg_trgm.word_similarity_threshold)
+        # для названий с опечатками - оба условия идут по GIN-индексам. Сначала самые релевантные
+        query = name_search_query(value)
+        if query is None:
+            return self.query.where(Film.name.is_not(None))
+
+        value = literal(value.strip())
+        similarity = func.greatest(func.word_similarity(value, Film.name),
+                                   func.word_similarity(value, Film.alternative_name))
+        return self.query.where(
             or_(
-                func.lower(Film.name).ilike(f"%{word}%"),
-                func.lower(Film.alternative_name).ilike(f"%{word}%")
-            )
-            for word in words
-        ]
-        conditions.append(Film.name.is_not(None))
-        return self.query.where(and_(*conditions))
+                Film.search_vector.op('@@')(query),
+                value.op('<%')(Film.name),
+                value.op('<%')(Film.alternative_name)
+            ),
+            Film.name.is_not(None)
+        ).order_by(func.ts_rank_cd(Film.search_vector, query).desc(), similarity.desc())
 
     def filter_by_person(self, value: str):
-        words = value.strip().lower().split()
+        # полуобъединение с film_persons: все слова должны входить в имя одной персоны (триграммный GIN-индекс)
+        words = normalize_person_name(value).split()
         if not words:
             return self.query.filter(False)
 
-        json_path_conditions = [
-            f'@.name like_regex ".*{word}.*" flag "i"' for word in words
-        ]
-        full_condition = " && ".join(json_path_conditions)
-        json_path = f'$[*]?({full_condition})'
-        print(f"Generated JSONPath: {json_path}")  # Для отладки
-        return self.query.where(
-            func.jsonb_path_exists(Film.persons, json_path)
+        persons = select(FilmPerson.filmid).where(
+            *[FilmPerson.normalized_name.contains(word, autoescape=True) for word in words]
         )
+        return self.query.where(Film.filmid.in_(persons))
 
     def filter_by_is_series(self, value: bool):
         if value:
@@ -70,10 +163,10 @@ class LocalFilmSearchQueryBuilder:
 
     def filter_by_kp_rating(self, value: BaseBounds):
         value = BaseBounds.model_validate(value)
-        kp_exists = Film.ratings.has_key('kp')
-        kp_rating = cast(Film.ratings['kp'], Float)
+        # генерируемая колонка с btree-индексом вместо CAST(ratings -> 'kp') по каждой строке
+        kp_rating = Film.kp_rating
 
-        conditions = []
+        conditions = [kp_rating.is_not(None)]
 
         if value.lower is not None and value.upper is not None:
             if value.lower == value.upper:
@@ -86,7 +179,7 @@ class LocalFilmSearchQueryBuilder:
         elif value.upper is not None:
             conditions.append(kp_rating < value.upper)
 
-        return self.query.where(and_(kp_exists, *conditions))
+        return self.query.where(and_(*conditions))
 
     def filter_by_year(self, value: BaseBounds):
         value = BaseBounds.model_validate(value)
@@ -0,0 +1,116 @@
+import json
+import math
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import List, Optional
+
+from src.shared.tools.api_clients.core.base_external_api_client import BaseExternalAPIClient
+from src.shared.tools.caches.core.base_response_cache import BaseResponseCache
+from src.shared.tools.caches.impl.lru_response_cache import LRUResponseCache
+from src.web.models.search_filters import BaseApiSearchingFilters
+
+# ограничения, которые /movie умеет применять сам (см. APIFilmSearchQueryBuilder)
+PUSHABLE_FIELDS = ('is_series', 'year', 'kp_rating', 'length', 'age_rating', 'genres', 'countries')
+# списки отдаем в /movie только из одного значения: у KP несколько значений означают "все сразу",
+# а LocalFilmListFilter ищет пересечение ("хотя бы одно")
+LIST_FIELDS = ('genres', 'countries')
+# сами по себе не сужают выдачу KP до бюджета страниц: с ними одними пробный запрос заведомо вернет слишком много
+NON_SELECTIVE_FIELDS = ('is_series',)
+# максимальный limit страницы у /movie
+KP_MAX_PAGE_SIZE = 250
+
+
+class SearchEndpoint(str, Enum):
+    NAME = "name"
+    FILTERS = "filters"
+
+
+@dataclass
+class ExternalSearchPlan:
+    endpoint: SearchEndpoint
+    query: BaseApiSearchingFilters
+    max_pages: Optional[int] = None
+    pushed: List[str] = field(default_factory=list)
+    # сколько фильмов KP отдаст по отправленным ограничениям (известно только для FILTERS)
+    total: Optional[int] = None
+
+
+class ExternalSearchPlanner:
+    """
+    Выбирает, как искать по названию с дополнительными фильтрами.
+
+    /movie/search ищет только по названию, остальные фильтры применяются локально и часто отбрасывают
+    почти всю страницу. /movie, наоборот, фильтрует сам, но не ищет по названию. Поэтому планировщик
+    спрашивает у /movie, сколько фильмов подходит под отправляемые ограничения: если все они помещаются
+    в бюджет страниц, выгоднее скачать их и отфильтровать по названию локально. Иначе - обычный поиск
+    по названию с локальной фильтрацией. Локальный фильтр в обоих случаях применяется ко всем полям:
+    у KP границы включительные, у LocalFilmListFilter - строгие.
+
+    Пробный запрос - лишний round trip и единица квоты, поэтому total кэшируется по набору отправляемых
+    ограничений, а для заведомо широких ограничений (NON_SELECTIVE_FIELDS) проба не делается вовсе.
+    """
+
+    def __init__(
+            self,
+            api_client: BaseExternalAPIClient,
+            max_pages: int = 3,
+            max_page_size: int = KP_MAX_PAGE_SIZE,
+            totals_cache: Optional[BaseResponseCache] = None,
+            totals_ttl: float = 3600
+    ):
+        self._api_client = api_client
+        self.max_pages = max_pages
+        self.max_page_size = max_page_size
+        # total по набору отправляемых ограничений меняется редко, а пробный запрос стоит квоты и round trip
+        self._totals = totals_cache or LRUResponseCache()
+        self.totals_ttl = totals_ttl
+        self.probes = 0
+
+    @staticmethod
+    def pushable_fields(filters: BaseApiSearchingFilters) -> dict:
+        pushable = {}
+        for name in PUSHABLE_FIELDS:
+            value = getattr(filters, name)
+            if value is None or (name in LIST_FIELDS and len(value) != 1):
+                continue
+            pushable[name] = value
+        return pushable
+
+    def _name_plan(self, filters: BaseApiSearchingFilters) -> ExternalSearchPlan:
+        return ExternalSearchPlan(endpoint=SearchEndpoint.NAME, query=filters, max_pages=self.max_pages)
+
+    @staticmethod
+    def totals_key(pushable: dict) -> str:
+        return json.dumps(BaseApiSearchingFilters(**pushable).model_dump(mode='json', include=set(pushable)),
+                          sort_keys=True, ensure_ascii=False)
+
+    async def count(self, query: BaseApiSearchingFilters, pushable: dict) -> Optional[int]:
+        key = self.totals_key(pushable)
+        entry = await self._totals.get(key)
+        if entry is not None:
+            return entry.value
+
+        self.probes += 1
+        total = await self._api_client.count_by_filters(query)
+        if total is not None:
+            await self._totals.set(key, total, self.totals_ttl)
+        return total
+
+    async def plan(self, filters: BaseApiSearchingFilters) -> ExternalSearchPlan:
+        pushable = self.pushable_fields(filters)
+        if not filters.name or set(pushable) <= set(NON_SELECTIVE_FIELDS):
+            return self._name_plan(filters)
+
+        query = BaseApiSearchingFilters(**pushable, sort_fields=filters.sort_fields, sort_type=filters.sort_type)
+        total = await self.count(query, pushable)
+        if total is None or total > self.max_page_size * self.max_pages:
+            return self._name_plan(filters)
+
+        page_size = max(min(total, self.max_page_size), 1)
+        return ExternalSearchPlan(
+            endpoint=SearchEndpoint.FILTERS,
+            query=query.model_copy(update={'page': 1, 'limit': page_size}),
+            max_pages=max(math.ceil(total / page_size), 1),
+            pushed=list(pushable),
+            total=total
+        )
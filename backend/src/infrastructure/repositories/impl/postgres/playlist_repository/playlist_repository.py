@@ -6,13 +6,14 @@ from sqlmodel import Session, select
 
 from src.infrastructure.repositories.core.base_film_repositories import BaseLocalSearchFilmRepository
 from src.infrastructure.repositories.core.base_playlist_repository import BasePlaylistRepository
-from src.domain.entities.film import FilmBase
+from src.domain.entities.film import FilmBase, FilmTypes
 from src.domain.entities.playlist import Playlist, PlaylistItemPreview, PlaylistItem
 from src.domain.entities.user import User
 from src.web.models.playlists import PlaylistSearchFilters, CreatePlaylistModel
 from src.shared.mappers.model_to_orm import user_and_create_model_to_playlist_orm, \
     filters_film_user_to_playlist_item_orm
 from src.shared.mappers.orm_to_model import orm_to_playlist, orm_to_playlist_item, orm_to_playlist_item_preview
+from src.shared.mappers.orm_to_response import orm_to_playlist_item_preview_dict
 from src.infrastructure.repositories.impl.postgres.playlist_repository.orm import PlaylistORM
 from src.infrastructure.repositories.impl.postgres.playlist_repository.tools.query_builders import PlaylistQueryBuilder
 
@@ -130,13 +131,16 @@ class PostgresPlaylistRepository(BasePlaylistRepository):
         playlist_orm.update_playlist_orm_from_model(custom_attributes)
 
     @wrap_query
-    def get_playlist_content(self, filters: PlaylistSearchFilters) -> Optional[List[PlaylistItemPreview]]:
+    def get_playlist_content(self, filters: PlaylistSearchFilters, out_model: FilmTypes = FilmTypes.FILM_PREVIEW) -> \
+            Optional[Union[List[PlaylistItemPreview], List[dict]]]:
         query = select(PlaylistORM)
         builder = PlaylistQueryBuilder(query)
         query = builder.apply_all(filters).build()
 
         playlist_orm: PlaylistORM = self._session.exec(query).first()
-        playlist_items = [orm_to_playlist_item_preview(playlist_item_orm) for playlist_item_orm in playlist_orm.items]
+        mapper = orm_to_playlist_item_preview_dict if out_model == FilmTypes.FILM_PREVIEW_DICT \
+            else orm_to_playlist_item_preview
+        playlist_items = [mapper(playlist_item_orm) for playlist_item_orm in playlist_orm.items]
 
         if len(playlist_items) == 0:
             return None
@@ -1,5 +1,5 @@
 from typing import Optional, List, Dict, Any
-from sqlalchemy import CheckConstraint, Column, JSON, ForeignKey
+from sqlalchemy import CheckConstraint, Column, JSON, ForeignKey, Index, DDL, event
 from sqlmodel import SQLModel, Field, Relationship
 from datetime import datetime, date
 from sqlalchemy.dialects.postgresql import UUID
@@ -33,6 +33,8 @@ class UserItemORM(SQLModel, table=True):
         CheckConstraint("subscribes_count >= 0", name="chk_subscribes_count_nonnegative"),
         CheckConstraint("role IN ('ADMIN', 'USER')", name="chk_role_enum"),
         CheckConstraint("status IN ('PRIVATE', 'PUBLIC')", name="chk_status_enum"),
+        Index("ix_user_item_username_trgm", "username", postgresql_using="gin",
+              postgresql_ops={"username": "gin_trgm_ops"}),
     )
 
     def update_user_item_orm_from_model(self, user_item_custom_data: dict):
@@ -40,6 +42,10 @@ class UserItemORM(SQLModel, table=True):
             setattr(self, key, value)
 
 
+# gin_trgm_ops нужно расширение pg_trgm до создания индексов
+event.listen(UserItemORM.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+
 class UserORM(SQLModel, table=True):
     __tablename__ = "user"
 
@@ -1,4 +1,4 @@
-from sqlalchemy import select
+from sqlalchemy import select, func, or_, literal
 from sqlalchemy.orm import selectinload
 from src.infrastructure.repositories.impl.postgres.social_repository.orm import UserORM, UserItemORM
 from src.web.models.users import UserSearchingFilters
@@ -28,12 +28,18 @@ class LocalUserSearchQueryBuilder:
         return self.query.where(UserORM.id == value)
 
     def filter_by_username(self, value: str):
-        # Подзапрос для поиска item_id по username
-        subquery = (
-            select(UserItemORM.item_id)
-            .where(UserItemORM.username.ilike(f"%{value}%"))
+        # Подстрока или похожее имя (%, порог pg_trgm.similarity_threshold) - оба условия идут по триграммному
+        # GIN-индексу user_item.username. Сначала самые похожие
+        value = value.strip()
+        return (
+            self.query
+            .join(UserItemORM, UserORM.item_id == UserItemORM.item_id)
+            .where(or_(
+                UserItemORM.username.icontains(value, autoescape=True),
+                UserItemORM.username.op('%')(literal(value))
+            ))
+            .order_by(func.similarity(UserItemORM.username, value).desc())
         )
-        return self.query.where(UserORM.item_id.in_(subquery))
 
     def filter_by_root(self, value: bool):
         if not value:
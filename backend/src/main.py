@@ -7,6 +7,7 @@ from src.web.fastapi.auth_router import auth_router
 from src.web.fastapi.films_router import films_router
 from src.web.fastapi.playlists_router import playlists_router
 from src.web.fastapi.users_router import users_router
+from src.web.fastapi.metrics_router import metrics_router
 from src.dependencies import lifespan
 
 app_settings = AppSettings().from_yaml()
@@ -31,6 +32,10 @@ app = FastAPI(
         {
             "name": "users",
             "description": "Реализует операции кастомизации профиля, подписок. Требует access_token в куки."
+        },
+        {
+            "name": "metrics",
+            "description": "Служебные метрики: квоты и кэш внешнего API. Доступно только администраторам."
         }
     ],
 )
@@ -41,12 +46,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # курсор следующей страницы локального поиска
 )
 
 app.include_router(films_router)
 app.include_router(playlists_router)
 app.include_router(users_router)
 app.include_router(auth_router)
+app.include_router(metrics_router)
 
 
 @app.get("/")
@@ -28,6 +28,13 @@ class NotFoundExternalException(FilmServiceException):
         super().__init__(f"Cannot find any film in external search by filters: {filters}")
 
 
+class ExternalApiUnavailableException(FilmServiceException):
+    code = "EXTERNAL_API_UNAVAILABLE"
+
+    def __init__(self, filters: BaseApiSearchingFilters):
+        super().__init__(f"External API is temporarily unavailable, request by filters: {filters}")
+
+
 class EmptyListException(FilmServiceException):
     code = "EMPTY_LIST"
 
@@ -4,10 +4,10 @@ from typing import List, Optional, Union
 from src.domain.entities.film import FilmPreview, FilmExtended, FilmPersonal, FilmTypes
 from src.domain.policies.impl.kp_series_to_film import BaseSeriesToFilmPolicy
 from src.infrastructure.repositories.core.base_film_repositories import BaseFilmOperationsRepository, BaseLocalSearchFilmRepository, \
-    BaseExternalSearchFilmRepository
+    BaseExternalSearchFilmRepository, FilmSearchPage
 from src.services.film.exceptions import *
 from src.web.models.film_rating import BaseFilmComplexRating
-from src.web.models.search_filters import BaseSearchingFilters, BaseApiSearchingFilters
+from src.web.models.search_filters import BaseSearchingFilters, BaseApiSearchingFilters, LOCAL_SEARCH_MAX_LIMIT
 
 
 def list_response_resolver(response: List):
@@ -44,13 +44,17 @@ class FilmService:
 
     def local_search_by_filters(self, user: Optional[User], filters: BaseSearchingFilters,
                                 out_model: FilmTypes = FilmTypes.FILM_PREVIEW) -> Union[List[
-        FilmPreview], List[FilmExtended]]:
+        FilmPreview], List[FilmExtended], List[dict]]:
         previews = self.__local_search_repository.search_by_filters(user, filters, out_model)
         if not previews:
             return []
 
         return previews
 
+    def local_search_page(self, user: Optional[User], filters: BaseSearchingFilters,
+                          out_model: FilmTypes = FilmTypes.FILM_PREVIEW) -> FilmSearchPage:
+        return self.__local_search_repository.search_page(user, filters, out_model)
+
     def __set_already_added_flag_to_search_results(self, user: User, previews: List[FilmPreview]) -> List[
         FilmPreview]:
         filmids = [film.filmid for film in previews]
@@ -64,16 +68,30 @@ class FilmService:
 
         return previews
 
+    def __degraded_search_by_filters(self, filters: BaseApiSearchingFilters) -> List[FilmPreview]:
+        # внешний API недоступен - отвечаем тем, что уже есть в локальном каталоге. Не больше страницы запроса:
+        # без limit широкий фильтр поднял бы из БД весь подходящий каталог
+        limit = min(filters.limit or LOCAL_SEARCH_MAX_LIMIT, LOCAL_SEARCH_MAX_LIMIT)
+        local_filters = BaseSearchingFilters(**filters.get_non_null_fileds_exclude_extension(), limit=limit)
+        previews = self.local_search_by_filters(None, local_filters)
+        for film in previews:
+            film.degraded = True
+
+        return previews
+
     async def external_search_by_filters(self, filters: BaseApiSearchingFilters, user: Optional[User] = None) -> List[
         FilmPreview]:
 
         if not filters.get_non_null_fileds_exclude_extension():
             return []
 
-        if filters.name:
-            previews = self.__external_search_repository.search_by_name(filters)
-        else:
-            previews = self.__external_search_repository.search_by_filters(filters)
+        try:
+            if filters.name:
+                previews = await self.__external_search_repository.search_by_name(filters)
+            else:
+                previews = await self.__external_search_repository.search_by_filters(filters)
+        except ExternalApiUnavailableException:
+            previews = self.__degraded_search_by_filters(filters)
 
         if not previews:
             return []
@@ -117,7 +135,7 @@ class FilmService:
             return extended_result
 
         if film_to_get.is_series:
-            seasons = self.__external_search_repository.get_seasons(
+            seasons = await self.__external_search_repository.get_seasons(
                 BaseApiSearchingFilters(
                     filmid=film_to_get.filmid,
                     is_series=True
@@ -133,7 +151,7 @@ class FilmService:
 
             raise NotFoundExternalException(film_to_get)
 
-        extended_film = self.__external_search_repository.get(film_to_get)
+        extended_film = await self.__external_search_repository.get(film_to_get)
         asyncio.create_task(self.__operations_repository.cache(extended_film))
         if not extended_film:
             raise NotFoundExternalException(film_to_get)
@@ -149,8 +167,9 @@ class FilmService:
     def remove(self, user: User, film_to_remove: FilmBase) -> None:
         self.__operations_repository.remove(user, film_to_remove)
 
-    def get_list(self, user: User, is_watched: bool) -> List[FilmPreview]:
-        target_list = self.__operations_repository.get_list(user, is_watched)
+    def get_list(self, user: User, is_watched: bool,
+                 out_model: FilmTypes = FilmTypes.FILM_PREVIEW) -> Union[List[FilmPreview], List[dict]]:
+        target_list = self.__operations_repository.get_list(user, is_watched, out_model)
         if len(target_list) <= 0:
             raise EmptyListException(is_watched, user)
 
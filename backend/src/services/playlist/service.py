@@ -2,7 +2,7 @@ from functools import wraps
 from typing import List, Callable, Union, Optional
 
 from src.infrastructure.repositories.core.base_playlist_repository import BasePlaylistRepository
-from src.domain.entities.film import FilmBase
+from src.domain.entities.film import FilmBase, FilmTypes
 from src.domain.entities.playlist import Playlist, PlaylistItemPreview
 from src.domain.entities.user import User
 from src.web.models.playlists import CreatePlaylistModel, AccessModel, PlaylistSearchFilters, FiltersFields, \
@@ -196,8 +196,9 @@ class PlaylistService:
         raise UserDoesntHavePermissionException(access_model, filters, "remove collaborator from")
 
     @require_all_filters(FiltersFields.PLAYLISTID)
-    def get_playlist_content(self, access_model: AccessModel, filters: PlaylistSearchFilters) -> List[
-        PlaylistItemPreview]:
+    def get_playlist_content(self, access_model: AccessModel, filters: PlaylistSearchFilters,
+                             out_model: FilmTypes = FilmTypes.FILM_PREVIEW) -> Union[List[PlaylistItemPreview],
+                                                                                      List[dict]]:
 
         playlist = self._repository.get_playlist_by_id(filters.playlistid)
 
@@ -207,7 +208,7 @@ class PlaylistService:
 
         if access_model.is_owner(playlist) or access_model.is_collaborator(playlist) or playlist.is_public:
             fixed_filters = filters.left_only_playlistid()
-            content = self._repository.get_playlist_content(fixed_filters)
+            content = self._repository.get_playlist_content(fixed_filters, out_model)
 
             if content is None:
                 raise EmptyPlaylistException(filters)
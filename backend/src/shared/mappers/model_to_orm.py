@@ -1,10 +1,11 @@
 from datetime import datetime
 import uuid
+from typing import List, Optional
 from src.domain.entities.film import FilmExtended, FilmBase
 from src.domain.entities.playlist import Playlist, PlaylistItem
 from src.domain.entities.user import User
 from src.web.models.playlists import CreatePlaylistModel, PlaylistSearchFilters
-from src.infrastructure.repositories.impl.postgres.film_repository.orm import Film, UserFilm
+from src.infrastructure.repositories.impl.postgres.film_repository.orm import Film, FilmPerson, UserFilm
 from src.infrastructure.repositories.impl.postgres.playlist_repository.orm import PlaylistORM, PlaylistItemORM
 
 
@@ -19,6 +20,29 @@ def film_extended_to_film_orm(film: FilmExtended, serialize_for_json) -> Film:
     )
 
 
+def normalize_person_name(name: Optional[str]) -> str:
+    # то же приведение, что и FILM_PERSONS_BACKFILL_SQL: регистр, ё -> е, пробелы
+    return " ".join((name or "").lower().replace("ё", "е").split())
+
+
+def film_orm_to_film_persons_orm(film: Film) -> List[FilmPerson]:
+    # строится из уже сериализованного Film.persons, поэтому годится и для FilmExtended, и для Film
+    seen, result = set(), []
+    for person in film.persons or []:
+        key = (person.get("id"), person.get("name"), person.get("en_profession"))
+        if not person.get("name") or key in seen:
+            continue
+        seen.add(key)
+        result.append(FilmPerson(
+            filmid=film.filmid,
+            person_id=person.get("id"),
+            name=person.get("name"),
+            normalized_name=normalize_person_name(person.get("name")),
+            profession=person.get("en_profession")
+        ))
+    return result
+
+
 def film_base_to_userfilm_orm(film: FilmBase, user: User, serialize_for_json) -> UserFilm:
     return UserFilm(
         filmid=film.filmid,
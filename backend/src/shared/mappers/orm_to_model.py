@@ -1,4 +1,4 @@
-from src.domain.entities.film import FilmPreview, FilmExtended, Episode
+from src.domain.entities.film import FilmPreview, FilmExtended
 from src.domain.entities.playlist import Playlist, PlaylistItem, PlaylistItemPreview
 from src.domain.entities.user import UserPublic, User, UserPreview, RoleEnum, StatusEnum, UserHistoryModel, UserInDb
 from src.infrastructure.repositories.impl.postgres.film_repository.orm import Film, UserFilm
@@ -73,7 +73,7 @@ def orm_to_film_extended(film: Film) -> FilmExtended:
         end_year=film.end_year,
         status=film.status,
         tops=film.tops,
-        episodes=[Episode(**episode) for episode in film.episodes] if film.episodes else []
+        episodes=film.episodes or []
     )
 
 
@@ -133,7 +133,7 @@ def orm_join_to_film_extended(userfilm: UserFilm, film: Film) -> FilmExtended:
         end_year=film.end_year,
         status=film.status,
         tops=film.tops,
-        episodes=[Episode(**episode) for episode in film.episodes] if film.episodes else [],
+        episodes=film.episodes or [],
 
         # userfilm data:
         is_watched=userfilm.is_watched,
@@ -0,0 +1,50 @@
+from src.domain.entities.film import FilmPreview
+from src.infrastructure.repositories.impl.postgres.film_repository.orm import Film, UserFilm
+from src.infrastructure.repositories.impl.postgres.playlist_repository.orm import PlaylistItemORM
+
+# Быстрый путь для больших списков: строки БД сразу превращаются в dict с полями FilmPreview (в том же порядке
+# и с теми же значениями по умолчанию), минуя сборку и повторную валидацию моделей. Такие dict отдаются
+# через FastJSONResponse. Данные в БД уже прошли валидацию при сохранении.
+FILM_PREVIEW_DEFAULTS = {name: field.get_default() for name, field in FilmPreview.model_fields.items()}
+
+
+def orm_to_film_preview_dict(film: Film) -> dict:
+    preview = FILM_PREVIEW_DEFAULTS.copy()
+    preview.update(
+        filmid=film.filmid,
+        name=film.name,
+        poster_link=film.poster_link,
+        release_year=film.release_year,
+        is_series=film.is_series,
+        alternative_name=film.alternative_name,
+        genres=film.genres,
+        countries=film.countries,
+        director=film.director,
+        time_minutes=film.time_minutes,
+        age_rating=film.age_rating,
+        last_updated=film.last_updated,
+        season=film.season
+    )
+    return preview
+
+
+def orm_join_to_film_preview_dict(userfilm: UserFilm, film: Film) -> dict:
+    preview = orm_to_film_preview_dict(film)
+    preview.update(
+        already_added=True,
+        is_watched=userfilm.is_watched,
+        user_rating=userfilm.user_rating,
+        added_at=userfilm.added_at
+    )
+    return preview
+
+
+def orm_to_playlist_item_preview_dict(orm: PlaylistItemORM) -> dict:
+    return dict(
+        item=dict(
+            playlistid=str(orm.playlistid),
+            filmid=orm.filmid,
+            creatorid=str(orm.creatorid)
+        ),
+        preview=orm_to_film_preview_dict(orm.film)
+    )
@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import List
+from typing import AsyncIterator, List, Optional
 
 from src.domain.entities.film import FilmPreview, FilmExtended
 from src.web.models.search_filters import BaseApiSearchingFilters
@@ -8,21 +8,59 @@ from src.web.models.search_filters import BaseApiSearchingFilters
 # Попробовал переделать кал
 class BaseExternalAPIClient:
     @abstractmethod
-    def get(self, filters: BaseApiSearchingFilters) -> FilmExtended:
+    async def get(self, filters: BaseApiSearchingFilters) -> FilmExtended:
         pass
 
     @abstractmethod
-    def search_by_filters(self, filters: BaseApiSearchingFilters) -> List[FilmPreview]:
+    async def get_many(self, filmids: List[str]) -> List[FilmExtended]:
         pass
 
     @abstractmethod
-    def search_by_name(self, filters: BaseApiSearchingFilters) -> List[FilmPreview]:
+    async def search_by_filters(self, filters: BaseApiSearchingFilters) -> List[FilmPreview]:
         pass
 
     @abstractmethod
-    def search_seasons(self, filters: BaseApiSearchingFilters) -> List[FilmPreview]:
+    async def search_by_name(self, filters: BaseApiSearchingFilters) -> List[FilmPreview]:
         pass
 
     @abstractmethod
-    def get_all_seasons(self, filters: BaseApiSearchingFilters) -> List[FilmExtended]:
+    def stream_search_by_filters(self, filters: BaseApiSearchingFilters) -> AsyncIterator[FilmPreview]:
         pass
+
+    @abstractmethod
+    def stream_search_by_name(self, filters: BaseApiSearchingFilters) -> AsyncIterator[FilmPreview]:
+        pass
+
+    @abstractmethod
+    async def count_by_filters(self, filters: BaseApiSearchingFilters) -> Optional[int]:
+        pass
+
+    @abstractmethod
+    def iter_search_by_filters(
+            self,
+            filters: BaseApiSearchingFilters,
+            max_pages: Optional[int] = None
+    ) -> AsyncIterator[List[FilmPreview]]:
+        pass
+
+    @abstractmethod
+    def iter_search_by_name(
+            self,
+            filters: BaseApiSearchingFilters,
+            max_pages: Optional[int] = None
+    ) -> AsyncIterator[List[FilmPreview]]:
+        pass
+
+    @abstractmethod
+    async def search_seasons(self, filters: BaseApiSearchingFilters) -> List[FilmPreview]:
+        pass
+
+    @abstractmethod
+    async def get_all_seasons(self, filters: BaseApiSearchingFilters) -> List[FilmExtended]:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+    async def metrics(self) -> dict:
+        return {}
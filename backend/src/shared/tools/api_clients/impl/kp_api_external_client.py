@@ -1,165 +1,553 @@
+import asyncio
+import random
 from datetime import datetime
-from typing import List, Optional
+from typing import AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Union
 import httpx
-from urllib.parse import quote
+from urllib.parse import quote, urlsplit, parse_qsl, urlencode
 
 from src.shared.tools.api_clients.core.base_external_api_client import BaseExternalAPIClient
+from src.shared.tools.caches.core.base_response_cache import BaseResponseCache, CacheEntry
+from src.shared.tools.rate_limiting.quota_manager import QuotaManager, RequestPriority, QuotaExceededException
+from src.shared.tools.rate_limiting.api_key_pool import ApiKey, ApiKeyPool, NoAvailableApiKeyException
+from src.shared.tools.resilience.circuit_breaker import CircuitBreaker, CircuitOpenException
+from src.shared.tools.single_flight import SingleFlight
+from src.shared.tools.json_stream import JsonArrayStreamDecoder
 from src.domain.entities.film import FilmExtended, FilmPreview
 from src.infrastructure.repositories.impl.postgres.film_repository.tools.query_builders import APIFilmSearchQueryBuilder
-from src.web.models.search_filters import BaseApiSearchingFilters, BaseBounds
-from src.shared.mappers.api_responses_to_models import parse_film_extended, parse_film_preview, parse_episode
+from src.web.models.search_filters import BaseApiSearchingFilters
+from src.shared.mappers.api_responses_to_models import parse_film_extended, parse_film_preview, \
+    parse_film_previews, parse_films_extended, parse_seasons, lazy_episodes
 
 
 def from_iso_to_year(date: str) -> int:
     return datetime.strptime(date, "%Y-%m-%dT%H:%M:%S.%fZ").year
 
 
-def drop_invalid_seasons_nums(seasons_nums: list) -> list:
-    new_seasons_nums = []
-    for season in seasons_nums:
-        if season > 0:
-            new_seasons_nums.append(season)
-
-    return new_seasons_nums
-
-
 def disable_search_improves(filters: BaseApiSearchingFilters) -> BaseApiSearchingFilters:
     filters.sort_fields = None
     filters.sort_type = None
     return filters
 
 
+def normalize_query_url(url: str) -> str:
+    # порядок одноименных параметров (sortField, genres.name) сохраняется, сортировка стабильная
+    parts = urlsplit(url)
+    params = sorted(parse_qsl(parts.query, keep_blank_values=True), key=lambda param: param[0])
+    return f"{parts.path}?{urlencode(params)}" if params else parts.path
+
+
+def resolve_endpoint(path: str) -> str:
+    path = path.rstrip('/')
+    if path.endswith('/movie/search'):
+        return 'search'
+    if path.endswith('/movie'):
+        return 'filters'
+    if path.endswith('/season'):
+        return 'season'
+    return 'movie'
+
+
+def is_empty_response(response) -> bool:
+    # поиск без результатов - такой же "промах", как и 404 по id
+    return isinstance(response, dict) and 'docs' in response and not response['docs']
+
+
+def is_transient_error(error: httpx.HTTPError) -> bool:
+    # таймауты, обрывы соединения, 429 и 5xx имеет смысл повторить; остальные 4xx - нет
+    if isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+        return status_code == httpx.codes.TOO_MANY_REQUESTS or status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+class FetchResult(NamedTuple):
+    data: Optional[dict]
+    # апи точно ничего не нашло (404) - такой ответ можно положить в отрицательный кэш
+    not_found: bool = False
+    # 304 на условный запрос: закэшированный ответ все еще актуален
+    not_modified: bool = False
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # открытый потоковый ответ (stream=True): тело читает и закрывает вызывающий
+    stream: Optional[httpx.Response] = None
+
+
 class KpExternalAPIClient(BaseExternalAPIClient):
     def __init__(
             self,
             kp_url: str,
-            api_key: str
+            api_key: Union[str, ApiKeyPool],
+            timeout: float = 10,
+            max_connections: int = 20,
+            max_keepalive_connections: int = 10,
+            response_cache: Optional[BaseResponseCache] = None,
+            cache_ttls: Optional[Dict[str, float]] = None,
+            cache_stale_ttl: float = 0,
+            cache_negative_ttl: float = 0,
+            season_page_size: int = 10,
+            batch_size: int = 50,
+            batch_concurrency: int = 5,
+            search_max_pages: int = 1,
+            stream_docs: bool = False,
+            quota_manager: Optional[QuotaManager] = None,
+            endpoint_timeouts: Optional[Dict[str, float]] = None,
+            max_retries: int = 0,
+            backoff_base: float = 0.2,
+            backoff_max: float = 2,
+            circuit_breaker: Optional[CircuitBreaker] = None,
+            transport: Optional[httpx.AsyncBaseTransport] = None
     ) -> None:
 
         self.kp_url = kp_url
-        self.api_key = api_key
-        self.timeout = 10
+        # один ключ - частный случай пула из одного ключа
+        self.key_pool = api_key if isinstance(api_key, ApiKeyPool) else ApiKeyPool([ApiKey(api_key, quota_manager)])
+        self.timeout = timeout
         self.headers = {
-            f'X-API-KEY': self.api_key,
             'accept': 'application/json',
         }
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        )
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self.response_cache = response_cache
+        self.cache_ttls = cache_ttls or {}
+        self.cache_stale_ttl = cache_stale_ttl
+        self.cache_negative_ttl = cache_negative_ttl
+        self._revalidations: Dict[str, asyncio.Task] = {}
+        self._flights = SingleFlight()
+        self.season_page_size = season_page_size
+        self.batch_size = batch_size
+        self.batch_concurrency = batch_concurrency
+        self.search_max_pages = search_max_pages
+        self.stream_docs = stream_docs
+        self.endpoint_timeouts = endpoint_timeouts or {}
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.circuit_breaker = circuit_breaker
+        # подменяемый транспорт: например, ASGI-приложение с фейковым KP для бенчмарков
+        self.transport = transport
+
+    def get_http_client(self) -> httpx.AsyncClient:
+        # один keep-alive пул соединений на процесс, создается при первом запросе
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=self.limits,
+                transport=self.transport
+            )
+        return self._http_client
+
+    async def aclose(self) -> None:
+        for task in list(self._revalidations.values()):
+            task.cancel()
+        if self.response_cache is not None:
+            await self.response_cache.aclose()
+        if self._http_client is not None and not self._http_client.is_closed:
+            await self._http_client.aclose()
+        self._http_client = None
+
+    async def get_response(self, url, priority: RequestPriority = RequestPriority.INTERACTIVE):
+        if self.response_cache is None:
+            return await self.fetch_response(url, priority)
+
+        key = normalize_query_url(url)
+        entry = await self.response_cache.get(key)
+        if entry is not None:
+            if not entry.is_fresh():
+                self._schedule_revalidation(key, url, entry)
+            return entry.value
+
+        result = await self._fetch(url, priority)
+        await self._store_response(key, url, result)
+        return result.data
+
+    async def _store_response(self, key: str, url: str, result: FetchResult) -> None:
+        response = result.data
+        if result.not_found or is_empty_response(response):
+            # отрицательный кэш: повторные промахи не уходят в апи, пока не истечет короткий TTL
+            if self.cache_negative_ttl:
+                await self.response_cache.set(key, response, self.cache_negative_ttl, negative=True)
+            return
 
-    def get_response(self, url):
-        try:
-            response = httpx.get(url, headers=self.headers, timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            print(f"HTTP error: {e}")
-            return None
-        except ValueError as e:
-            print(f"JSON decode error: {e}")
+        if not response:
+            return
+
+        ttl = self.cache_ttls.get(resolve_endpoint(urlsplit(url).path))
+        if ttl:
+            await self.response_cache.set(
+                key, response, ttl, self.cache_stale_ttl, etag=result.etag, last_modified=result.last_modified
+            )
+
+    def _schedule_revalidation(self, key: str, url: str, entry: CacheEntry) -> None:
+        # stale-while-revalidate: отдаем устаревший ответ, а свежий подтягиваем в фоне
+        if key in self._revalidations:
+            return
+
+        async def revalidate():
+            try:
+                result = await self._fetch(url, RequestPriority.BACKGROUND, entry)
+                await self._store_response(key, url, result)
+            except (CircuitOpenException, QuotaExceededException, NoAvailableApiKeyException):
+                pass
+            finally:
+                self._revalidations.pop(key, None)
+
+        self._revalidations[key] = asyncio.create_task(revalidate())
+
+    def coalescing_stats(self) -> dict:
+        return dict(in_flight=self._flights.in_flight(), coalesced=self._flights.coalesced)
+
+    async def cache_stats(self) -> Optional[dict]:
+        if self.response_cache is None:
             return None
+        return await self.response_cache.stats()
+
+    def quota_stats(self) -> dict:
+        quotas = [key.quota_manager for key in self.key_pool.keys if key.quota_manager is not None]
+        remaining = [quota.remaining_today() for quota in quotas]
+        return dict(
+            keys_total=len(self.key_pool.keys),
+            keys_available=len(self.key_pool.available()),
+            daily_remaining=sum(remaining) if remaining and None not in remaining else None,
+            keys=self.key_pool.stats()
+        )
+
+    async def metrics(self) -> dict:
+        return dict(
+            quota=self.quota_stats(),
+            cache=await self.cache_stats(),
+            coalescing=self.coalescing_stats(),
+            circuit=self.circuit_breaker.stats() if self.circuit_breaker else None
+        )
+
+    def _backoff(self, attempt: int) -> float:
+        # full jitter: случайная пауза, чтобы повторы разных воркеров не шли к API одновременно
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def fetch_response(self, url, priority: RequestPriority = RequestPriority.INTERACTIVE):
+        return (await self._fetch(url, priority)).data
+
+    async def _fetch(
+            self,
+            url,
+            priority: RequestPriority,
+            cached: Optional[CacheEntry] = None,
+            stream: bool = False
+    ) -> FetchResult:
+        # CircuitOpenException, QuotaExceededException и NoAvailableApiKeyException не глотаются: для вызывающего
+        # это недоступность API, а не пустой ответ (репозиторий переводит их в ExternalApiUnavailableException)
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.check()
+
+        timeout = self.endpoint_timeouts.get(resolve_endpoint(urlsplit(url).path), self.timeout)
+        conditional_headers = {}
+        if cached is not None and not cached.negative:
+            if cached.etag:
+                conditional_headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                conditional_headers['If-Modified-Since'] = cached.last_modified
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                api_key = self.key_pool.choose(priority)
+                await api_key.acquire(priority)
+                http_client = self.get_http_client()
+                request = http_client.build_request(
+                    'GET', url, timeout=timeout, headers={'X-API-KEY': api_key.token, **conditional_headers}
+                )
+                response = await http_client.send(request, stream=stream)
+                if stream and not response.is_success:
+                    await response.aclose()
+                if response.status_code == httpx.codes.NOT_MODIFIED and conditional_headers:
+                    self._record_success()
+                    return FetchResult(
+                        cached.value,
+                        not_modified=True,
+                        etag=response.headers.get('ETag', cached.etag),
+                        last_modified=response.headers.get('Last-Modified', cached.last_modified)
+                    )
+                if response.status_code == httpx.codes.TOO_MANY_REQUESTS:
+                    self.key_pool.on_rate_limited(api_key, priority)
+                elif response.status_code in (httpx.codes.UNAUTHORIZED, httpx.codes.FORBIDDEN):
+                    self.key_pool.on_rejected(api_key)
+                    # ключ отклонен - повторяем сразу же с другим ключом, если он есть
+                    if attempt < self.max_retries and self.key_pool.available(priority):
+                        continue
+                response.raise_for_status()
+                data = None if stream else response.json()
+            except httpx.HTTPError as e:
+                print(f"HTTP error: {e}")
+                if not is_transient_error(e):
+                    self._record_success()
+                    not_found = isinstance(e, httpx.HTTPStatusError) and \
+                        e.response.status_code == httpx.codes.NOT_FOUND
+                    return FetchResult(None, not_found=not_found)
+                if attempt < self.max_retries:
+                    await asyncio.sleep(self._backoff(attempt))
+                    continue
+                self._record_failure()
+                return FetchResult(None)
+            except ValueError as e:
+                print(f"JSON decode error: {e}")
+                self._record_failure()
+                return FetchResult(None)
+
+            self._record_success()
+            return FetchResult(
+                data,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+                stream=response if stream else None
+            )
 
-    def get(self, filters: BaseApiSearchingFilters) -> Optional[FilmExtended]:
-        query = self.kp_url + f"/movie/{filters.filmid}"
-        response = self.get_response(query)
+    async def _stream_docs(
+            self,
+            url: str,
+            priority: RequestPriority = RequestPriority.INTERACTIVE
+    ) -> AsyncIterator[dict]:
+        # элементы docs разбираются по мере прихода байтов, весь ответ в памяти не собирается;
+        # такой ответ не кэшируется, но уже лежащий в кэше используется
+        if self.response_cache is not None:
+            key = normalize_query_url(url)
+            entry = await self.response_cache.get(key)
+            if entry is not None:
+                if not entry.is_fresh():
+                    self._schedule_revalidation(key, url, entry)
+                for doc in (entry.value or {}).get('docs') or []:
+                    yield doc
+                return
+
+        result = await self._fetch(url, priority, stream=True)
+        if result.stream is None:
+            return
+
+        decoder = JsonArrayStreamDecoder('docs')
+        try:
+            async for chunk in result.stream.aiter_text():
+                for doc in decoder.feed(chunk):
+                    yield doc
+            for doc in decoder.finish():
+                yield doc
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"Stream error: {e}")
+            self._record_failure()
+        finally:
+            await result.stream.aclose()
+
+    def _record_success(self) -> None:
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_success()
+
+    def _record_failure(self) -> None:
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_failure()
+
+    async def get(self, filters: BaseApiSearchingFilters) -> Optional[FilmExtended]:
+        # одновременные запросы одного фильма ждут один запрос к API, каждый получает свою копию модели
+        film_extended = await self._flights.do(('get', filters.filmid), lambda: self._fetch_film(filters.filmid))
+        return film_extended.model_copy() if film_extended else None
+
+    async def _fetch_film(self, filmid: str) -> Optional[FilmExtended]:
+        query = self.kp_url + f"/movie/{quote(filmid, safe='')}"
+        response = await self.get_response(query)
 
         if not response:
             return None
 
         return parse_film_extended(response)
 
-    def search_by_filters(self, filters: BaseApiSearchingFilters) -> List[FilmPreview]:
+    async def get_many(self, filmids: List[str]) -> List[FilmExtended]:
+        filmids = list(dict.fromkeys(filmids))
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+
+        async def fetch_batch(batch: List[str]) -> List[FilmExtended]:
+            params = [('page', 1), ('limit', len(batch))] + [('id', filmid) for filmid in batch]
+            url = self.kp_url + f"/movie?{urlencode(params)}"
+            async with semaphore:
+                if self.stream_docs:
+                    return [parse_film_extended(doc) async for doc in self._stream_docs(url)]
+                response = await self.get_response(url)
+            return parse_films_extended(response.get('docs', [])) if response else []
+
+        async def fetch_one(filmid: str) -> Optional[FilmExtended]:
+            async with semaphore:
+                return await self.get(BaseApiSearchingFilters(filmid=filmid))
+
+        # сначала пачками через /movie?id=..&id=.., чего там не оказалось - поштучно
+        batches = [filmids[i:i + self.batch_size] for i in range(0, len(filmids), self.batch_size)]
+        found = {}
+        for films in await asyncio.gather(*[fetch_batch(batch) for batch in batches]):
+            for film in films:
+                found[film.filmid] = film
+
+        missing = [filmid for filmid in filmids if filmid not in found]
+        for film in await asyncio.gather(*[fetch_one(filmid) for filmid in missing]):
+            if film:
+                found[film.filmid] = film
+
+        return [found[filmid] for filmid in filmids if filmid in found]
+
+    def _filters_query(self, filters: BaseApiSearchingFilters, page: Optional[int] = None) -> str:
+        if page is not None:
+            filters = filters.model_copy(update={'page': page})
         query_bld = APIFilmSearchQueryBuilder(self.kp_url + "/movie?")
-        query = query_bld.apply_all(filters).build()
-        response = self.get_response(query)
+        return query_bld.apply_all(filters).build()
+
+    def _name_query(self, filters: BaseApiSearchingFilters, page: Optional[int] = None) -> str:
+        query = quote(filters.name) if filters.name else ""
+        return self.kp_url + f"/movie/search?page={page or filters.page}&limit={filters.limit}&query={query}"
+
+    async def search_by_filters(self, filters: BaseApiSearchingFilters) -> List[FilmPreview]:
+        response = await self.get_response(self._filters_query(filters))
 
         if not response:
             return []
 
-        data = response.get('docs', [])
+        return parse_film_previews(response.get('docs', []))
 
-        preview_films = []
+    async def search_by_name(self, filters: BaseApiSearchingFilters) -> List[FilmPreview]:
+        response = await self.get_response(self._name_query(filters))
 
-        for elem in data:
-            film_preview = parse_film_preview(elem)
-            preview_films.append(film_preview)
+        films_data = response.get('docs', []) if response else {}
 
-        return preview_films
+        if len(films_data) == 0:
+            return []
 
-    def search_by_name(self, filters: BaseApiSearchingFilters) -> List[FilmPreview]:
-        name = filters.name
-        page = filters.page
-        limit = filters.limit
+        return parse_film_previews(films_data)
 
-        query = quote(name) if name else ""
-        param = f"/movie/search?page={page}&limit={limit}&query={query}"
-        url = self.kp_url + param
-        response = self.get_response(url)
+    async def stream_search_by_filters(self, filters: BaseApiSearchingFilters) -> AsyncIterator[FilmPreview]:
+        async for doc in self._stream_docs(self._filters_query(filters)):
+            yield parse_film_preview(doc)
 
-        films_data = response.get('docs', []) if response else {}
+    async def stream_search_by_name(self, filters: BaseApiSearchingFilters) -> AsyncIterator[FilmPreview]:
+        async for doc in self._stream_docs(self._name_query(filters)):
+            yield parse_film_preview(doc)
 
-        if len(films_data) == 0:
-            return []
+    async def count_by_filters(self, filters: BaseApiSearchingFilters) -> Optional[int]:
+        # сколько фильмов KP найдет по фильтрам: одна страница из одного элемента, нужен только total
+        probe = filters.model_copy(update={'page': 1, 'limit': 1, 'sort_fields': None, 'sort_type': None})
+        response = await self.get_response(self._filters_query(probe))
+        return response.get('total') if response else None
+
+    def iter_search_by_filters(
+            self,
+            filters: BaseApiSearchingFilters,
+            max_pages: Optional[int] = None
+    ) -> AsyncIterator[List[FilmPreview]]:
+        return self._iter_pages(lambda page: self._filters_query(filters, page), filters.page or 1, max_pages)
+
+    def iter_search_by_name(
+            self,
+            filters: BaseApiSearchingFilters,
+            max_pages: Optional[int] = None
+    ) -> AsyncIterator[List[FilmPreview]]:
+        return self._iter_pages(lambda page: self._name_query(filters, page), filters.page or 1, max_pages)
+
+    async def _iter_pages(
+            self,
+            page_query: Callable[[int], str],
+            start_page: int,
+            max_pages: Optional[int] = None
+    ) -> AsyncIterator[List[FilmPreview]]:
+        # страница N+1 запрашивается, пока вызывающий разбирает и фильтрует страницу N
+        max_pages = max_pages or self.search_max_pages
+        last_page = start_page + max_pages - 1
+        page = start_page
+        pending = asyncio.ensure_future(self.get_response(page_query(page)))
+        try:
+            while pending is not None:
+                response = await pending
+                pending = None
 
-        return [parse_film_preview(film) for film in films_data]
+                docs = response.get('docs') if response else None
+                if not docs:
+                    return
 
-    def search_seasons(self, filters: BaseApiSearchingFilters) -> List[FilmPreview]:
+                if page < min(response.get('pages') or page, last_page):
+                    pending = asyncio.ensure_future(self.get_response(page_query(page + 1)))
+
+                yield parse_film_previews(docs)
+                page += 1
+        finally:
+            # итерацию прервали раньше - предзагруженная страница не нужна
+            if pending is not None:
+                pending.cancel()
+
+    def _season_query(self, filters: BaseApiSearchingFilters) -> str:
         filters = disable_search_improves(
             filters)  # убираем параметры, делающие поиск релевантным, так как апи в данном методе их не поддерживает
         query_bld = APIFilmSearchQueryBuilder(self.kp_url + "/season?")
-        query = query_bld.apply_all(filters).query
-        response = self.get_response(query)
-
-        if not response:
-            return []
+        return query_bld.apply_all(filters).build()
 
-        data = response.get('docs', [])
+    async def search_seasons(self, filters: BaseApiSearchingFilters) -> List[FilmPreview]:
+        film_extended, response = await asyncio.gather(
+            self.get(BaseApiSearchingFilters(filmid=filters.filmid)),
+            self.get_response(self._season_query(filters))
+        )
 
-        film_extended = self.get(BaseApiSearchingFilters(filmid=filters.filmid))
-        if not film_extended:
+        if not response or not film_extended:
             return []
 
+        parent_fields = {field: getattr(film_extended, field) for field in FilmPreview.model_fields}
         preview_films = []
 
-        for curr_film in data:
+        for curr_film in response.get('docs', []):
             air_date = curr_film.get("airDate")
-            film_preview = FilmPreview(
-                **film_extended.model_dump()
-            )
-            film_preview.season = curr_film.get('number')
-            film_preview.release_year = from_iso_to_year(air_date) if air_date else None
+            film_preview = FilmPreview.model_construct(**{
+                **parent_fields,
+                'season': curr_film.get('number'),
+                'release_year': from_iso_to_year(air_date) if air_date else None
+            })
             preview_films.append(film_preview)
 
         return preview_films
 
-    def get_all_seasons(self, filters: BaseApiSearchingFilters) -> List[FilmPreview]:
-        filters = disable_search_improves(
-            filters)
-        film_extended = self.get(BaseApiSearchingFilters(filmid=filters.filmid))
-        nums_of_seasons = drop_invalid_seasons_nums([si.number for si in film_extended.seasons_info])
-        filters.seasons_range = BaseBounds(lower=min(nums_of_seasons), upper=max(nums_of_seasons))
+    async def get_all_seasons(self, filters: BaseApiSearchingFilters) -> List[FilmExtended]:
+        seasons = await self._flights.do(('seasons', filters.filmid), lambda: self._fetch_all_seasons(filters.filmid))
+        return [season.model_copy() for season in seasons]
 
-        query_bld = APIFilmSearchQueryBuilder(self.kp_url + "/season?")
-        query = query_bld.apply_all(filters).build()
-
-        response = self.get_response(query)
+    async def _fetch_season_pages(self, filmid: str) -> List[dict]:
+        def page_query(page: int) -> str:
+            return self._season_query(
+                BaseApiSearchingFilters(filmid=filmid, page=page, limit=self.season_page_size)
+            )
 
-        if not response:
+        first_page = await self.get_response(page_query(1))
+        if not first_page:
             return []
 
-        data = response.get('docs', [])
-
-        if not film_extended:
+        docs = list(first_page.get('docs', []))
+        pages = first_page.get('pages') or 1
+        if pages > 1:
+            rest_pages = await asyncio.gather(*[self.get_response(page_query(page)) for page in range(2, pages + 1)])
+            for response in rest_pages:
+                if response:
+                    docs.extend(response.get('docs', []))
+
+        # нулевой "сезон" у КП - это спецвыпуски, их не показываем
+        seasons = [doc for doc in docs if (doc.get('number') or 0) > 0]
+        return sorted(seasons, key=lambda doc: doc['number'])
+
+    async def _fetch_all_seasons(self, filmid: str) -> List[FilmExtended]:
+        # родительский сериал и страницы сезонов запрашиваются одновременно
+        film_extended, seasons_data = await asyncio.gather(
+            self.get(BaseApiSearchingFilters(filmid=filmid)),
+            self._fetch_season_pages(filmid)
+        )
+
+        if not film_extended or not seasons_data:
             return []
 
-        extended_films = []
-
-        for curr_film in data:
-            air_date = curr_film.get("airDate", None)
-            film_extended = FilmExtended(
-                **film_extended.model_dump()
-            )
-            film_extended.season = curr_film.get('number', None)
-            film_extended.release_year = from_iso_to_year(air_date) if air_date else None
-            film_extended.episodes = [parse_episode(episode) for episode in
-                                      curr_film.get('episodes', None)] if curr_film.get('episodes', None) else None
-            extended_films.append(film_extended)
-
-        return extended_films
+        seasons = parse_seasons(seasons_data)
+        # model_copy не копирует вложенные persons/seasons_info и не валидирует родителя заново
+        return [
+            film_extended.model_copy(update=dict(
+                season=season.season,
+                release_year=season.release_year,
+                episodes=lazy_episodes(season.episodes)
+            ))
+            for season in seasons
+        ]
@@ -0,0 +1,55 @@
+import time
+from abc import abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    fresh_until: float
+    stale_until: float
+    negative: bool = False
+    # валидаторы для условного запроса (If-None-Match / If-Modified-Since), если API их отдает
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # часы, в которых записаны сроки: у кэша в памяти monotonic, у кэша на диске - time.time
+    clock: Callable[[], float] = field(default=time.monotonic, repr=False, compare=False)
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        now = self.clock() if now is None else now
+        return now < self.fresh_until
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        now = self.clock() if now is None else now
+        return now >= self.stale_until
+
+
+class BaseResponseCache:
+    @abstractmethod
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        pass
+
+    @abstractmethod
+    async def set(
+            self,
+            key: str,
+            value: Any,
+            ttl: float,
+            stale_ttl: float = 0,
+            negative: bool = False,
+            etag: Optional[str] = None,
+            last_modified: Optional[str] = None
+    ) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    async def stats(self) -> dict:
+        pass
+
+    async def aclose(self) -> None:
+        pass
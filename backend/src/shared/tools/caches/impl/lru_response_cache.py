@@ -0,0 +1,77 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from src.shared.tools.caches.core.base_response_cache import BaseResponseCache, CacheEntry
+
+
+class LRUResponseCache(BaseResponseCache):
+    def __init__(self, max_size: int = 1024, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self._clock = clock
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.evictions = 0
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        now = self._clock()
+
+        if entry is None or entry.is_expired(now):
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        if entry.negative:
+            self.negative_hits += 1
+        elif entry.is_fresh(now):
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+        return entry
+
+    async def set(
+            self,
+            key: str,
+            value: Any,
+            ttl: float,
+            stale_ttl: float = 0,
+            negative: bool = False,
+            etag: Optional[str] = None,
+            last_modified: Optional[str] = None
+    ) -> None:
+        now = self._clock()
+        self._entries[key] = CacheEntry(
+            value=value,
+            fresh_until=now + ttl,
+            stale_until=now + ttl + stale_ttl,
+            negative=negative,
+            etag=etag,
+            last_modified=last_modified,
+            clock=self._clock
+        )
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def stats(self) -> dict:
+        return dict(
+            size=len(self._entries),
+            negative_size=sum(1 for entry in self._entries.values() if entry.negative),
+            max_size=self.max_size,
+            hits=self.hits,
+            stale_hits=self.stale_hits,
+            negative_hits=self.negative_hits,
+            misses=self.misses,
+            evictions=self.evictions
+        )
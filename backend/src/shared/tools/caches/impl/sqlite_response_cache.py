@@ -0,0 +1,183 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from src.shared.tools.caches.core.base_response_cache import BaseResponseCache, CacheEntry
+
+
+class SQLiteResponseCache(BaseResponseCache):
+    """
+    Кэш ответов в файле SQLite: переживает рестарт и общий для всех воркеров на хосте.
+    Сроки хранятся в unix-времени, LRU-вытеснение по времени последнего чтения.
+
+    Размер файла не считается на каждой записи: процесс ведет приблизительный счетчик (перезапись ключа тоже
+    увеличивает его) и делает COUNT(*) только когда счетчик перевалил за max_size. Вытеснение идет с запасом -
+    до 90% max_size, поэтому следующий подсчет понадобится не раньше, чем через max_size // 10 записей.
+    """
+
+    def __init__(self, path: str, max_size: int = 10000, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.max_size = max_size
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        # верхняя оценка числа записей в файле; None - еще не считали
+        self._size: Optional[int] = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.evictions = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            # WAL: читатели из других воркеров не блокируются записью
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, "
+                "value TEXT NOT NULL, "
+                "fresh_until REAL NOT NULL, "
+                "stale_until REAL NOT NULL, "
+                "negative INTEGER NOT NULL DEFAULT 0, "
+                "etag TEXT, "
+                "last_modified TEXT, "
+                "accessed_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+            self._connection = connection
+        return self._connection
+
+    async def _run(self, func, *args):
+        # sqlite3 синхронный - выносим в поток, чтобы не блокировать event loop
+        def locked():
+            with self._lock:
+                return func(self._connect(), *args)
+
+        return await asyncio.to_thread(locked)
+
+    def _get(self, connection: sqlite3.Connection, key: str) -> Optional[CacheEntry]:
+        row = connection.execute(
+            "SELECT value, fresh_until, stale_until, negative, etag, last_modified FROM responses WHERE key = ?",
+            (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        now = self._clock()
+        value, fresh_until, stale_until, negative, etag, last_modified = row
+        if now >= stale_until:
+            connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            return None
+
+        connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return CacheEntry(
+            value=json.loads(value),
+            fresh_until=fresh_until,
+            stale_until=stale_until,
+            negative=bool(negative),
+            etag=etag,
+            last_modified=last_modified,
+            clock=self._clock
+        )
+
+    def _set(self, connection: sqlite3.Connection, key: str, entry: CacheEntry) -> int:
+        now = self._clock()
+        connection.execute(
+            "INSERT OR REPLACE INTO responses "
+            "(key, value, fresh_until, stale_until, negative, etag, last_modified, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, json.dumps(entry.value, ensure_ascii=False), entry.fresh_until, entry.stale_until,
+             int(entry.negative), entry.etag, entry.last_modified, now)
+        )
+
+        if self._size is not None:
+            self._size += 1
+            if self._size <= self.max_size:
+                return 0
+
+        # точный размер: в файл пишут и другие воркеры
+        size = connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        self._size = size
+        if size <= self.max_size:
+            return 0
+
+        # сначала выкидываем протухшие записи, потом - давно не читанные
+        evicted = connection.execute("DELETE FROM responses WHERE stale_until <= ?", (now,)).rowcount
+        overflow = size - evicted - (self.max_size - self.max_size // 10)
+        if overflow > 0:
+            evicted += connection.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                (overflow,)
+            ).rowcount
+        self._size = size - evicted
+        return evicted
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        entry = await self._run(self._get, key)
+
+        if entry is None:
+            self.misses += 1
+        elif entry.negative:
+            self.negative_hits += 1
+        elif entry.is_fresh():
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+        return entry
+
+    async def set(
+            self,
+            key: str,
+            value: Any,
+            ttl: float,
+            stale_ttl: float = 0,
+            negative: bool = False,
+            etag: Optional[str] = None,
+            last_modified: Optional[str] = None
+    ) -> None:
+        now = self._clock()
+        entry = CacheEntry(
+            value=value,
+            fresh_until=now + ttl,
+            stale_until=now + ttl + stale_ttl,
+            negative=negative,
+            etag=etag,
+            last_modified=last_modified
+        )
+        self.evictions += await self._run(self._set, key, entry)
+
+    async def delete(self, key: str) -> None:
+        await self._run(lambda connection: connection.execute("DELETE FROM responses WHERE key = ?", (key,)))
+
+    async def stats(self) -> dict:
+        # размер берется из файла, счетчики попаданий - по текущему процессу
+        size, negative_size = await self._run(lambda connection: connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(negative), 0) FROM responses"
+        ).fetchone())
+        return dict(
+            size=size,
+            negative_size=negative_size,
+            max_size=self.max_size,
+            hits=self.hits,
+            stale_hits=self.stale_hits,
+            negative_hits=self.negative_hits,
+            misses=self.misses,
+            evictions=self.evictions
+        )
+
+    async def aclose(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
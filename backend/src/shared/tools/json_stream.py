@@ -0,0 +1,81 @@
+import json
+import re
+from typing import List, Optional
+
+_WHITESPACE_AND_COMMAS = re.compile(r'[\s,]*')
+
+
+class JsonArrayStreamDecoder:
+    """
+    Инкрементально разбирает элементы массива `field` верхнего уровня JSON-объекта ({"docs": [...], ...}),
+    получая текст ответа кусками. Целиком в памяти держится только текущий элемент, а не весь ответ.
+    Остальные поля объекта (total, pages, ...) доступны в meta после finish().
+    """
+
+    def __init__(self, field: str = 'docs'):
+        self.field = field
+        self._start = re.compile(r'"%s"\s*:\s*\[' % re.escape(field))
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._prefix = ''
+        self._in_array = False
+        self._done = False
+        self._retry_at = 0
+        self.meta: Optional[dict] = None
+
+    def feed(self, text: str) -> List[dict]:
+        self._buffer += text
+        if self._done:
+            return []
+
+        if not self._in_array:
+            match = self._start.search(self._buffer)
+            if match is None:
+                return []
+            self._prefix = self._buffer[:match.start()]
+            self._buffer = self._buffer[match.end():]
+            self._in_array = True
+
+        # недокачанный большой элемент не разбираем заново на каждом куске: следующая попытка -
+        # когда буфер вырастет вдвое, так суммарная работа остается линейной
+        if len(self._buffer) < self._retry_at:
+            return []
+        return self._drain()
+
+    def _drain(self) -> List[dict]:
+        items = []
+        position = 0
+        self._retry_at = 0
+        while True:
+            position = _WHITESPACE_AND_COMMAS.match(self._buffer, position).end()
+            if position >= len(self._buffer):
+                break
+            if self._buffer[position] == ']':
+                self._done = True
+                position += 1
+                break
+            try:
+                item, position_after = self._decoder.raw_decode(self._buffer, position)
+            except json.JSONDecodeError:
+                # элемент пришел не целиком - ждем следующие куски
+                self._retry_at = 2 * (len(self._buffer) - position)
+                break
+            items.append(item)
+            position = position_after
+
+        self._buffer = self._buffer[position:]
+        return items
+
+    def finish(self) -> List[dict]:
+        """Разбирает остаток буфера после конца потока; возвращает элементы, которые не успели отдать."""
+        items = self._drain() if self._in_array and not self._done else []
+        if not self._in_array:
+            # массива нет (например, ответ-ошибка) - разбираем как обычный JSON
+            self.meta = json.loads(self._buffer) if self._buffer.strip() else {}
+            return items
+        if not self._done:
+            raise ValueError("JSON stream ended inside the array")
+
+        # сам массив уже отдан по элементам, в meta на его месте null
+        self.meta = json.loads(f'{self._prefix}"{self.field}": null{self._buffer}')
+        return items
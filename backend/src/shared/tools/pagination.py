@@ -0,0 +1,24 @@
+from typing import AsyncIterator, Callable, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+async def take_matches(
+        pages: AsyncIterator[List[T]],
+        select: Callable[[List[T]], Optional[List[T]]],
+        count: int,
+        skip: int = 0
+) -> List[T]:
+    """
+    Собирает count подходящих элементов из постраничного итератора, пропустив первые skip подходящих.
+    Как только набрано достаточно, итератор закрывается и следующие страницы не запрашиваются.
+    """
+    matches: List[T] = []
+    try:
+        async for items in pages:
+            matches.extend(select(items) or [])
+            if len(matches) >= skip + count:
+                break
+    finally:
+        await pages.aclose()
+    return matches[skip:skip + count]
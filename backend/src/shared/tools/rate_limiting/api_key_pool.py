@@ -0,0 +1,108 @@
+import math
+import time
+from typing import Callable, List, Optional
+
+from src.shared.tools.rate_limiting.quota_manager import QuotaManager, RequestPriority
+
+
+class NoAvailableApiKeyException(Exception):
+    code = "NO_AVAILABLE_API_KEY"
+
+    def __init__(self, keys_count: int):
+        super().__init__(f"All {keys_count} external API keys are exhausted or cooling down")
+
+
+class ApiKey:
+    def __init__(self, token: str, quota_manager: Optional[QuotaManager] = None):
+        self.token = token
+        self.quota_manager = quota_manager
+        self.requests = 0
+        self.failures = 0
+        self.cooldown_until = 0.0
+        self.cooldown_reason: Optional[str] = None
+
+    @property
+    def masked(self) -> str:
+        return f"{self.token[:4]}…{self.token[-2:]}" if len(self.token) > 8 else "…"
+
+    def has_budget(self, priority: RequestPriority) -> bool:
+        if self.quota_manager is None:
+            return True
+        remaining = self.quota_manager.remaining_today()
+        if remaining is None:
+            return True
+        reserve = self.quota_manager.background_reserve if priority == RequestPriority.BACKGROUND else 0
+        return remaining > reserve
+
+    def score(self) -> tuple:
+        # больше остаток дневного бюджета -> выше приоритет, при равенстве - больше свободных токенов
+        if self.quota_manager is None:
+            return math.inf, math.inf
+        remaining = self.quota_manager.remaining_today()
+        return (math.inf if remaining is None else remaining), self.quota_manager.available_tokens()
+
+    async def acquire(self, priority: RequestPriority) -> None:
+        if self.quota_manager is not None:
+            await self.quota_manager.acquire(priority)
+        self.requests += 1
+
+
+class ApiKeyPool:
+    def __init__(
+            self,
+            keys: List[ApiKey],
+            cooldown: float = 60,
+            invalid_key_cooldown: float = 3600,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        if not keys:
+            raise ValueError("ApiKeyPool requires at least one key")
+        self.keys = keys
+        self.cooldown = cooldown
+        self.invalid_key_cooldown = invalid_key_cooldown
+        self._clock = clock
+
+    def _is_cooling_down(self, key: ApiKey) -> bool:
+        return key.cooldown_until > self._clock()
+
+    def available(self, priority: RequestPriority = RequestPriority.INTERACTIVE) -> List[ApiKey]:
+        return [key for key in self.keys if not self._is_cooling_down(key) and key.has_budget(priority)]
+
+    def choose(self, priority: RequestPriority = RequestPriority.INTERACTIVE) -> ApiKey:
+        candidates = self.available(priority)
+        if not candidates:
+            raise NoAvailableApiKeyException(len(self.keys))
+        return max(candidates, key=lambda key: key.score())
+
+    def cool_down(self, key: ApiKey, reason: str, seconds: Optional[float] = None) -> None:
+        key.failures += 1
+        key.cooldown_reason = reason
+        key.cooldown_until = self._clock() + (self.cooldown if seconds is None else seconds)
+
+    def on_rate_limited(self, key: ApiKey, priority: RequestPriority = RequestPriority.INTERACTIVE) -> None:
+        # 429: токены ключа сгорают, запрос повторяется после паузы
+        if key.quota_manager is not None:
+            key.quota_manager.on_rate_limited()
+        # на паузу ключ уходит, только если запрос есть кому взять: единственный ключ на паузе отклонял бы все запросы
+        if any(other is not key for other in self.available(priority)):
+            self.cool_down(key, "rate_limited")
+        else:
+            key.failures += 1
+
+    def on_rejected(self, key: ApiKey) -> None:
+        # 401/403: ключ отозван или заблокирован, надолго убираем его из ротации
+        self.cool_down(key, "rejected", self.invalid_key_cooldown)
+
+    def stats(self) -> List[dict]:
+        now = self._clock()
+        return [
+            dict(
+                key=key.masked,
+                requests=key.requests,
+                failures=key.failures,
+                cooling_down_for=round(max(0.0, key.cooldown_until - now), 2),
+                cooldown_reason=key.cooldown_reason if self._is_cooling_down(key) else None,
+                quota=key.quota_manager.stats() if key.quota_manager else None
+            )
+            for key in self.keys
+        ]
@@ -0,0 +1,146 @@
+import asyncio
+import heapq
+import itertools
+import time
+from datetime import datetime, timezone, date
+from enum import IntEnum
+from typing import Callable, List, Optional, Tuple
+
+
+class RequestPriority(IntEnum):
+    INTERACTIVE = 0  # запрос пользователя, которого ждут прямо сейчас
+    BACKGROUND = 1  # обновление кэша, предзагрузка и прочая фоновая работа
+
+
+class QuotaExceededException(Exception):
+    code = "QUOTA_EXCEEDED"
+
+    def __init__(self, priority: RequestPriority, remaining: int):
+        super().__init__(f"External API daily quota is exhausted for {priority.name} requests (remaining: {remaining})")
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+class QuotaManager:
+    """Token bucket на частоту запросов + дневной бюджет, с приоритетом интерактивных запросов."""
+
+    def __init__(
+            self,
+            rate_per_second: float,
+            burst: Optional[int] = None,
+            daily_limit: Optional[int] = None,
+            background_reserve: int = 0,
+            clock: Callable[[], float] = time.monotonic,
+            today: Callable[[], date] = utc_today
+    ):
+        self.rate_per_second = rate_per_second
+        self.burst = burst or max(1, int(rate_per_second))
+        self.daily_limit = daily_limit
+        # столько запросов дневного бюджета фоновые задачи не трогают
+        self.background_reserve = background_reserve
+        self._clock = clock
+        self._today = today
+
+        self._tokens = float(self.burst)
+        self._refilled_at = clock()
+        self._day = today()
+        self.daily_used = 0
+        self.throttled = 0
+        self.rejected = 0
+        self.upstream_rate_limited = 0
+
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate_per_second)
+        self._refilled_at = now
+
+    def _roll_day(self) -> None:
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self.daily_used = 0
+
+    def available_tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def remaining_today(self) -> Optional[int]:
+        self._roll_day()
+        if self.daily_limit is None:
+            return None
+        return max(0, self.daily_limit - self.daily_used)
+
+    def _check_budget(self, priority: RequestPriority) -> None:
+        remaining = self.remaining_today()
+        if remaining is None:
+            return
+
+        reserve = self.background_reserve if priority == RequestPriority.BACKGROUND else 0
+        if remaining <= reserve:
+            self.rejected += 1
+            raise QuotaExceededException(priority, remaining)
+
+    async def acquire(self, priority: RequestPriority = RequestPriority.INTERACTIVE) -> None:
+        self._check_budget(priority)
+
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            self.daily_used += 1
+            return
+
+        self.throttled += 1
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await future
+
+    async def _dispatch(self) -> None:
+        # токены раздаются по очереди: сначала интерактивные запросы, внутри приоритета - FIFO
+        while self._waiters:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate_per_second)
+                continue
+
+            priority, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+
+            try:
+                self._check_budget(RequestPriority(priority))
+            except QuotaExceededException as e:
+                future.set_exception(e)
+                continue
+
+            self._tokens -= 1
+            self.daily_used += 1
+            future.set_result(None)
+
+    def on_rate_limited(self) -> None:
+        # апи ответило 429 - значит наша оценка лимита оптимистична, сбрасываем накопленные токены
+        self.upstream_rate_limited += 1
+        self._refill()
+        self._tokens = min(self._tokens, 0)
+
+    def stats(self) -> dict:
+        self._refill()
+        return dict(
+            rate_per_second=self.rate_per_second,
+            burst=self.burst,
+            available_tokens=round(self._tokens, 2),
+            daily_limit=self.daily_limit,
+            daily_used=self.daily_used,
+            daily_remaining=self.remaining_today(),
+            queued=sum(1 for *_, future in self._waiters if not future.done()),
+            throttled=self.throttled,
+            rejected=self.rejected,
+            upstream_rate_limited=self.upstream_rate_limited
+        )
@@ -0,0 +1,88 @@
+import time
+from enum import Enum
+from typing import Callable, Optional
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenException(Exception):
+    code = "CIRCUIT_OPEN"
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open, next attempt in {retry_after:.1f}s")
+
+
+class CircuitBreaker:
+    def __init__(
+            self,
+            name: str,
+            failure_threshold: int = 5,
+            reset_timeout: float = 30,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_times = 0
+        self.rejected = 0
+        self._opened_at: Optional[float] = None
+        self._probe_started_at: Optional[float] = None
+
+    def allow_request(self) -> bool:
+        if self.state == CircuitState.CLOSED:
+            return True
+
+        now = self._clock()
+        if self.state == CircuitState.OPEN and now - self._opened_at >= self.reset_timeout:
+            self.state = CircuitState.HALF_OPEN
+            self._probe_started_at = None
+
+        # в half-open пропускаем один пробный запрос; если он завис, через reset_timeout пускаем следующий
+        if self.state == CircuitState.HALF_OPEN and (
+                self._probe_started_at is None or now - self._probe_started_at >= self.reset_timeout):
+            self._probe_started_at = now
+            return True
+
+        self.rejected += 1
+        return False
+
+    def check(self) -> None:
+        if not self.allow_request():
+            raise CircuitOpenException(self.name, self.retry_after())
+
+    def retry_after(self) -> float:
+        if self._opened_at is None:
+            return 0
+        return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def record_success(self) -> None:
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = None
+        self._probe_started_at = None
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == CircuitState.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != CircuitState.OPEN:
+                self.opened_times += 1
+            self.state = CircuitState.OPEN
+            self._opened_at = self._clock()
+            self._probe_started_at = None
+
+    def stats(self) -> dict:
+        return dict(
+            state=self.state.value,
+            consecutive_failures=self.consecutive_failures,
+            opened_times=self.opened_times,
+            rejected=self.rejected,
+            retry_after=round(self.retry_after(), 2) if self.state == CircuitState.OPEN else 0
+        )
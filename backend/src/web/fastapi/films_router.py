@@ -2,13 +2,14 @@ from typing import List, Union
 from fastapi import APIRouter, Depends, HTTPException
 
 from src.dependencies import get_current_user, get_film_service_dep
-from src.domain.entities.film import FilmExtended, FilmPreview, FilmBase, FilmPersonal
+from src.domain.entities.film import FilmExtended, FilmPreview, FilmBase, FilmPersonal, FilmTypes
 from src.domain.entities.user import User
 from src.services.film.exceptions import (
     EmptyListException, NotFoundLocalException, NotFoundExternalException,
-    AlreadyWatchedException, DoesNotExistException
+    AlreadyWatchedException, DoesNotExistException, ExternalApiUnavailableException
 )
 from src.web.models.film_rating import BaseFilmComplexRating, BaseRatingScale
+from src.web.fastapi.responses import FastJSONResponse
 from src.web.models.search_filters import BaseSearchingFilters, BaseApiSearchingFilters
 
 films_router = APIRouter(
@@ -27,6 +28,8 @@ async def get_film_details(
         return await film_service.get(user=user, film_to_get=film)
     except DoesNotExistException as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except ExternalApiUnavailableException as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
 
 @films_router.post("/unwatched")
@@ -49,7 +52,7 @@ def get_unwatched(
         film_service=Depends(get_film_service_dep)
 ):
     try:
-        return film_service.get_list(user, is_watched=watched)
+        return FastJSONResponse(film_service.get_list(user, is_watched=watched, out_model=FilmTypes.FILM_PREVIEW_DICT))
     except EmptyListException as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -61,7 +64,10 @@ def local_search(
         film_service=Depends(get_film_service_dep)
 ):
     try:
-        return film_service.local_search_by_filters(user, filters)
+        # limit/sort_by/cursor - keyset-пагинация, курсор следующей страницы приходит в заголовке X-Next-Cursor
+        page = film_service.local_search_page(user, filters, FilmTypes.FILM_PREVIEW_DICT)
+        headers = {"X-Next-Cursor": page.next_cursor} if page.next_cursor else None
+        return FastJSONResponse(page.items, headers=headers)
     except NotFoundLocalException as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -88,6 +94,8 @@ async def external_get(
         return await film_service.get(user, film)
     except NotFoundExternalException as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except ExternalApiUnavailableException as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
 
 @films_router.post("/watch-status")
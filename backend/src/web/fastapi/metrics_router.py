@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from src.dependencies import get_current_user, get_external_api_client_dep, build_user_access_model
+from src.domain.entities.user import User
+from src.shared.tools.api_clients.core.base_external_api_client import BaseExternalAPIClient
+
+metrics_router = APIRouter(
+    prefix='/metrics',
+    tags=['metrics']
+)
+
+
+@metrics_router.get("/external-api")
+async def get_external_api_metrics(
+        user: User = Depends(get_current_user),
+        api_client: BaseExternalAPIClient = Depends(get_external_api_client_dep)
+) -> dict:
+    if not build_user_access_model(user).is_admin():
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Metrics are available only for admins")
+    return await api_client.metrics()
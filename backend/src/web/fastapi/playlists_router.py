@@ -1,7 +1,7 @@
 from typing import List, Union
 from fastapi import APIRouter, Depends, HTTPException
 
-from src.domain.entities.film import FilmBase
+from src.domain.entities.film import FilmBase, FilmTypes
 from src.domain.entities.playlist import Playlist, PlaylistItemPreview
 from src.domain.entities.user import User
 from src.services.playlist.exceptions import (
@@ -11,6 +11,7 @@ from src.services.playlist.exceptions import (
 )
 from src.web.models.playlists import CreatePlaylistModel, PlaylistSearchFilters
 from src.services.playlist.service import PlaylistService
+from src.web.fastapi.responses import FastJSONResponse
 
 from src.dependencies import (
     get_playlist_service_dep,
@@ -204,7 +205,8 @@ def get_playlist_content(
 ):
     try:
         access_model = build_access_model(user)
-        return playlist_service.get_playlist_content(access_model, filters)
+        content = playlist_service.get_playlist_content(access_model, filters, FilmTypes.FILM_PREVIEW_DICT)
+        return FastJSONResponse(content)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except UserDoesntHavePermissionException as e:
@@ -0,0 +1,14 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Кодирует dict-ы сразу в JSON сериализатором pydantic-core (datetime, UUID и т.п.), без валидации
+    по response_model. response_model у маршрута остается для схемы OpenAPI.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
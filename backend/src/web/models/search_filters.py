@@ -1,5 +1,9 @@
-from typing import Optional, List, Union
-from pydantic import BaseModel, Field
+import base64
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional, List, Tuple, Union
+from pydantic import BaseModel, Field, model_validator
 
 from src.web.models.film_rating import BaseFilmComplexRating, BaseRatingScale
 
@@ -20,9 +24,42 @@ class BaseBounds(BaseModel):
         return ""
 
 
+class FilmSortKey(str, Enum):
+    KP_RATING = "kp_rating"
+    YEAR = "year"
+    NAME = "name"
+    ADDED_AT = "added_at"
+
+
+# ключ сортировки страниц без sort_by
+DEFAULT_SORT_KEY = "filmid"
+LOCAL_SEARCH_MAX_LIMIT = 500
+
+
+def encode_search_cursor(sort_key: str, value: Any, filmid: str) -> str:
+    """Непрозрачный курсор keyset-пагинации: ключ сортировки, его значение и filmid последнего фильма страницы."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort_key, value, filmid], ensure_ascii=False, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_search_cursor(cursor: str) -> Tuple[str, Any, str]:
+    try:
+        sort_key, value, filmid = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if sort_key == FilmSortKey.ADDED_AT and value is not None:
+            value = datetime.fromisoformat(value)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Некорректный курсор") from e
+    # None - курсор в конце выдачи, среди фильмов без значения ключа; у filmid значение есть всегда
+    if (value is None and sort_key == DEFAULT_SORT_KEY) or not isinstance(filmid, str):
+        raise ValueError("Некорректный курсор")
+    return sort_key, value, filmid
+
+
 class BaseSearchingFilters(BaseModel):
     filmid: Optional[str] = Field(None, description="Идентификатор фильма")
-    filmids: Optional[List[str]] = Field(None, description='Идентификаторы нужных фильмов (работает только локально)')
+    filmids: Optional[List[str]] = Field(None, description='Идентификаторы нужных фильмов (локальный поиск и пакетное получение из API)')
     name: Optional[str] = Field(None, description="Название фильма")
     person: Optional[str] = Field(None, description="Персона (режиссер или актер), участвовавшая в создании фильма")
     is_series: Optional[bool] = Field(None, description="Является ли сериалом")
@@ -32,6 +69,24 @@ class BaseSearchingFilters(BaseModel):
     age_rating: Optional[BaseBounds] = Field(None, description="Возрастной рейтинг")
     genres: Optional[List[str]] = Field(None, description="Жанры фильма")
     countries: Optional[List[str]] = Field(None, description="Страны")
+    limit: Optional[int] = Field(None, ge=1, le=LOCAL_SEARCH_MAX_LIMIT,
+                                 description="Размер страницы локального поиска (без него - все найденные фильмы)")
+    sort_by: Optional[FilmSortKey] = Field(None, description="Сортировка страниц: рейтинг КП, год и дата добавления - "
+                                                             "по убыванию, название - по алфавиту. Фильмы без значения "
+                                                             "ключа - в конце. Без ключа - по filmid")
+    cursor: Optional[str] = Field(None, description="Курсор следующей страницы из заголовка X-Next-Cursor")
+
+    @model_validator(mode="after")
+    def check_cursor(self):
+        if self.cursor is not None:
+            sort_key, _, _ = decode_search_cursor(self.cursor)
+            if sort_key != (self.sort_by.value if self.sort_by else DEFAULT_SORT_KEY):
+                raise ValueError("Курсор получен для другой сортировки")
+        return self
+
+    @property
+    def is_paginated(self) -> bool:
+        return self.limit is not None or self.sort_by is not None or self.cursor is not None
 
     def get_non_null_fields(self) -> dict:
         return {k: v for k, v in self.dict().items() if v is not None}
@@ -107,9 +162,10 @@ class ApiExtension(BaseModel):
         return {k: v for k, v in self.dict().items() if v is not None}
 
     def get_non_null_fileds_exclude_extension(self) -> dict:
-        filters = BaseSearchingFilters(**self.model_dump())
+        filters = BaseSearchingFilters(**self.model_dump(exclude=set(ApiExtension.model_fields)))
         return filters.get_non_null_fields()
 
 
 class BaseApiSearchingFilters(BaseSearchingFilters, ApiExtension):
-    pass
+    # limit есть и у локального поиска: для запросов к API остается страница KP по умолчанию
+    limit: Optional[int] = Field(default=150, description="Кол-во элементов на странице в ответе от API")
@@ -0,0 +1,135 @@
+import asyncio
+from typing import List, Optional
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.dependencies import get_current_user, get_film_service_dep
+from src.domain.entities.film import FilmPreview, FilmTypes
+from src.domain.entities.user import User
+from src.domain.policies.impl.kp_series_to_film import DefaultSeriesToFilmPolicy
+from src.infrastructure.repositories.core.base_film_repositories import BaseLocalSearchFilmRepository, FilmSearchPage
+from src.infrastructure.repositories.impl.postgres.film_repository.external_search_film_repository import \
+    KpApiSearchFilmRepository
+from src.services.film.exceptions import ExternalApiUnavailableException
+from src.services.film.service import FilmService
+from src.shared.tools.api_clients.impl.kp_api_external_client import KpExternalAPIClient
+from src.shared.tools.rate_limiting.quota_manager import QuotaManager
+from src.shared.tools.resilience.circuit_breaker import CircuitBreaker
+from src.web.fastapi.films_router import films_router
+from src.web.models.search_filters import BaseApiSearchingFilters, BaseSearchingFilters, LOCAL_SEARCH_MAX_LIMIT
+
+KP_URL = "https://kp.test/v1.4"
+
+
+class CatalogSearchFilmRepository(BaseLocalSearchFilmRepository):
+    """Локальный каталог в памяти: поиск по id и подстроке названия, коллекций пользователей нет."""
+
+    def __init__(self, films: List[FilmPreview]):
+        self.films = films
+        self.searches: List[BaseSearchingFilters] = []
+
+    def search_by_filters(self, user: Optional[User], filters: BaseSearchingFilters,
+                          out_model: FilmTypes = FilmTypes.FILM_PREVIEW) -> List[FilmPreview]:
+        self.searches.append(filters)
+        if user is not None:
+            return []
+        name = (filters.name or "").lower()
+        found = [film.model_copy() for film in self.films
+                 if name in film.name.lower() and (not filters.filmids or film.filmid in filters.filmids)]
+        return found[:filters.limit]
+
+    def search_page(self, user: Optional[User], filters: BaseSearchingFilters,
+                    out_model: FilmTypes = FilmTypes.FILM_PREVIEW) -> FilmSearchPage:
+        return FilmSearchPage(self.search_by_filters(user, filters, out_model))
+
+    def get(self, user, film_to_get):
+        return None
+
+
+@pytest.fixture
+def requests_log():
+    return []
+
+
+@pytest.fixture
+def api_client(requests_log):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests_log.append(str(request.url))
+        return httpx.Response(503)
+
+    breaker = CircuitBreaker("kp", failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    return KpExternalAPIClient(KP_URL, "token", circuit_breaker=breaker, transport=httpx.MockTransport(handler))
+
+
+@pytest.fixture
+def local_repository():
+    return CatalogSearchFilmRepository([
+        FilmPreview(filmid="326", name="Побег из Шоушенка", genres=["драма"], countries=["США"]),
+        FilmPreview(filmid="435", name="Зеленая миля", genres=["драма"], countries=["США"])
+    ])
+
+
+@pytest.fixture
+def film_service(api_client, local_repository):
+    return FilmService(
+        local_search_repository=local_repository,
+        external_search_repository=KpApiSearchFilmRepository(api_client),
+        operations_repository=None,
+        series_to_film_policy=DefaultSeriesToFilmPolicy()
+    )
+
+
+def test_open_circuit_and_exhausted_keys_are_reported_as_unavailable(api_client, requests_log):
+    exhausted = KpExternalAPIClient(KP_URL, "token", quota_manager=QuotaManager(rate_per_second=10, daily_limit=0),
+                                    transport=api_client.transport)
+
+    async def scenario():
+        for client in (api_client, exhausted):
+            repository = KpApiSearchFilmRepository(client)
+            with pytest.raises(ExternalApiUnavailableException):
+                await repository.search_by_filters(BaseApiSearchingFilters(genres=["драма"]))
+            with pytest.raises(ExternalApiUnavailableException):
+                await repository.get(BaseApiSearchingFilters(filmid="326"))
+            await client.aclose()
+
+    asyncio.run(scenario())
+    assert requests_log == []
+
+
+def test_external_search_falls_back_to_local_catalog(film_service):
+    previews = asyncio.run(film_service.external_search_by_filters(BaseApiSearchingFilters(name="миля")))
+    assert [film.filmid for film in previews] == ["435"]
+    assert all(film.degraded is True for film in previews)
+
+
+def test_degraded_search_is_bounded_by_request_limit(film_service, local_repository):
+    previews = asyncio.run(film_service.external_search_by_filters(BaseApiSearchingFilters(genres=["драма"], limit=1)))
+    assert [film.filmid for film in previews] == ["326"]
+    assert local_repository.searches[-1].limit == 1
+
+    # limit по умолчанию у API (150) проходит как есть, больший - обрезается до предела локального поиска
+    for limit, expected in ((None, 150), (10_000, LOCAL_SEARCH_MAX_LIMIT)):
+        filters = BaseApiSearchingFilters(genres=["драма"]) if limit is None else \
+            BaseApiSearchingFilters(genres=["драма"], limit=limit)
+        asyncio.run(film_service.external_search_by_filters(filters))
+        assert local_repository.searches[-1].limit == expected
+
+
+def test_router_maps_unavailable_external_api(film_service):
+    app = FastAPI()
+    app.include_router(films_router)
+    app.dependency_overrides[get_current_user] = lambda: User(userid="1")
+    app.dependency_overrides[get_film_service_dep] = lambda: film_service
+    client = TestClient(app)
+
+    found = client.post("/films/search/external", json={"name": "побег"})
+    assert found.status_code == 200
+    assert [(film["filmid"], film["degraded"]) for film in found.json()] == [("326", True)]
+
+    response = client.post("/films/external", json={"filmid": "1"})
+    assert response.status_code == 503
+    assert "temporarily unavailable" in response.json()["detail"]
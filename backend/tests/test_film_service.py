@@ -7,10 +7,13 @@ from src.config.settings import AppSettings
 from src.domain.entities.film import FilmExtended, Person, Episode
 from src.domain.policies.impl.kp_series_to_film import DefaultSeriesToFilmPolicy
 from src.infrastructure.repositories.impl.postgres.film_repository.external_search_film_repository import KpApiSearchFilmRepository
-from src.infrastructure.repositories.impl import PostgresSearchFilmRepository
+from src.infrastructure.repositories.impl.postgres.film_repository.local_search_film_repository import PostgresSearchFilmRepository
 from src.infrastructure.repositories.impl.postgres.film_repository.operations_film_repository import PostgresFilmOperationsRepository
 from src.infrastructure.repositories.shared.orm.sqlmodel_exception_handler import SQLModelExceptionHandler
+from src.infrastructure.repositories.impl.postgres.film_repository.tools.postgres_json_serializer import \
+    serialize_for_json
 from src.services.film.service import FilmService
+from src.shared.mappers.model_to_orm import film_extended_to_film_orm
 from src.shared.tools.api_clients.core.base_external_api_client import BaseExternalAPIClient
 from src.domain.entities.user import User
 from src.services.film.exceptions import NotFoundLocalException, DoesNotExistException
@@ -151,3 +154,28 @@ def test_search_by_filters_unexisting(film_service, sample_user, sample_film):
 def test_set_rating_unexisting(film_service, sample_user, sample_film, sample_rating):
     with pytest.raises(DoesNotExistException):
         film_service.set_rate(sample_user, sample_film, sample_rating)
+
+
+def test_sorted_pages_keep_films_without_sort_key(get_session, sample_film):
+    # без kp в ratings у фильма нет kp_rating: сортировка не должна выбрасывать его из выдачи
+    for i, kp_rating in enumerate([7.5, None, 8.1, None, 7.5]):
+        ratings = {"kp": kp_rating} if kp_rating is not None else {}
+        get_session.add(film_extended_to_film_orm(
+            sample_film.model_copy(update={"filmid": f"tt{i}", "ratings": ratings}), serialize_for_json))
+    get_session.commit()
+    repo = PostgresSearchFilmRepository(get_session, SQLModelExceptionHandler())
+    unsorted = repo.search_by_filters(None, BaseSearchingFilters())
+
+    for sort_by in ("kp_rating", "year", "name"):
+        assert len(repo.search_by_filters(None, BaseSearchingFilters(sort_by=sort_by))) == len(unsorted)
+        filmids, cursor = [], None
+        while True:
+            page = repo.search_page(None, BaseSearchingFilters(limit=2, sort_by=sort_by, cursor=cursor))
+            filmids += [film.filmid for film in page.items]
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        assert sorted(filmids) == sorted(film.filmid for film in unsorted)
+
+    kp_order = repo.search_by_filters(None, BaseSearchingFilters(sort_by="kp_rating"))
+    assert [film.filmid for film in kp_order] == ["tt2", "tt4", "tt0", "tt3", "tt1"]
@@ -0,0 +1,429 @@
+import asyncio
+import httpx
+import pytest
+
+from src.domain.entities.lazy_list import LazyModelList
+from src.shared.tools.api_clients.impl.kp_api_external_client import KpExternalAPIClient, normalize_query_url, \
+    resolve_endpoint
+from src.shared.tools.caches.impl.lru_response_cache import LRUResponseCache
+from src.shared.tools.caches.impl.sqlite_response_cache import SQLiteResponseCache
+from src.shared.tools.rate_limiting.quota_manager import QuotaManager, RequestPriority
+from src.shared.tools.rate_limiting.api_key_pool import ApiKey, ApiKeyPool, NoAvailableApiKeyException
+from src.shared.tools.resilience.circuit_breaker import CircuitBreaker, CircuitOpenException, CircuitState
+from src.web.models.search_filters import BaseApiSearchingFilters
+
+KP_URL = "https://kp.test/v1.4"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def movie_payload(filmid: int = 1) -> dict:
+    return {
+        "id": filmid,
+        "name": f"Film {filmid}",
+        "isSeries": False,
+        "rating": {"kp": 8.0},
+        "genres": [{"name": "драма"}],
+        "countries": [{"name": "Россия"}],
+    }
+
+
+@pytest.fixture
+def requests_log():
+    return []
+
+
+@pytest.fixture
+def transport(requests_log):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests_log.append(str(request.url))
+        path = request.url.path
+        if path.endswith("/movie/search"):
+            return httpx.Response(200, json={"docs": [movie_payload(1), movie_payload(2)]})
+        if "/movie/" in path:
+            return httpx.Response(200, json=movie_payload(int(path.rsplit("/", 1)[-1])))
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
+
+
+def make_client(transport, api_key="token", **kwargs) -> KpExternalAPIClient:
+    client = KpExternalAPIClient(KP_URL, api_key, **kwargs)
+    client._http_client = httpx.AsyncClient(transport=transport)
+    return client
+
+
+def test_normalize_query_url_is_order_insensitive_but_keeps_repeated_params():
+    first = normalize_query_url(f"{KP_URL}/movie?&limit=10&page=1&sortField=votes.kp&sortField=rating.kp")
+    second = normalize_query_url(f"{KP_URL}/movie?page=1&sortField=votes.kp&limit=10&sortField=rating.kp")
+    swapped = normalize_query_url(f"{KP_URL}/movie?page=1&sortField=rating.kp&limit=10&sortField=votes.kp")
+    assert first == second
+    assert first != swapped
+
+
+def test_resolve_endpoint():
+    assert resolve_endpoint("/v1.4/movie/search") == "search"
+    assert resolve_endpoint("/v1.4/movie") == "filters"
+    assert resolve_endpoint("/v1.4/season") == "season"
+    assert resolve_endpoint("/v1.4/movie/326") == "movie"
+
+
+def test_lru_cache_evicts_least_recently_used():
+    async def scenario():
+        cache = LRUResponseCache(max_size=2)
+        await cache.set("a", 1, ttl=10)
+        await cache.set("b", 2, ttl=10)
+        await cache.get("a")
+        await cache.set("c", 3, ttl=10)
+        return cache, await cache.get("b"), await cache.get("a")
+
+    cache, evicted, kept = asyncio.run(scenario())
+    assert evicted is None
+    assert kept.value == 1
+    assert asyncio.run(cache.stats())["evictions"] == 1
+
+
+def test_repeated_get_is_served_from_cache(transport, requests_log):
+    async def scenario():
+        client = make_client(transport, response_cache=LRUResponseCache(), cache_ttls={"movie": 60})
+        first = await client.get(BaseApiSearchingFilters(filmid="7"))
+        second = await client.get(BaseApiSearchingFilters(filmid="7"))
+        await client.aclose()
+        return client, first, second
+
+    client, first, second = asyncio.run(scenario())
+    assert first.filmid == second.filmid == "7"
+    assert len(requests_log) == 1
+    assert asyncio.run(client.cache_stats())["hits"] == 1
+    assert asyncio.run(client.cache_stats())["misses"] == 1
+
+
+def test_stale_entry_is_returned_and_revalidated(transport, requests_log):
+    clock = FakeClock()
+
+    async def scenario():
+        cache = LRUResponseCache(clock=clock)
+        client = make_client(transport, response_cache=cache, cache_ttls={"search": 10}, cache_stale_ttl=100)
+        filters = BaseApiSearchingFilters(name="film")
+        await client.search_by_name(filters)
+        clock.now = 50
+        stale = await client.search_by_name(filters)
+        await asyncio.gather(*client._revalidations.values())
+        await client.aclose()
+        return cache, stale
+
+    cache, stale = asyncio.run(scenario())
+    assert len(stale) == 2
+    assert len(requests_log) == 2
+    assert asyncio.run(cache.stats())["stale_hits"] == 1
+
+
+def test_concurrent_gets_are_coalesced(requests_log):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests_log.append(str(request.url))
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=movie_payload(5))
+
+    async def scenario():
+        client = make_client(httpx.MockTransport(handler))
+        films = await asyncio.gather(*[client.get(BaseApiSearchingFilters(filmid="5")) for _ in range(10)])
+        await client.aclose()
+        return client, films
+
+    client, films = asyncio.run(scenario())
+    assert len(requests_log) == 1
+    assert all(film.filmid == "5" for film in films)
+    assert len({id(film) for film in films}) == 10
+    assert client.coalescing_stats() == {"in_flight": 0, "coalesced": 9}
+
+
+def test_get_all_seasons_fetches_parent_and_pages_concurrently(requests_log):
+    seasons = [{"number": n, "airDate": f"20{10 + n}-01-01T00:00:00.000Z",
+                "episodes": [{"number": 2, "name": "b"}, {"number": 1, "name": "a"}]} for n in range(0, 5)]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests_log.append(str(request.url))
+        if request.url.path.endswith("/season"):
+            page, limit = int(request.url.params["page"]), int(request.url.params["limit"])
+            docs = seasons[(page - 1) * limit:page * limit]
+            return httpx.Response(200, json={"docs": docs, "page": page, "pages": 3})
+        return httpx.Response(200, json={**movie_payload(9), "isSeries": True})
+
+    async def scenario():
+        client = make_client(httpx.MockTransport(handler), season_page_size=2)
+        result = await client.get_all_seasons(BaseApiSearchingFilters(filmid="9", is_series=True))
+        await client.aclose()
+        return result
+
+    result = asyncio.run(scenario())
+    assert [season.season for season in result] == [1, 2, 3, 4]
+    assert [season.release_year for season in result] == [2011, 2012, 2013, 2014]
+    # серии сезона - тот же LazyModelList, что и у FilmExtended после валидации
+    assert all(isinstance(season.episodes, LazyModelList) for season in result)
+    assert not result[0].episodes.is_materialized
+    assert [ep.number for ep in result[0].episodes] == [1, 2]
+    assert [ep.number for ep in result[0].episodes.sorted(key=lambda ep: -ep.number)] == [2, 1]
+    assert all(season.name == "Film 9" for season in result)
+    assert sum("/movie/" in url for url in requests_log) == 1
+    assert sum("/season" in url for url in requests_log) == 3
+
+
+def test_quota_manager_serves_interactive_requests_first():
+    async def scenario():
+        quota = QuotaManager(rate_per_second=1000, burst=1)
+        await quota.acquire()
+        order = []
+
+        async def request(name, priority):
+            await quota.acquire(priority)
+            order.append(name)
+
+        await asyncio.gather(request("background", RequestPriority.BACKGROUND),
+                             request("interactive", RequestPriority.INTERACTIVE))
+        return order
+
+    assert asyncio.run(scenario()) == ["interactive", "background"]
+
+
+def test_quota_manager_keeps_daily_reserve_for_interactive_requests(transport, requests_log):
+    async def scenario():
+        quota = QuotaManager(rate_per_second=1000, burst=10, daily_limit=2, background_reserve=1)
+        client = make_client(transport, quota_manager=quota)
+        background = await client.fetch_response(f"{KP_URL}/movie/1", RequestPriority.BACKGROUND)
+        interactive = await client.get(BaseApiSearchingFilters(filmid="1"))
+        # остаток - резерв интерактивных запросов, потом бюджет кончается у всех
+        with pytest.raises(NoAvailableApiKeyException):
+            await client.fetch_response(f"{KP_URL}/movie/2", RequestPriority.BACKGROUND)
+        with pytest.raises(NoAvailableApiKeyException):
+            await client.get(BaseApiSearchingFilters(filmid="3"))
+        await client.aclose()
+        return client, background, interactive
+
+    client, background, interactive = asyncio.run(scenario())
+    assert background is not None and interactive is not None
+    assert len(requests_log) == 2
+    assert asyncio.run(client.metrics())["quota"]["daily_remaining"] == 0
+    assert asyncio.run(client.metrics())["quota"]["keys_available"] == 0
+
+
+def test_transient_errors_are_retried_and_open_the_circuit(requests_log):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests_log.append(str(request.url))
+        return httpx.Response(503)
+
+    async def scenario():
+        breaker = CircuitBreaker("kp", failure_threshold=2, reset_timeout=60)
+        client = make_client(httpx.MockTransport(handler), max_retries=2, backoff_base=0, circuit_breaker=breaker)
+        first = await client.get(BaseApiSearchingFilters(filmid="1"))
+        second = await client.get(BaseApiSearchingFilters(filmid="2"))
+        with pytest.raises(CircuitOpenException):
+            await client.get(BaseApiSearchingFilters(filmid="3"))
+        await client.aclose()
+        return breaker, first, second
+
+    breaker, first, second = asyncio.run(scenario())
+    assert first is None and second is None
+    assert len(requests_log) == 6
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_not_found_is_not_retried(requests_log):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests_log.append(str(request.url))
+        return httpx.Response(404)
+
+    async def scenario():
+        client = make_client(httpx.MockTransport(handler), max_retries=3, circuit_breaker=CircuitBreaker("kp"))
+        result = await client.get(BaseApiSearchingFilters(filmid="1"))
+        await client.aclose()
+        return result
+
+    assert asyncio.run(scenario()) is None
+    assert len(requests_log) == 1
+
+
+def test_circuit_half_opens_after_reset_timeout():
+    clock = FakeClock()
+    breaker = CircuitBreaker("kp", failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert not breaker.allow_request()
+    clock.now = 10
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_key_pool_spreads_requests_and_skips_rate_limited_keys(requests_log):
+    def handler(request: httpx.Request) -> httpx.Response:
+        token = request.headers["X-API-KEY"]
+        requests_log.append(token)
+        if token == "limited-key-0":
+            return httpx.Response(429)
+        return httpx.Response(200, json=movie_payload(1))
+
+    async def scenario():
+        pool = ApiKeyPool([ApiKey(f"{name}-key-0", QuotaManager(rate_per_second=1000, burst=10, daily_limit=limit))
+                           for name, limit in (("limited", 100), ("spare", 50))], cooldown=60)
+        client = make_client(httpx.MockTransport(handler), api_key=pool, max_retries=1, backoff_base=0)
+        results = [await client.fetch_response(f"{KP_URL}/movie/{n}") for n in range(3)]
+        await client.aclose()
+        return client, results
+
+    client, results = asyncio.run(scenario())
+    assert all(result is not None for result in results)
+    assert requests_log == ["limited-key-0", "spare-key-0", "spare-key-0", "spare-key-0"]
+    limited, spare = asyncio.run(client.metrics())["quota"]["keys"]
+    assert limited["cooldown_reason"] == "rate_limited"
+    assert spare["requests"] == 3
+
+
+def test_single_key_is_not_cooled_down_on_rate_limit(requests_log):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests_log.append(request.url.path)
+        if len(requests_log) == 1:
+            return httpx.Response(429)
+        return httpx.Response(200, json=movie_payload(1))
+
+    async def scenario():
+        quota = QuotaManager(rate_per_second=1000, burst=10)
+        client = make_client(httpx.MockTransport(handler), quota_manager=quota, max_retries=2, backoff_base=0)
+        results = [await client.get(BaseApiSearchingFilters(filmid=str(n))) for n in (1, 2)]
+        await client.aclose()
+        return client, quota, results
+
+    client, quota, results = asyncio.run(scenario())
+    assert all(result is not None for result in results)
+    # 429 повторен с тем же ключом после паузы, ключ остался в ротации
+    assert requests_log == ["/v1.4/movie/1", "/v1.4/movie/1", "/v1.4/movie/2"]
+    assert quota.upstream_rate_limited == 1
+    key, = asyncio.run(client.metrics())["quota"]["keys"]
+    assert key["failures"] == 1 and key["cooldown_reason"] is None
+    assert asyncio.run(client.metrics())["quota"]["keys_available"] == 1
+
+
+def test_get_many_uses_multi_id_query_and_falls_back_to_single_gets(requests_log):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests_log.append(str(request.url))
+        if request.url.path.endswith("/movie"):
+            ids = [int(filmid) for filmid in request.url.params.get_list("id") if filmid.isdigit() and filmid != "3"]
+            return httpx.Response(200, json={"docs": [movie_payload(filmid) for filmid in ids]})
+        filmid = request.url.path.rsplit("/", 1)[-1]
+        return httpx.Response(200, json=movie_payload(int(filmid))) if filmid.isdigit() else httpx.Response(404)
+
+    async def scenario():
+        client = make_client(httpx.MockTransport(handler), batch_size=2)
+        films = await client.get_many(["1", "2", "3", "1", "4"])
+        injected = await client.get_many(["5&limit=1000"])
+        await client.aclose()
+        return films, injected
+
+    films, injected = asyncio.run(scenario())
+    assert [film.filmid for film in films] == ["1", "2", "3", "4"]
+    assert sum(url.endswith("/movie/3") for url in requests_log[:3]) == 1
+    assert len(requests_log) == 5
+    # id экранируется и не подмешивает в запрос свои параметры
+    assert injected == [] and httpx.URL(requests_log[3]).params.get_list("id") == ["5&limit=1000"]
+    assert httpx.URL(requests_log[4]).path.endswith("/movie/5&limit=1000") and "?" not in requests_log[4]
+
+
+def test_misses_and_empty_searches_are_negatively_cached(requests_log):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests_log.append(str(request.url))
+        if request.url.path.endswith("/movie/search"):
+            return httpx.Response(200, json={"docs": []})
+        return httpx.Response(404)
+
+    async def scenario():
+        cache = LRUResponseCache()
+        client = make_client(httpx.MockTransport(handler), response_cache=cache,
+                             cache_ttls={"movie": 60, "search": 60}, cache_negative_ttl=5)
+        for _ in range(3):
+            assert await client.get(BaseApiSearchingFilters(filmid="404")) is None
+            assert await client.search_by_name(BaseApiSearchingFilters(name="nothing")) == []
+        await client.aclose()
+        return cache
+
+    cache = asyncio.run(scenario())
+    assert len(requests_log) == 2
+    stats = asyncio.run(cache.stats())
+    assert stats["negative_hits"] == 4
+    assert stats["negative_size"] == 2
+    assert stats["hits"] == 0
+
+
+def test_sqlite_cache_is_shared_between_instances_and_evicts_lru(tmp_path):
+    path = str(tmp_path / "kp.sqlite3")
+    clock = FakeClock()
+
+    async def scenario():
+        writer = SQLiteResponseCache(path, max_size=2, clock=clock)
+        reader = SQLiteResponseCache(path, max_size=2, clock=clock)
+        await writer.set("a", {"id": 1}, ttl=10)
+        clock.now = 1
+        await writer.set("b", {"id": 2}, ttl=10)
+        clock.now = 2
+        # чтение из другого экземпляра (воркера) освежает "a", поэтому вытесняется "b"
+        assert (await reader.get("a")).value == {"id": 1}
+        clock.now = 3
+        await writer.set("c", {"id": 3}, ttl=10)
+        result = [await reader.get(key) for key in ("a", "b", "c")]
+        await writer.aclose()
+        await reader.aclose()
+        return writer, result
+
+    writer, (a, b, c) = asyncio.run(scenario())
+    assert a is not None and b is None and c.value == {"id": 3}
+    assert writer.evictions == 1
+
+
+def test_sqlite_cache_counts_rows_only_when_size_estimate_overflows(tmp_path):
+    statements = []
+
+    async def scenario():
+        cache = SQLiteResponseCache(str(tmp_path / "kp.sqlite3"), max_size=100)
+        await cache.set("0", 0, ttl=10)
+        cache._connection.set_trace_callback(statements.append)
+        for i in range(1, 300):
+            await cache.set(str(i), i, ttl=10)
+        stats = await cache.stats()
+        await cache.aclose()
+        return cache, stats
+
+    cache, stats = asyncio.run(scenario())
+    counts = [sql for sql in statements if sql.startswith("SELECT COUNT(*) FROM responses")]
+    # первый подсчет - на 101-й записи, дальше вытеснение до 90 записей освобождает место на 11 записей вперед
+    assert len(counts) == 19
+    assert stats["size"] <= 100 and stats["evictions"] == cache.evictions == 300 - stats["size"]
+
+
+def test_stale_entry_is_revalidated_with_conditional_request(tmp_path, requests_log):
+    clock = FakeClock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests_log.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=movie_payload(1), headers={"ETag": '"v1"'})
+
+    async def scenario():
+        cache = SQLiteResponseCache(str(tmp_path / "kp.sqlite3"), clock=clock)
+        client = make_client(httpx.MockTransport(handler), response_cache=cache,
+                             cache_ttls={"movie": 10}, cache_stale_ttl=100)
+        await client.get_response(KP_URL + "/movie/1")
+        clock.now = 20
+        assert (await client.get_response(KP_URL + "/movie/1"))["id"] == 1
+        await asyncio.gather(*client._revalidations.values())
+        entry = await cache.get("/v1.4/movie/1")
+        await client.aclose()
+        return entry
+
+    entry = asyncio.run(scenario())
+    assert requests_log == [None, '"v1"']
+    assert entry.is_fresh() and entry.etag == '"v1"'
@@ -0,0 +1,172 @@
+import asyncio
+
+import httpx
+import pytest
+
+from benchmarks.fake_kp import FAKE_KP_URL, FakeKpServer, FakeKpSettings
+from src.infrastructure.repositories.impl.postgres.film_repository.external_search_film_repository import \
+    KpApiSearchFilmRepository
+from src.infrastructure.repositories.impl.postgres.film_repository.tools.search_planner import \
+    ExternalSearchPlanner, SearchEndpoint
+from src.shared.mappers.api_responses_to_models import parse_film_extended, parse_film_preview, \
+    parse_film_previews, parse_films_extended
+from src.shared.tools.api_clients.impl.kp_api_external_client import KpExternalAPIClient
+from src.shared.tools.json_stream import JsonArrayStreamDecoder
+from src.shared.tools.pagination import take_matches
+from src.shared.tools.rate_limiting.api_key_pool import ApiKey, ApiKeyPool
+from src.web.models.search_filters import BaseApiSearchingFilters, BaseBounds
+
+
+@pytest.fixture
+def server():
+    return FakeKpServer(FakeKpSettings(catalog_size=50))
+
+
+def fake_client(server: FakeKpServer, api_key="token", **kwargs) -> KpExternalAPIClient:
+    return KpExternalAPIClient(FAKE_KP_URL, api_key, transport=httpx.ASGITransport(app=server), **kwargs)
+
+
+def test_client_against_fake_kp_server_with_rate_limits():
+    server = FakeKpServer(FakeKpSettings(rate_limit_rate=0.3, seed=1))
+    key_pool = ApiKeyPool([ApiKey("a"), ApiKey("b")], cooldown=0)
+
+    async def scenario():
+        client = fake_client(server, key_pool, max_retries=5, backoff_base=0)
+        film = await client.get(BaseApiSearchingFilters(filmid="326"))
+        seasons = await client.get_all_seasons(BaseApiSearchingFilters(filmid="464963", limit=3))
+        found = await client.search_by_name(BaseApiSearchingFilters(name="престол"))
+        await client.aclose()
+        return film, seasons, found
+
+    film, seasons, found = asyncio.run(scenario())
+    assert film.name == "Побег из Шоушенка"
+    assert [season.season for season in seasons] == list(range(1, 9))
+    assert found and all(preview.name == "Игра престолов" for preview in found)
+    assert server.statuses[429] > 0
+
+
+def test_page_iterator_prefetches_and_stops_early(server):
+    async def scenario():
+        client = fake_client(server)
+        filters = BaseApiSearchingFilters(name="престол", limit=2)
+        all_pages = [page async for page in client.iter_search_by_name(filters, max_pages=100)]
+        server.reset_stats()
+
+        taken = await take_matches(client.iter_search_by_name(BaseApiSearchingFilters(name="", limit=10), max_pages=5),
+                                   lambda page: [film for film in page if film.is_series], 5)
+        await client.aclose()
+        return all_pages, taken
+
+    all_pages, taken = asyncio.run(scenario())
+    assert [len(page) for page in all_pages] == [2, 2, 2, 2]
+    assert len(taken) == 5 and all(film.is_series for film in taken)
+    # сериалов на странице 3-4: хватает двух страниц, третья могла успеть только предзагрузиться
+    assert server.requests["search"] <= 3
+
+
+def test_planner_pushes_selective_filters_into_movie_endpoint(server):
+    filters = BaseApiSearchingFilters(name="побег", year=BaseBounds(lower=1990, upper=2000),
+                                      genres=["драма", "комедия"], limit=5)
+
+    async def scenario():
+        client = fake_client(server)
+        planner = ExternalSearchPlanner(client, max_pages=2)
+        plan = await planner.plan(filters)
+        found = await KpApiSearchFilmRepository(client, planner).search_by_name(filters)
+        tight_plan = await ExternalSearchPlanner(client, max_pages=1, max_page_size=5).plan(filters)
+        nothing = await KpApiSearchFilmRepository(client, planner).search_by_name(
+            filters.model_copy(update={"year": BaseBounds(lower=2030, upper=2040)})
+        )
+        series_plan = await planner.plan(BaseApiSearchingFilters(name="побег", is_series=True))
+        await client.aclose()
+        return planner, plan, found, tight_plan, nothing, series_plan
+
+    planner, plan, found, tight_plan, nothing, series_plan = asyncio.run(scenario())
+    # total по тем же ограничениям берется из кэша, а по одному is_series пробы нет совсем
+    assert planner.probes == 2
+    assert series_plan.endpoint == SearchEndpoint.NAME
+    # два жанра не отправляются: у KP это "оба сразу", локально - "хотя бы один"
+    assert plan.endpoint == SearchEndpoint.FILTERS and plan.pushed == ["year"]
+    assert len(found) == 5 and all(film.name == "Побег из Шоушенка" for film in found)
+    assert tight_plan.endpoint == SearchEndpoint.NAME
+    assert nothing == []
+    assert server.requests["search"] == 0
+
+
+def test_name_search_pages_only_for_explicit_limit_with_extra_filters(server):
+    # два жанра в /movie не отправляются, поэтому и планировщик не делает пробный запрос
+    other_genres = ["комедия", "мелодрама"]
+
+    async def search_requests(filters: BaseApiSearchingFilters):
+        client = fake_client(server)
+        server.reset_stats()
+        found = await KpApiSearchFilmRepository(client, ExternalSearchPlanner(client, max_pages=3)).search_by_name(
+            filters)
+        await client.aclose()
+        return len(found), server.requests["search"]
+
+    async def scenario():
+        return [await search_requests(filters) for filters in (
+            BaseApiSearchingFilters(name="престол", limit=2),
+            BaseApiSearchingFilters(name="престол", genres=other_genres),
+            BaseApiSearchingFilters(name="престол", genres=other_genres, limit=2),
+        )]
+
+    name_only, default_limit, explicit_limit = asyncio.run(scenario())
+    assert name_only == (2, 1)
+    assert default_limit == (0, 1)
+    assert explicit_limit == (0, 3)
+
+
+def test_streaming_docs_matches_buffered_parsing(server):
+    text = '{"total": 2, "docs": [{"id": 1, "name": "]}\\"["}, {"id": 2}], "pages": 1}'
+    decoder = JsonArrayStreamDecoder()
+    docs = [doc for i in range(0, len(text), 5) for doc in decoder.feed(text[i:i + 5])] + decoder.finish()
+    assert docs == [{"id": 1, "name": ']}"['}, {"id": 2}]
+    assert decoder.meta == {"total": 2, "docs": None, "pages": 1}
+
+    filmids = ["326", "435", "464963"]
+
+    async def scenario():
+        streaming = fake_client(server, stream_docs=True)
+        buffered = fake_client(server)
+        result = await streaming.get_many(filmids), await buffered.get_many(filmids), \
+            [film async for film in streaming.stream_search_by_name(BaseApiSearchingFilters(name="миля"))]
+        await streaming.aclose()
+        await buffered.aclose()
+        return result
+
+    streamed, buffered, previews = asyncio.run(scenario())
+    assert [film.model_dump() for film in streamed] == [film.model_dump() for film in buffered]
+    assert [film.filmid for film in streamed] == filmids
+    assert previews and all(film.name == "Зеленая миля" for film in previews)
+
+
+def test_bulk_parsers_match_per_item_parsers(server):
+    docs = server.catalog[:20] + [{"id": 7, "name": "Без рейтинга и постера", "poster": None}]
+    assert [film.model_dump() for film in parse_film_previews(docs)] == \
+           [parse_film_preview(doc).model_dump() for doc in docs]
+    assert [film.model_dump() for film in parse_films_extended(docs)] == \
+           [parse_film_extended(doc).model_dump() for doc in docs]
+    assert parse_films_extended(docs)[-1].ratings is None
+
+
+def test_filters_plan_returns_requested_page(server):
+    filters = BaseApiSearchingFilters(name="побег", year=BaseBounds(lower=1990, upper=2000), limit=2)
+
+    async def scenario():
+        client = fake_client(server)
+        planner = ExternalSearchPlanner(client, max_pages=2)
+        repository = KpApiSearchFilmRepository(client, planner)
+        plan = await planner.plan(filters)
+        pages = [await repository.search_by_name(filters.model_copy(update={"page": page})) for page in (1, 2, 3)]
+        everything = await repository.search_by_name(filters.model_copy(update={"limit": 6}))
+        await client.aclose()
+        return plan, pages, everything
+
+    plan, pages, everything = asyncio.run(scenario())
+    assert plan.endpoint == SearchEndpoint.FILTERS
+    first, second, third = [[film.filmid for film in page] for page in pages]
+    assert len(first) == len(second) == 2 and not set(first) & set(second)
+    # страницы - подряд идущие куски той же выдачи
+    assert first + second + third == [film.filmid for film in everything][:len(first + second + third)]
@@ -0,0 +1,21 @@
+from benchmarks.fake_kp import FakeKpServer
+from src.domain.entities.film import FilmExtended
+from src.infrastructure.repositories.impl.postgres.film_repository.tools.postgres_json_serializer import \
+    serialize_for_json
+from src.shared.mappers.api_responses_to_models import parse_film_extended
+
+
+def test_film_extended_validates_persons_and_episodes_lazily():
+    film = parse_film_extended(FakeKpServer().catalog[0])
+    assert film.persons and not film.persons.is_materialized
+    # в БД уходит исходный список, модели не собираются
+    assert serialize_for_json(film.persons) == film.persons.raw
+    assert not film.persons.is_materialized
+
+    assert film.model_dump()["persons"][0]["name"] == film.persons[0].name
+    assert film.persons.is_materialized
+
+    series = FilmExtended(filmid="1", name="Сериал", genres=[], countries=[],
+                          episodes=[{"number": 2, "name": "Вторая"}, {"number": 1, "name": "Первая"}])
+    assert not series.episodes.is_materialized and len(series.episodes) == 2
+    assert [episode.number for episode in series.episodes] == [1, 2]
@@ -0,0 +1,158 @@
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlmodel import select
+
+from src.infrastructure.repositories.impl.postgres.film_repository.orm import Film
+from src.infrastructure.repositories.impl.postgres.film_repository.tools.query_builders import \
+    LocalFilmSearchQueryBuilder, name_search_query
+from src.infrastructure.repositories.impl.postgres.social_repository.orm import UserItemORM, UserORM
+from src.infrastructure.repositories.impl.postgres.social_repository.tools.query_builders import \
+    LocalUserSearchQueryBuilder
+from src.web.models.search_filters import BaseApiSearchingFilters, BaseSearchingFilters, encode_search_cursor
+from src.web.models.users import UserSearchingFilters
+
+DIALECT = postgresql.dialect()
+
+
+def compile_sql(statement):
+    # без literal_binds: regconfig и jsonb-массивы в литералы не компилируются, значения сверяются по params
+    compiled = statement.compile(dialect=DIALECT)
+    return compiled.string, compiled.params
+
+
+def film_search_sql(**filters):
+    return compile_sql(LocalFilmSearchQueryBuilder(select(Film)).apply_all(BaseSearchingFilters(**filters)).build())
+
+
+def create_index_sql(table, name: str) -> str:
+    index = next(index for index in table.indexes if index.name == name)
+    return str(CreateIndex(index).compile(dialect=DIALECT))
+
+
+def test_name_search_uses_search_vector_and_ranks_by_ts_rank_cd():
+    sql, params = film_search_sql(name="Зелёная  миля!")
+    where, order_by = sql.split("ORDER BY")
+
+    assert "films.search_vector @@ (" in where
+    assert "ILIKE" not in sql and "lower(" not in sql
+    assert order_by.strip().startswith("ts_rank_cd(films.search_vector, ")
+    # каждое слово - префикс в трех конфигурациях, ё -> е, знаки препинания отброшены
+    tsqueries = [value for key, value in params.items() if key.startswith("to_tsquery")]
+    assert tsqueries == ["russian", "зеленая:*", "english", "зеленая:*", "simple", "зеленая:*",
+                         "russian", "миля:*", "english", "миля:*", "simple", "миля:*"]
+
+
+def test_name_search_without_words_skips_full_text():
+    assert name_search_query(" !? ") is None
+    sql, _ = film_search_sql(name=" !? ")
+    assert "@@" not in sql and "films.name IS NOT NULL" in sql
+
+
+def test_search_vector_is_generated_column_with_gin_index():
+    ddl = str(CreateTable(Film.__table__).compile(dialect=DIALECT))
+    assert "search_vector TSVECTOR GENERATED ALWAYS AS (setweight(to_tsvector('russian'" in ddl
+    assert create_index_sql(Film.__table__, "ix_films_search_vector") == \
+           "CREATE INDEX ix_films_search_vector ON films USING gin (search_vector)"
+
+
+def test_name_search_matches_typos_by_word_similarity():
+    sql, params = film_search_sql(name=" зеленя мила ")
+    where, order_by = sql.split("ORDER BY")
+
+    assert "(%(param_1)s <%% films.name) OR (%(param_1)s <%% films.alternative_name)" in where
+    # триграммы - второй ключ сортировки, после ts_rank_cd
+    assert order_by.strip().endswith("greatest(word_similarity(%(param_1)s, films.name), "
+                                     "word_similarity(%(param_1)s, films.alternative_name)) DESC")
+    assert params["param_1"] == "зеленя мила"
+
+
+def test_username_search_orders_by_similarity():
+    statement = LocalUserSearchQueryBuilder(select(UserORM)).apply_all(UserSearchingFilters(username=" green_st "))
+    sql, params = compile_sql(statement.build())
+
+    assert "user_item.username ILIKE '%%' || %(username_1)s || '%%' ESCAPE '/'" in sql
+    assert "user_item.username %% %(param_1)s" in sql
+    assert sql.endswith("ORDER BY similarity(user_item.username, %(similarity_1)s) DESC")
+    # _ в подстроке экранируется, в триграммах и сортировке - нет
+    assert (params["username_1"], params["param_1"], params["similarity_1"]) == ("green/_st", "green_st", "green_st")
+
+
+def test_trigram_indexes():
+    assert create_index_sql(Film.__table__, "ix_films_name_trgm") == \
+           "CREATE INDEX ix_films_name_trgm ON films USING gin (name gin_trgm_ops)"
+    assert create_index_sql(Film.__table__, "ix_films_alternative_name_trgm") == \
+           "CREATE INDEX ix_films_alternative_name_trgm ON films USING gin (alternative_name gin_trgm_ops)"
+    assert create_index_sql(UserItemORM.__table__, "ix_user_item_username_trgm") == \
+           "CREATE INDEX ix_user_item_username_trgm ON user_item USING gin (username gin_trgm_ops)"
+
+
+def test_kp_rating_filter_uses_generated_column():
+    sql, params = film_search_sql(kp_rating={"lower": 7, "upper": 9})
+    assert sql.endswith("WHERE films.kp_rating IS NOT NULL AND films.kp_rating > %(kp_rating_1)s "
+                        "AND films.kp_rating <= %(kp_rating_2)s")
+    assert "ratings" not in sql.split("WHERE")[1] and "CAST" not in sql
+    assert (params["kp_rating_1"], params["kp_rating_2"]) == (7, 9)
+
+    ddl = str(CreateTable(Film.__table__).compile(dialect=DIALECT))
+    assert "kp_rating FLOAT GENERATED ALWAYS AS (CASE WHEN jsonb_typeof(ratings -> 'kp') = 'number' " \
+           "THEN (ratings ->> 'kp')::double precision END) STORED" in ddl
+
+
+def test_genres_and_countries_filters_use_jsonb_containment():
+    sql, params = film_search_sql(genres=["Драма", "Комедия"], countries=["Франция"])
+    assert "films.genres ?& ARRAY[%(param_1)s, %(param_2)s]" in sql
+    assert "films.countries ?& ARRAY[%(param_3)s]" in sql
+    assert [params[f"param_{i}"] for i in (1, 2, 3)] == ["драма", "комедия", "Франция"]
+
+
+def test_filter_columns_are_indexed():
+    # каждую колонку фильтра обслуживает индекс, где она ведущая (GIN для jsonb, btree для диапазонов)
+    assert create_index_sql(Film.__table__, "ix_films_genres") == \
+           "CREATE INDEX ix_films_genres ON films USING gin (genres)"
+    assert create_index_sql(Film.__table__, "ix_films_countries") == \
+           "CREATE INDEX ix_films_countries ON films USING gin (countries)"
+    assert create_index_sql(Film.__table__, "ix_films_time_minutes") == \
+           "CREATE INDEX ix_films_time_minutes ON films (time_minutes)"
+    assert create_index_sql(Film.__table__, "ix_films_age_rating") == \
+           "CREATE INDEX ix_films_age_rating ON films (age_rating)"
+    assert create_index_sql(Film.__table__, "ix_films_kp_rating_nulls_last_keyset") == \
+           "CREATE INDEX ix_films_kp_rating_nulls_last_keyset ON films " \
+           "((kp_rating IS NOT NULL) DESC, kp_rating DESC, filmid DESC)"
+    assert create_index_sql(Film.__table__, "ix_films_release_year_nulls_last_keyset") == \
+           "CREATE INDEX ix_films_release_year_nulls_last_keyset ON films " \
+           "((release_year IS NOT NULL) DESC, release_year DESC, filmid DESC)"
+    assert create_index_sql(Film.__table__, "ix_films_name_nulls_last_keyset") == \
+           "CREATE INDEX ix_films_name_nulls_last_keyset ON films ((name IS NULL), name, filmid)"
+
+
+def test_local_search_keyset_pagination():
+    builder = LocalFilmSearchQueryBuilder(select(Film.filmid))
+    builder.apply_all(BaseSearchingFilters(genres=["драма"], limit=20, sort_by="kp_rating"))
+    cursor = builder.next_cursor(Film(filmid="42", kp_rating=8.5, description="", is_series=False))
+
+    filters = BaseSearchingFilters(genres=["драма"], limit=20, sort_by="kp_rating", cursor=cursor)
+    sql = str(LocalFilmSearchQueryBuilder(select(Film.filmid)).apply_all(filters).build().compile(
+        dialect=DIALECT, compile_kwargs={"literal_binds": True}))
+    assert "(films.kp_rating IS NOT NULL, films.kp_rating, films.filmid) < (true, 8.5, '42')" in sql
+    assert sql.endswith("ORDER BY films.kp_rating IS NOT NULL DESC, films.kp_rating DESC, films.filmid DESC \n LIMIT 20")
+    # фильмы без рейтинга не отбрасываются, а идут в конце: курсор из них продолжает выдачу по filmid
+    assert "kp_rating IS NOT NULL AND" not in sql
+
+    null_cursor = builder.next_cursor(Film(filmid="7", kp_rating=None, description="", is_series=False))
+    filters = BaseSearchingFilters(limit=20, sort_by="kp_rating", cursor=null_cursor)
+    sql = str(LocalFilmSearchQueryBuilder(select(Film.filmid)).apply_all(filters).build().compile(
+        dialect=DIALECT, compile_kwargs={"literal_binds": True}))
+    assert "WHERE (films.kp_rating IS NOT NULL) IS false AND films.kp_rating IS NULL AND films.filmid < '7'" in sql
+    # у filmid значение есть всегда
+    with pytest.raises(ValidationError):
+        BaseSearchingFilters(cursor=encode_search_cursor("filmid", None, "7"))
+
+    # курсор привязан к сортировке, limit у запросов к API остается своим
+    with pytest.raises(ValidationError):
+        BaseSearchingFilters(sort_by="year", cursor=cursor)
+    with pytest.raises(ValidationError):
+        BaseSearchingFilters(cursor="не курсор")
+    assert BaseApiSearchingFilters().limit == 150
+    assert BaseApiSearchingFilters(genres=["драма"]).get_non_null_fileds_exclude_extension() == {"genres": ["драма"]}
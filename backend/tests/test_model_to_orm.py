@@ -0,0 +1,21 @@
+from src.infrastructure.repositories.impl.postgres.film_repository.orm import Film
+from src.shared.mappers.model_to_orm import film_orm_to_film_persons_orm, normalize_person_name
+
+
+def test_normalize_person_name():
+    assert normalize_person_name("  Семён   ФАРАДА ") == "семен фарада"
+    assert normalize_person_name(None) == ""
+
+
+def test_film_persons_are_normalized_for_person_search():
+    film = Film(filmid="1", name="Зеленая миля", description="", is_series=False, persons=[
+        {"id": 7, "name": "Фрэнк  Дарабонт", "en_profession": "director"},
+        {"id": 7, "name": "Фрэнк  Дарабонт", "en_profession": "director"},
+        {"id": 8, "name": "Семён Фарада", "en_profession": "actor"},
+        {"id": 9, "name": None, "en_profession": "actor"},
+    ])
+    persons = film_orm_to_film_persons_orm(film)
+    assert [(p.person_id, p.normalized_name, p.profession) for p in persons] == [
+        (7, "фрэнк дарабонт", "director"), (8, "семен фарада", "actor")
+    ]
+    assert all(p.filmid == "1" for p in persons)
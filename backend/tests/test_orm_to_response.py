@@ -0,0 +1,61 @@
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+
+from benchmarks.fake_kp import FakeKpServer
+from src.domain.entities.film import FilmPreview
+from src.infrastructure.repositories.impl.postgres.film_repository.orm import UserFilm
+from src.infrastructure.repositories.impl.postgres.film_repository.tools.postgres_json_serializer import \
+    serialize_for_json
+from src.infrastructure.repositories.impl.postgres.playlist_repository.orm import PlaylistItemORM
+from src.shared.mappers.api_responses_to_models import parse_films_extended
+from src.shared.mappers.model_to_orm import film_extended_to_film_orm
+from src.shared.mappers.orm_to_model import orm_join_to_film_preview, orm_to_film_preview, \
+    orm_to_playlist_item_preview
+from src.shared.mappers.orm_to_response import orm_join_to_film_preview_dict, orm_to_film_preview_dict, \
+    orm_to_playlist_item_preview_dict
+from src.web.fastapi.responses import FastJSONResponse
+
+USER_RATING = {"storyline": 3, "music": 2, "montage": None, "acting_game": 4, "atmosphere": None, "originality": 3}
+
+
+def render(content) -> list:
+    return json.loads(FastJSONResponse(content).body)
+
+
+@pytest.fixture
+def films():
+    # как в БД: фильмы KP (с постерами и без) проходят FilmExtended и сохраняются через film_extended_to_film_orm
+    docs = FakeKpServer().catalog[:5] + [{"id": 7, "name": "Без постера", "poster": None}]
+    return [film_extended_to_film_orm(film, serialize_for_json) for film in parse_films_extended(docs)]
+
+
+def test_film_preview_dict_matches_model_dump(films):
+    assert render([orm_to_film_preview_dict(film) for film in films]) == \
+           [orm_to_film_preview(film).model_dump(mode="json") for film in films]
+    # порядок полей тоже как у FilmPreview
+    assert list(orm_to_film_preview_dict(films[0])) == list(FilmPreview.model_fields)
+
+
+def test_user_film_preview_dict_matches_model_dump(films):
+    userfilms = []
+    for i, film in enumerate(films):
+        userfilm = UserFilm(filmid=film.filmid, userid=uuid.uuid4(), is_watched=bool(i % 2),
+                            added_at=datetime(2025, 1, 1, 12, 30, 15, 123456),
+                            user_rating=USER_RATING if i % 2 else None)
+        userfilm.film = film
+        userfilms.append(userfilm)
+
+    dicts = render([orm_join_to_film_preview_dict(userfilm, userfilm.film) for userfilm in userfilms])
+    models = [orm_join_to_film_preview(userfilm, userfilm.film).model_dump(mode="json") for userfilm in userfilms]
+    assert dicts == models
+    assert dicts[1]["user_rating"] == USER_RATING and dicts[0]["playlists"] is None
+
+
+def test_playlist_item_preview_dict_matches_model_dump(films):
+    item = PlaylistItemORM(playlistid=uuid.uuid4(), filmid=films[0].filmid, creatorid=str(uuid.uuid4()))
+    item.film = films[0]
+    assert render([orm_to_playlist_item_preview_dict(item)]) == \
+           [orm_to_playlist_item_preview(item).model_dump(mode="json")]
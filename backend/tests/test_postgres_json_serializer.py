@@ -0,0 +1,19 @@
+import json
+from datetime import datetime
+
+from src.domain.entities.film import Episode
+from src.infrastructure.repositories.impl.postgres.film_repository.tools.postgres_json_serializer import \
+    serialize_for_json
+from src.web.models.film_rating import BaseFilmComplexRating, BaseRatingScale
+
+
+def test_serialize_for_json_produces_jsonb_ready_values():
+    episodes = [Episode(number=1, name="Пилот", air_date=datetime(2011, 4, 17), preview_link="https://example.com/1.jpg")]
+    assert serialize_for_json(episodes) == [{
+        "number": 1, "name": "Пилот", "en_name": None, "air_date": "2011-04-17T00:00:00", "description": None,
+        "preview_link": "https://example.com/1.jpg"
+    }]
+
+    rating = serialize_for_json(BaseFilmComplexRating[BaseRatingScale](storyline=BaseRatingScale.GOOD))
+    assert rating["storyline"] == 3 and rating["music"] is None
+    json.dumps(rating)
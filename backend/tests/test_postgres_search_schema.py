@@ -0,0 +1,41 @@
+import pytest
+from sqlalchemy.exc import ProgrammingError
+
+from src.infrastructure.repositories.impl.postgres.film_repository.tools.postgres_search_schema import \
+    FILM_PERSONS_BACKFILL_SQL, create_search_schema
+
+
+class RecordingSession:
+    """Записывает выполненные операции; statement, содержащий fail_on, падает как ошибка Postgres."""
+
+    def __init__(self, fail_on: str):
+        self.fail_on = fail_on
+        self.log = []
+
+    def execute(self, statement):
+        sql = str(statement)
+        if self.fail_on in sql:
+            raise ProgrammingError(sql, None, Exception("permission denied"))
+        self.log.append("execute")
+
+    def commit(self):
+        self.log.append("commit")
+
+    def rollback(self):
+        self.log.append("rollback")
+
+
+def test_failed_ddl_is_rolled_back_and_raised():
+    session = RecordingSession(fail_on="CREATE EXTENSION")
+    with pytest.raises(ProgrammingError):
+        create_search_schema(session)
+    assert session.log == ["rollback"]
+
+
+def test_failed_backfill_keeps_committed_ddl():
+    session = RecordingSession(fail_on=FILM_PERSONS_BACKFILL_SQL)
+    with pytest.raises(ProgrammingError):
+        create_search_schema(session)
+    # колонки и индексы зафиксированы до заполнения film_persons
+    assert session.log[-2:] == ["commit", "rollback"]
+    assert session.log.count("commit") == 1